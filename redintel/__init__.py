@@ -0,0 +1,10 @@
+"""Red Room game package.
+
+The rules engine in ``redintel.engine`` has no pygame dependency and can be
+imported by tools, simulations and the front end alike. The pygame front
+end is ``redintel.frontend`` (``python -m redintel``); importing it opens no
+window, main() does.
+"""
+from .board import Board
+from .engine import GameEngine, GRID_SIZE, ship_options
+from .ships import Fleet, Ship
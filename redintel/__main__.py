@@ -0,0 +1,4 @@
+"""python -m redintel: play Red Room."""
+from .frontend import main
+
+main()
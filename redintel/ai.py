@@ -0,0 +1,235 @@
+"""Probability-density opponent AI.
+
+DensityHunter is a drop-in player2_ai for GameEngine. It keeps, for every
+cell of Player 1's board, the number of ship placements (real ship_options
+shapes, same orientation as the game) that could still cover that cell:
+
+* a miss, and every cell of or around a sunk ship (the 3x3 adjacency rule
+  means nothing else can be there), kills all placements covering it, and
+  only the cells of those placements are decremented;
+* a sunk ship's shape is removed from the fleet still being hunted. Each
+  shape keeps its own layer of the density, so this subtracts that layer.
+  Early on, with few of its placements killed, it lowers every cell by the
+  shape's size instead (a shift of the whole board, which changes no
+  ranking) and corrects only the border band and the cells under its killed
+  placements; later it subtracts the layer from the cells not shot yet and
+  rebuilds the heap from them in one pass. Neither walks every placement.
+
+Hunt mode fires at the highest-density unknown cell, found with a lazily
+refreshed max-heap instead of a scan: densities that dropped are fixed when
+they reach the top, and cells whose stored density rose are pushed again
+(ties are broken by a random key drawn once per cell). Target mode kicks in
+while there are open hits (hits on ships not yet sunk) and scores only the
+live placements that pass through those hits, so its cost depends on the
+ships, not the board size.
+"""
+import heapq
+import random
+from functools import lru_cache
+from itertools import compress
+
+from .engine import RandomTargeting
+from .placement import placement_tables
+
+_UNSHOT = bytes([1]) + bytes(255) # bytes.translate table: 1 for a cell not shot yet, 0 for one that was
+
+
+class _Shape:
+    """Placement bookkeeping for one ship shape."""
+    __slots__ = ('name', 'shape', 'min_x', 'max_x', 'min_y', 'max_y', 'killed', 'layer', 'sunk')
+
+    def __init__(self, name, shape):
+        self.name = name
+        self.shape = shape
+        self.min_x = min(dx for dx, _ in shape); self.max_x = max(dx for dx, _ in shape)
+        self.min_y = min(dy for _, dy in shape); self.max_y = max(dy for _, dy in shape)
+        self.killed = set() # Origins ruled out by misses / sunk halos
+        self.layer = None # Live placements of this shape covering each cell (its share of the density)
+        self.sunk = False
+
+    def fits(self, ox, oy, size):
+        return -self.min_x <= ox < size - self.max_x and -self.min_y <= oy < size - self.max_y
+
+
+@lru_cache(maxsize=32) # The fleet's density and each shape's own, for a few grid sizes
+def _initial_density(size, ship_key):
+    """Placements covering each cell of an empty board, via a per-row difference array."""
+    diff = [[0] * (size + 1) for _ in range(size)]
+    for _, shape in ship_key:
+        s = _Shape(None, shape)
+        for dx, dy in shape:
+            x0 = -s.min_x + dx; x1 = size - s.max_x + dx # Columns this cell of the shape can land on
+            for y in range(-s.min_y + dy, size - s.max_y + dy):
+                diff[y][x0] += 1
+                diff[y][x1] -= 1
+    density = []
+    for row in diff:
+        running = 0
+        for x in range(size):
+            running += row[x]
+            density.append(running)
+    return tuple(density)
+
+
+@lru_cache(maxsize=64)
+def _border_band(size, name, shape):
+    """Cells an empty board covers fewer than len(shape) times with this shape: a band along the border."""
+    k = len(shape)
+    return tuple(i for i, count in enumerate(_initial_density(size, ((name, shape),))) if count != k)
+
+
+class DensityHunter:
+    """Player 2 AI: hunt by placement density, then target around open hits."""
+
+    def reset(self, engine):
+        size = self.size = engine.grid_size
+        self.rng = engine.rng
+        tables = placement_tables(size, engine.ships).tables
+        self.shapes = [_Shape(table.name, table.shape) for table in tables]
+        for shape in self.shapes:
+            shape.layer = list(_initial_density(size, ((shape.name, shape.shape),)))
+        self.by_name = {shape.name: shape for shape in self.shapes}
+        ship_key = tuple((table.name, table.shape) for table in tables)
+        self.density = list(_initial_density(size, ship_key))
+        self.shot = bytearray(size * size)
+        self.unshot = size * size
+        self.open_hits = set()
+        # Max-heap of (-density, random tie-break, cell); entries are refreshed lazily when popped
+        self.tie = [self.rng.random() for _ in range(size * size)]
+        self.heap = [(-d, tie, i) for i, (d, tie) in enumerate(zip(self.density, self.tie))]
+        heapq.heapify(self.heap)
+
+    def restore(self, engine):
+        """Rebuilds the hunt for a match loaded from a snapshot, from the shots on Player 1's board.
+
+        The heap's tie-breaks are re-rolled from a private RNG, so engine.rng stays exactly as saved.
+        """
+        saved, engine.rngs.opponent = engine.rngs.opponent, random.Random(engine.turn)
+        try:
+            self.reset(engine)
+        finally:
+            engine.rngs.opponent = saved
+        self.rng = saved
+        board, fleet = engine.player1_grid, engine.player1_ships_state
+        for coord in board.cells(board.miss):
+            self.observe(coord, None, False)
+        for coord in board.cells(board.hit):
+            self.observe(coord, fleet.ship_at(coord), False)
+        for ship in fleet:
+            if ship.sunk: # Retires the shape and rules out its halo
+                self.observe(ship.coords[0], ship, True)
+
+    # --- Choosing a target ---
+
+    def choose(self, engine):
+        if self.open_hits:
+            target = self._target_mode()
+            if target is not None:
+                return target
+        return self._hunt_mode()
+
+    def _hunt_mode(self):
+        heap, density, shot = self.heap, self.density, self.shot
+        while heap:
+            d, tie, i = heap[0]
+            if shot[i] or -d < density[i]: # Shot, or risen since: a newer entry for it was pushed
+                heapq.heappop(heap)
+            elif -d > density[i]: # Density dropped since this entry was pushed
+                heapq.heapreplace(heap, (-density[i], tie, i))
+            else:
+                return (i % self.size, i // self.size)
+        return None
+
+    def _target_mode(self):
+        size, shot, open_hits = self.size, self.shot, self.open_hits
+        scores = {}
+        for hx, hy in open_hits:
+            for shape in self.shapes:
+                if shape.sunk:
+                    continue
+                for dx, dy in shape.shape:
+                    ox, oy = hx - dx, hy - dy
+                    if not shape.fits(ox, oy, size) or (ox, oy) in shape.killed:
+                        continue
+                    # Placements through several open hits are counted once per hit
+                    for cx, cy in shape.shape:
+                        cell = (ox + cx, oy + cy)
+                        if not shot[cell[1] * size + cell[0]]:
+                            scores[cell] = scores.get(cell, 0) + 1
+        if not scores:
+            return None
+        best = max(scores.values())
+        return self.rng.choice([cell for cell, score in scores.items() if score == best])
+
+    # --- Learning from results ---
+
+    def observe(self, coord, ship, sunk):
+        x, y = coord
+        if not self.shot[y * self.size + x]:
+            self.shot[y * self.size + x] = 1
+            self.unshot -= 1
+        if ship is None:
+            self._block(x, y)
+            return
+        self.open_hits.add(coord)
+        if sunk:
+            self.open_hits.difference_update(ship.coords)
+            shape = self.by_name.get(ship.name)
+            if shape is not None and not shape.sunk:
+                self._retire(shape)
+            # Nothing else can sit on or next to a sunk ship
+            halo = {(cx + hx, cy + hy) for cx, cy in ship.coords for hx in (-1, 0, 1) for hy in (-1, 0, 1)}
+            for hx, hy in halo:
+                if 0 <= hx < self.size and 0 <= hy < self.size:
+                    self._block(hx, hy)
+
+    def _kill(self, shape, ox, oy):
+        shape.killed.add((ox, oy))
+        density, layer, size = self.density, shape.layer, self.size
+        for dx, dy in shape.shape:
+            i = (oy + dy) * size + ox + dx
+            density[i] -= 1
+            layer[i] -= 1
+
+    def _block(self, x, y):
+        """Rules out every live placement that covers (x, y)."""
+        size = self.size
+        for shape in self.shapes:
+            if shape.sunk:
+                continue
+            for dx, dy in shape.shape:
+                ox, oy = x - dx, y - dy
+                if shape.fits(ox, oy, size) and (ox, oy) not in shape.killed:
+                    self._kill(shape, ox, oy)
+
+    def _retire(self, shape):
+        """A ship of this shape has sunk: drop all of its remaining placements."""
+        shape.sunk = True
+        size, density, layer, shot, tie = self.size, self.density, shape.layer, self.shot, self.tie
+        k = len(shape.shape)
+        band = _border_band(size, shape.name, tuple(shape.shape))
+        if k * len(shape.killed) + len(band) < self.unshot:
+            # Early: lower the whole board by k (densities are only compared, so that is a no-op) and
+            # give back what the border band and the killed placements never added
+            changed = set(band)
+            for ox, oy in shape.killed:
+                changed.update((oy + dy) * size + ox + dx for dx, dy in shape.shape)
+            for i in changed:
+                density[i] += k - layer[i]
+                if not shot[i] and layer[i] != k:
+                    heapq.heappush(self.heap, (-density[i], tie[i], i)) # Risen: the old entry is now too low
+        else:
+            # Late: subtract the layer from every cell not shot yet and rebuild the heap from them
+            cells = list(compress(range(size * size), shot.translate(_UNSHOT)))
+            for i in cells:
+                density[i] -= layer[i]
+            self.heap = list(zip([-density[i] for i in cells], [tie[i] for i in cells], cells))
+            heapq.heapify(self.heap)
+        shape.layer = None
+
+
+# Player 2 AIs by name: the simulator's --p2 choices, and the only classes a turn log may name
+PLAYER2_POLICIES = {
+    "random": RandomTargeting,
+    "hunter": DensityHunter,
+}
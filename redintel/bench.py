@@ -0,0 +1,299 @@
+"""Benchmarks for the engine and render hot paths.
+
+    python -m redintel.bench                          # text table, grids 12/24/48
+    python -m redintel.bench --output bench.json      # save results as JSON
+    python -m redintel.bench --baseline bench.json    # compare, exit 1 on regressions
+
+Every case is set up from a fixed seed, so two runs on the same machine time
+exactly the same work. Each case runs at every --grid-size so the report
+shows how a path scales with the board (the "x" columns are relative to the
+smallest grid).
+
+Render cases draw one frame with the front end under the SDL dummy video
+driver; they are skipped when pygame is not installed. Boards bigger than
+their on-screen viewport only draw the cells in view, so render cases should
+stay flat across grid sizes.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+from .board import Board
+from .engine import (GameEngine, ship_options, place_ships_randomly, check_hit, PHASE_WAR_ROOM,
+                     PHASE_TRAFFIC_LIGHT, PHASE_GAME_OVER)
+from .ships import Fleet, Ship
+from . import snapshot, turnlog
+from .simulate import play_game, consultant_player
+
+DEFAULT_GRIDS = (12, 24, 48)
+DEFAULT_SEED = 1234
+DEFAULT_THRESHOLD = 0.10 # Slowdown (fraction of the baseline median) reported as a regression
+
+
+# --- Engine cases ---
+# A case takes (grid_size, seed) and returns the function to time; one call is one operation.
+
+def bench_place_ships(grid_size, seed):
+    rng = random.Random(seed)
+    def run():
+        place_ships_randomly(Fleet(), rng, grid_size, ship_options)
+    return run
+
+def _midgame_engine(grid_size, seed, turns=8, phase=PHASE_WAR_ROOM):
+    """An engine a few turns into a game, played on until it reaches phase (the War Room by default)."""
+    engine = GameEngine(grid_size)
+    engine.reset(seed=seed)
+    rng = random.Random(seed)
+    while (engine.turn < turns or engine.phase != phase) and engine.phase != PHASE_GAME_OVER:
+        if engine.phase == PHASE_WAR_ROOM:
+            engine.step(consultant_player(engine, rng))
+        elif engine.phase == PHASE_TRAFFIC_LIGHT:
+            engine.step('G')
+        else:
+            engine.step(0)
+    return engine
+
+def bench_consultant_options(grid_size, seed):
+    engine = _midgame_engine(grid_size, seed)
+    return engine.generate_consultant_options
+
+def bench_check_hit(grid_size, seed):
+    engine = _midgame_engine(grid_size, seed)
+    rng = random.Random(seed)
+    targets = [(rng.randrange(grid_size), rng.randrange(grid_size)) for _ in range(1024)]
+    fleet = engine.player2_ships_state
+    state = {"i": 0}
+    def run():
+        state["i"] = (state["i"] + 1) & 1023
+        check_hit(targets[state["i"]], fleet)
+    return run
+
+def bench_sink_fleet(grid_size, seed):
+    """Builds a fleet and records a hit on every segment (the old update_ship_states path)."""
+    fleet = Fleet()
+    place_ships_randomly(fleet, random.Random(seed), grid_size, ship_options)
+    layout = [(ship.name, ship.coords) for ship in fleet]
+    board = Board(grid_size)
+    def run():
+        target = Fleet(Ship(name, coords) for name, coords in layout)
+        for name, coords in layout:
+            for coord in coords:
+                board.mark_hit(coord)
+                target.record_hit(coord)
+    return run
+
+def bench_snapshot_dump(grid_size, seed):
+    """Serialising a mid-game match (the autosave at every turn boundary)."""
+    engine = _midgame_engine(grid_size, seed)
+    return lambda: snapshot.dump(engine)
+
+def bench_snapshot_load(grid_size, seed):
+    data = snapshot.dump(_midgame_engine(grid_size, seed))
+    engine = GameEngine(grid_size)
+    return lambda: snapshot.load(data, engine)
+
+def bench_headless_game(grid_size, seed):
+    engine = GameEngine(grid_size)
+    state = {"game": 0}
+    def run():
+        state["game"] += 1
+        play_game(engine, f"{seed}:{state['game']}", consultant_player)
+    return run
+
+def bench_replay_game(grid_size, seed):
+    """Replaying and verifying one logged match (python -m redintel.turnlog)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log = turnlog.TurnLog(os.path.join(tmp, "turns.jsonl"))
+        play_game(GameEngine(grid_size, turn_log=log), seed, consultant_player)
+        log.close()
+        with open(log.path, encoding="utf-8") as f:
+            match, = turnlog.read_matches(f)
+    return lambda: turnlog.replay(*match)
+
+
+# --- Render cases ---
+
+_front_end = None
+
+def load_front_end():
+    """The pygame front end's globals and functions, with its display open but no game loop running."""
+    global _front_end
+    if _front_end is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # Keep --json output clean
+        from . import frontend # Imports pygame; opens nothing until init_display()
+        frontend.init_display()
+        _front_end = vars(frontend)
+    return _front_end
+
+def _render_setup(grid_size, seed, phase):
+    """The front end, and a match of the bench's own in phase for it to draw; the live match is left alone."""
+    return load_front_end(), _midgame_engine(grid_size, seed, phase=phase)
+
+def _render_frame(ui, engine, full):
+    renderer, layout = ui["ui_renderer"], ui["draw_game_ui"]
+    def run():
+        if full:
+            renderer.invalidate()
+        layout(engine)
+        renderer.end_frame()
+    return run
+
+def bench_draw_game_ui(grid_size, seed):
+    """One full repaint of the War Room screen."""
+    ui, engine = _render_setup(grid_size, seed, PHASE_WAR_ROOM)
+    return _render_frame(ui, engine, full=True)
+
+def bench_draw_traffic_light(grid_size, seed):
+    """One full repaint of the traffic light screen."""
+    ui, engine = _render_setup(grid_size, seed, PHASE_TRAFFIC_LIGHT)
+    return _render_frame(ui, engine, full=True)
+
+def bench_static_traffic_light(grid_size, seed):
+    """A traffic light frame where nothing changed: layout and diff, no drawing."""
+    ui, engine = _render_setup(grid_size, seed, PHASE_TRAFFIC_LIGHT)
+    ui["ui_renderer"].invalidate()
+    return _render_frame(ui, engine, full=False)
+
+def bench_draw_player_grid(grid_size, seed):
+    """Both boards from their cached surfaces: a mask diff and one blit each."""
+    ui, engine = _render_setup(grid_size, seed, PHASE_WAR_ROOM)
+    draw = ui["draw_player_grid"]
+    def run():
+        draw(engine.player1_grid, 50, 100, show_ships=True)
+        draw(engine.player2_grid, 400, 100, show_ships=False)
+    return run
+
+
+ENGINE_CASES = {
+    "place_ships_randomly": bench_place_ships,
+    "generate_consultant_options": bench_consultant_options,
+    "check_hit": bench_check_hit,
+    "sink_fleet": bench_sink_fleet,
+    "snapshot_dump": bench_snapshot_dump,
+    "snapshot_load": bench_snapshot_load,
+    "headless_game": bench_headless_game,
+    "replay_game": bench_replay_game,
+}
+
+RENDER_CASES = {
+    "draw_game_ui": bench_draw_game_ui,
+    "draw_traffic_light": bench_draw_traffic_light,
+    "static_traffic_light": bench_static_traffic_light,
+    "draw_player_grid": bench_draw_player_grid,
+}
+
+
+# --- Running ---
+
+def time_case(run, repeat=5, min_time=0.2):
+    """Times one case. Returns per-operation statistics in microseconds."""
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange() # Calibrates: enough calls for ~0.2s
+    number = max(1, int(number * min_time / repeat / elapsed))
+    per_op = [t / number * 1e6 for t in timer.repeat(repeat, number)]
+    return {"ops": number * repeat, "median_us": statistics.median(per_op), "min_us": min(per_op),
+            "stdev_us": statistics.stdev(per_op) if len(per_op) > 1 else 0.0}
+
+def run_benchmarks(grid_sizes=DEFAULT_GRIDS, seed=DEFAULT_SEED, render=True, only=None, repeat=5, min_time=0.2):
+    cases = dict(ENGINE_CASES)
+    skipped = []
+    if render:
+        try:
+            load_front_end()
+            cases.update(RENDER_CASES)
+        except ImportError as e:
+            skipped.append(f"render cases: {e}")
+    results = []
+    for name, case in cases.items():
+        if only and not any(part in name for part in only):
+            continue
+        for grid_size in grid_sizes:
+            stats = time_case(case(grid_size, seed), repeat, min_time)
+            results.append({"name": name, "grid_size": grid_size, **stats})
+    return {
+        "meta": {"seed": seed, "grid_sizes": list(grid_sizes), "python": platform.python_version(),
+                 "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "skipped": skipped},
+        "results": results,
+    }
+
+
+# --- Reporting ---
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Matches results against a baseline report. Returns a list of comparison rows."""
+    old = {(r["name"], r["grid_size"]): r for r in baseline["results"]}
+    rows = []
+    for result in report["results"]:
+        before = old.get((result["name"], result["grid_size"]))
+        if before is None:
+            continue
+        change = result["median_us"] / before["median_us"] - 1 if before["median_us"] else 0.0
+        rows.append({"name": result["name"], "grid_size": result["grid_size"], "baseline_us": before["median_us"],
+                     "median_us": result["median_us"], "change": change, "regression": change > threshold})
+    return rows
+
+def format_report(report, comparison=None):
+    grids = report["meta"]["grid_sizes"]
+    by_case = {}
+    for result in report["results"]:
+        by_case.setdefault(result["name"], {})[result["grid_size"]] = result["median_us"]
+    header = f"{'case':<28}" + "".join(f"{f'{g}x{g} (us)':>16}" for g in grids) + "".join(f"{f'x{g}':>9}" for g in grids[1:])
+    lines = [header, "-" * len(header)]
+    for name, times in by_case.items():
+        base = times.get(grids[0])
+        line = f"{name:<28}" + "".join(f"{times[g]:>16,.1f}" if g in times else f"{'-':>16}" for g in grids)
+        line += "".join(f"{times[g] / base:>9.1f}" if base and g in times else f"{'-':>9}" for g in grids[1:])
+        lines.append(line)
+    for note in report["meta"]["skipped"]:
+        lines.append(f"skipped {note}")
+    if comparison:
+        lines.append("")
+        lines.append("vs baseline:")
+        for row in comparison:
+            flag = "  REGRESSION" if row["regression"] else ""
+            lines.append(f"  {row['name']:<28}{row['grid_size']:>5}  {row['baseline_us']:>12,.1f} -> "
+                         f"{row['median_us']:>12,.1f} us  {row['change']:+7.1%}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m redintel.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--grid-size", type=int, nargs="+", default=list(DEFAULT_GRIDS))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--only", nargs="+", help="Run only cases whose name contains one of these")
+    parser.add_argument("--no-render", action="store_true", help="Skip the pygame render cases")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Rough seconds spent per case")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a table")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown that counts as a regression (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.grid_size, args.seed, not args.no_render, args.only, args.repeat, args.min_time)
+    comparison = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare(report, json.load(f), args.threshold)
+        report["comparison"] = comparison
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2) if args.json else format_report(report, comparison))
+    if comparison and any(row["regression"] for row in comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Bitboard representation of a player's grid.
+
+Cell (x, y) is bit ``y * size + x`` of a Python int. A Board keeps separate
+masks for hits, misses and the ships underneath, so counting is a popcount
+and finding unknown cells is a few integer operations instead of a scan of
+every tile.
+
+CellPool and FreeCells are the sampling side: live sets of candidate cells
+that are updated as tiles are revealed and give a uniform random cell in
+O(1), however large the board.
+"""
+
+HIDDEN = 'H'
+MISS = 'M'
+HIT = 'X'
+
+
+class Board:
+    """A GRID_SIZE x GRID_SIZE board stored as integer bitmasks.
+
+    hit / miss are what has been revealed by attacks and bonuses, ship is
+    where the owner's ships actually are. board[r][c] still returns the old
+    'H' / 'M' / 'X' strings for code that reads the grid cell by cell.
+    """
+    __slots__ = ('size', 'full', 'hit', 'miss', 'ship')
+
+    def __init__(self, size):
+        self.size = size
+        self.full = (1 << (size * size)) - 1
+        self.hit = 0
+        self.miss = 0
+        self.ship = 0
+
+    # --- Coordinates ---
+
+    def bit(self, coord):
+        """Returns the single-bit mask of an (x, y) coordinate."""
+        x, y = coord
+        return 1 << (y * self.size + x)
+
+    def mask_of(self, coords):
+        """Returns the mask covering all given (x, y) coordinates."""
+        mask = 0
+        for x, y in coords:
+            mask |= 1 << (y * self.size + x)
+        return mask
+
+    def in_bounds(self, coord):
+        x, y = coord
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    # --- Masks ---
+
+    @property
+    def unknown(self):
+        """Cells that have not been revealed yet."""
+        return self.full & ~(self.hit | self.miss)
+
+    @staticmethod
+    def count(mask):
+        """Number of cells in a mask."""
+        return mask.bit_count()
+
+    def cells(self, mask):
+        """Yields the (x, y) coordinate of every cell in a mask, lowest bit first."""
+        size = self.size
+        while mask:
+            low = mask & -mask
+            y, x = divmod(low.bit_length() - 1, size)
+            yield (x, y)
+            mask ^= low
+
+    def random_cell(self, mask, rng):
+        """Returns a uniformly random (x, y) cell from a mask, or None if it is empty."""
+        total = mask.bit_count()
+        if total == 0:
+            return None
+        cells = self.size * self.size
+        if total * 4 >= cells:
+            # Dense mask: a few random probes find a set bit quickly
+            while True:
+                i = rng.randrange(cells)
+                if mask >> i & 1:
+                    return (i % self.size, i // self.size)
+        # Sparse mask: walk to the k-th set bit
+        k = rng.randrange(total)
+        for i, coord in enumerate(self.cells(mask)):
+            if i == k:
+                return coord
+
+    # --- Updates ---
+
+    def place_ship(self, coords):
+        self.ship |= self.mask_of(coords)
+
+    def mark_hit(self, coord):
+        self.hit |= self.bit(coord)
+
+    def mark_miss(self, coord):
+        self.miss |= self.bit(coord)
+
+    def is_unknown(self, coord):
+        return not (self.hit | self.miss) & self.bit(coord)
+
+    def has_ship(self, coord):
+        return bool(self.ship & self.bit(coord))
+
+    # --- Compatibility accessor for renderers ---
+
+    def state(self, coord):
+        """Returns 'X' for a hit, 'M' for a miss and 'H' for a hidden cell."""
+        b = self.bit(coord)
+        if self.hit & b:
+            return HIT
+        if self.miss & b:
+            return MISS
+        return HIDDEN
+
+    def __getitem__(self, row):
+        """board[r][c] -> 'H' / 'M' / 'X', like the old list-of-lists grid."""
+        shift = row * self.size
+        hit = self.hit >> shift
+        miss = self.miss >> shift
+        return [HIT if hit >> c & 1 else MISS if miss >> c & 1 else HIDDEN for c in range(self.size)]
+
+    def __len__(self):
+        return self.size
+
+
+class CellPool:
+    """A set of (x, y) cells with O(1) add, discard and uniform sampling.
+
+    Cells live in a list plus a cell -> position index; discarding swaps the
+    last cell into the hole, so nothing ever shifts or gets rescanned.
+    """
+    __slots__ = ('items', 'pos')
+
+    def __init__(self, cells=()):
+        self.items = list(dict.fromkeys(cells))
+        self.pos = {cell: i for i, cell in enumerate(self.items)}
+
+    def add(self, cell):
+        if cell not in self.pos:
+            self.pos[cell] = len(self.items)
+            self.items.append(cell)
+
+    def discard(self, cell):
+        i = self.pos.pop(cell, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.pos[last] = i
+
+    def choice(self, rng):
+        """Returns a uniformly random cell, or None if the pool is empty."""
+        return self.items[rng.randrange(len(self.items))] if self.items else None
+
+    def sample(self, rng, k):
+        """Returns up to k distinct random cells."""
+        return [self.items[i] for i in rng.sample(range(len(self.items)), min(k, len(self.items)))]
+
+    def __contains__(self, cell):
+        return cell in self.pos
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class FreeCells:
+    """Every cell of a size x size board except an excluded set, sampled in O(1).
+
+    While most of the board is free a random probe almost always lands on a
+    free cell, so nothing is materialised; only once the free cells drop
+    below a quarter of the board are they copied into a CellPool.
+    """
+    __slots__ = ('size', 'excluded', 'pool')
+
+    def __init__(self, size, excluded=()):
+        self.size = size
+        self.excluded = set(excluded)
+        self.pool = None
+
+    def discard(self, cell):
+        self.excluded.add(cell)
+        if self.pool is not None:
+            self.pool.discard(cell)
+
+    def sample(self, rng, k):
+        """Returns up to k distinct random free cells."""
+        if self.pool is None and len(self) * 4 < self.size * self.size:
+            self.pool = CellPool((x, y) for y in range(self.size) for x in range(self.size)
+                                 if (x, y) not in self.excluded)
+        if self.pool is not None:
+            return self.pool.sample(rng, k)
+        picked = []
+        k = min(k, len(self))
+        while len(picked) < k:
+            cell = (rng.randrange(self.size), rng.randrange(self.size))
+            if cell not in self.excluded and cell not in picked:
+                picked.append(cell)
+        return picked
+
+    def __contains__(self, cell):
+        x, y = cell
+        return 0 <= x < self.size and 0 <= y < self.size and cell not in self.excluded
+
+    def __len__(self):
+        return self.size * self.size - len(self.excluded)
+
+    def __iter__(self):
+        return ((x, y) for y in range(self.size) for x in range(self.size) if (x, y) not in self.excluded)
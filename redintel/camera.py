@@ -0,0 +1,101 @@
+"""Viewport camera for boards larger than their place on screen.
+
+A board view has a fixed-size viewport on screen; the camera decides which
+part of the board it shows (scroll offset, in board pixels) and how big a
+tile is (zoom). Everything that turns cells into screen positions or back
+goes through it, so drawing can stop at the visible cells and a 1000x1000
+board costs the same per frame as a 12x12 one.
+
+Rects are plain (x, y, w, h) tuples; nothing here imports pygame.
+"""
+import math
+
+MIN_TILE = 4 # Smallest zoom, in pixels per tile (keeps a full repaint to a few thousand cells)
+MAX_TILE = 60
+ZOOM_STEP = 1.25 # Tile size factor per mouse wheel notch
+
+
+class Camera:
+    """Scroll and zoom of one board viewport."""
+
+    def __init__(self, board_size, view_width, view_height, tile, min_tile=MIN_TILE, max_tile=MAX_TILE):
+        self.board_size = board_size
+        self.view_width = view_width
+        self.view_height = view_height
+        self.x = 0 # Screen position of the viewport's top-left corner
+        self.y = 0
+        # Never zoom out further than the board filling the viewport
+        self.min_tile = max(min_tile, math.ceil(max(view_width, view_height) / board_size))
+        self.max_tile = max(max_tile, self.min_tile)
+        self.tile = min(max(tile, self.min_tile), self.max_tile)
+        self.scroll_x = 0 # Board pixel shown at the viewport's left / top edge
+        self.scroll_y = 0
+
+    # --- State ---
+
+    def move_to(self, x, y):
+        """Places the viewport on screen."""
+        self.x, self.y = x, y
+
+    def view_key(self):
+        """Changes whenever what the viewport shows moves or scales."""
+        return (self.tile, self.scroll_x, self.scroll_y)
+
+    def visible_cells(self):
+        """Returns (x0, y0, x1, y1): the half-open range of cells at least partly in view."""
+        tile = self.tile
+        x0, y0 = self.scroll_x // tile, self.scroll_y // tile
+        x1 = min(self.board_size, -(-(self.scroll_x + self.view_width) // tile))
+        y1 = min(self.board_size, -(-(self.scroll_y + self.view_height) // tile))
+        return x0, y0, x1, y1
+
+    # --- Coordinates ---
+
+    def cell_rect(self, cx, cy):
+        """Rect of a cell relative to the viewport (may stick out of it)."""
+        return (cx * self.tile - self.scroll_x, cy * self.tile - self.scroll_y, self.tile, self.tile)
+
+    def screen_rect(self, cx, cy):
+        """Rect of a cell on screen."""
+        x, y, w, h = self.cell_rect(cx, cy)
+        return (self.x + x, self.y + y, w, h)
+
+    def contains(self, pos):
+        px, py = pos
+        return self.x <= px < self.x + self.view_width and self.y <= py < self.y + self.view_height
+
+    def cell_at(self, pos, snap=False):
+        """Cell under a screen position (not bounds-checked). snap rounds to the nearest tile corner."""
+        half = self.tile // 2 if snap else 0
+        return ((pos[0] - self.x + self.scroll_x + half) // self.tile,
+                (pos[1] - self.y + self.scroll_y + half) // self.tile)
+
+    # --- Moving ---
+
+    def pan(self, dx, dy):
+        """Drags the board by (dx, dy) screen pixels."""
+        self.scroll_x -= dx
+        self.scroll_y -= dy
+        self._clamp()
+
+    def zoom(self, steps, anchor=None):
+        """Zooms in (steps > 0) or out, keeping the board point under anchor (a screen pos) still."""
+        tile = min(self.max_tile, max(self.min_tile, round(self.tile * ZOOM_STEP ** steps)))
+        if tile == self.tile:
+            return
+        ax, ay = (anchor[0] - self.x, anchor[1] - self.y) if anchor else (self.view_width // 2, self.view_height // 2)
+        self.scroll_x = (self.scroll_x + ax) * tile // self.tile - ax
+        self.scroll_y = (self.scroll_y + ay) * tile // self.tile - ay
+        self.tile = tile
+        self._clamp()
+
+    def center_on(self, cell):
+        cx, cy = cell
+        self.scroll_x = cx * self.tile + self.tile // 2 - self.view_width // 2
+        self.scroll_y = cy * self.tile + self.tile // 2 - self.view_height // 2
+        self._clamp()
+
+    def _clamp(self):
+        extent = self.board_size * self.tile
+        self.scroll_x = min(max(self.scroll_x, 0), max(extent - self.view_width, 0))
+        self.scroll_y = min(max(self.scroll_y, 0), max(extent - self.view_height, 0))
@@ -0,0 +1,95 @@
+"""Dirty-rectangle rendering for the in-game screens.
+
+Instead of clearing and redrawing the whole screen every frame, the game UI
+describes itself as a list of elements, each with a key, the rect it covers,
+a signature of everything its look depends on (text, hover state, board
+masks, ...) and a function that draws it. DirtyRenderer compares this frame's
+elements with the last frame's:
+
+* an element that is new, gone, moved or has a different signature marks its
+  old and new rects dirty;
+* overlapping dirty rects are merged, and each one is repainted by filling
+  the background and redrawing, clipped to the rect, every element that
+  touches it (in order, so layering is kept);
+* only those rects are pushed with pygame.display.update().
+
+A static screen (traffic light, opponent's turn) costs a few comparisons and
+no drawing at all; the War Room countdown only repaints the timer digits.
+"""
+import pygame
+
+
+def merge_rects(rects):
+    """Unions overlapping rects until none overlap."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRenderer:
+    """Repaints only the screen regions whose elements changed since the last frame."""
+
+    def __init__(self, surface, background):
+        self.surface = surface
+        self.background = background
+        self.elements = [] # (key, rect, signature, draw) added this frame
+        self.previous = {} # key -> (rect, signature) of the last frame
+        self.full = True # Next frame repaints the whole screen
+
+    def invalidate(self):
+        """Forces a full repaint on the next frame (e.g. after another screen drew over everything)."""
+        self.full = True
+
+    def add(self, key, rect, signature, draw):
+        """Registers an element for this frame; draw() paints it onto the surface."""
+        self.elements.append((key, pygame.Rect(rect), signature, draw))
+
+    def end_frame(self):
+        """Repaints what changed. Returns the list of rects to pass to pygame.display.update()."""
+        elements, self.elements = self.elements, []
+        current = {key: (rect, signature) for key, rect, signature, _ in elements}
+        previous, self.previous = self.previous, current
+        screen_rect = self.surface.get_rect()
+
+        if self.full:
+            self.full = False
+            self.surface.fill(self.background)
+            for _, _, _, draw in elements:
+                draw()
+            return [screen_rect]
+
+        dirty = []
+        for key, (rect, signature) in current.items():
+            old = previous.get(key)
+            if old is None:
+                dirty.append(rect)
+            elif old[1] != signature or old[0] != rect:
+                dirty.append(rect)
+                if old[0] != rect:
+                    dirty.append(old[0])
+        for key, (rect, _) in previous.items():
+            if key not in current:
+                dirty.append(rect)
+        if not dirty:
+            return []
+
+        # Degenerate rects (e.g. a negative width) draw nothing, so they never need repainting
+        dirty = [rect.clip(screen_rect) for rect in merge_rects(r for r in dirty if r.width > 0 and r.height > 0)]
+        dirty = [rect for rect in dirty if rect.width > 0 and rect.height > 0]
+        for area in dirty:
+            self.surface.set_clip(area)
+            self.surface.fill(self.background, area)
+            for _, rect, _, draw in elements:
+                if rect.colliderect(area):
+                    draw()
+        self.surface.set_clip(None)
+        return dirty
@@ -0,0 +1,364 @@
+"""Headless Red Room rules engine.
+
+Everything that decides the outcome of a match lives here: both fleets, both
+grids, the bonus streak / corruption counters, the traffic light and the turn
+phase. Nothing in this module imports pygame, so games can be played out
+thousands of times per second for balance testing, and the pygame front end
+only has to draw whatever state the engine is in.
+
+Typical use:
+
+    engine = GameEngine()
+    engine.reset(seed=1)
+    while engine.phase != PHASE_GAME_OVER:
+        engine.step(...)   # see GameEngine.step for the action of each phase
+"""
+import random
+
+from .board import Board, CellPool, FreeCells
+from .placement import placement_tables
+from .rng import RngStreams, new_seed
+from .ships import Fleet, Ship
+
+GRID_SIZE = 12  # 12x12 grid
+
+# Ship options (smaller versions of the ships)
+ship_options = {
+    "T-shape": [(0, 0), (1, 0), (2, 0), (1, -1), (1, 1)],  # T-shape
+    "L-shape": [(0, 0), (1, 0), (2, 0), (2, 1)],           # L-shape
+    "Box": [(0, 0), (0, 1), (1, 0), (1, 1)],               # 2x2 square
+    "Linear 4": [(0, 0), (1, 0), (2, 0), (3, 0)],          # 4x1 line
+    "Linear 2": [(0, 0), (1, 0)],                          # 2x1 line
+    "Unit": [(0, 0)]                                       # Single tile
+}
+
+# Turn phases (same strings the front end uses for game_state)
+PHASE_WAR_ROOM = "PLAYER1_WAR_ROOM"
+PHASE_INTEL_RESOLUTION = "PLAYER1_INTEL_RESOLUTION"
+PHASE_ATTACK_RESOLUTION = "PLAYER1_ATTACK_RESOLUTION"
+PHASE_TRAFFIC_LIGHT = "PLAYER1_TRAFFIC_LIGHT"
+PHASE_PLAYER2_TURN = "PLAYER2_TURN"
+PHASE_GAME_OVER = "GAME_OVER"
+
+# Balance knobs
+CORRUPTION_THRESHOLD = 3 # Hits in a row before the corruption roll
+CORRUPTION_CHANCE = 0.90 # Chance the roll triggers corruption
+BONUS_OPTIONS = ["Reveal Segment Lv1", "Learn Shape (N/A)", "Attack+ (N/A)"] # MVP: Only first is functional
+TRAFFIC_LIGHTS = ('G', 'Y', 'R')
+
+PLAYER1 = "Player 1"
+PLAYER2 = "Player 2"
+
+
+# --- Rule Helpers ---
+
+def ship_coords(shape, grid_x, grid_y):
+    """Returns the board coordinates covered by a shape placed at (grid_x, grid_y)."""
+    return [(grid_x + dx, grid_y + dy) for dx, dy in shape]
+
+def ship_states_from_placement(placed_ships):
+    """Converts placement-screen ships ({name, shape, grid_x, grid_y}) into a Fleet."""
+    return Fleet(Ship(ship['name'], ship_coords(ship['shape'], ship['grid_x'], ship['grid_y']))
+                 for ship in placed_ships)
+
+def place_ships_randomly(player_ships_state_list, rng=random, grid_size=GRID_SIZE, ships=None):
+    """Places ships randomly into a Fleet for the simulated opponent. Returns True if the whole fleet fit."""
+    if ships is None: ships = ship_options
+    fleet = placement_tables(grid_size, ships).generate(rng)
+    if fleet is None:
+        return False # No legal arrangement exists for this grid / fleet
+    for ship_name, coords in fleet:
+        player_ships_state_list.add(Ship(ship_name, coords))
+    return True
+
+def get_all_hidden_ship_coords(player_ship_state):
+    """Returns a list of coordinates for all ship segments that haven't been hit yet."""
+    return [coord for ship in player_ship_state if not ship.sunk
+            for coord in ship.coords if not ship.is_hit(coord)]
+
+def check_hit(target_coord, opponent_ships_state):
+    """Checks if the target coordinate hits any ship. Returns (hit, ship hit)."""
+    ship = opponent_ships_state.ship_at(target_coord)
+    return ship is not None, ship
+
+
+# --- Player 2 AI ---
+
+class RandomTargeting:
+    """Player 2's default AI: fires at a random hidden tile on Player 1's grid.
+
+    Any object with the same three methods can be passed to GameEngine as
+    player2_ai.
+    """
+
+    def reset(self, engine):
+        """Called by GameEngine.reset() once both fleets are placed."""
+
+    def choose(self, engine):
+        """Returns the (x, y) to fire at, or None if nothing is left."""
+        board = engine.player1_grid
+        return board.random_cell(board.unknown, engine.rng) # engine.rng is the opponent's own stream
+
+    def observe(self, coord, ship, sunk):
+        """Result of the last shot: the ship hit (None on a miss) and whether it sank."""
+
+
+# --- Engine ---
+
+class GameEngine:
+    """One Red Room match: Player 1 (consultant-assisted) vs the simulated Player 2.
+
+    The engine only advances when step() is called, one phase at a time:
+
+        PLAYER1_WAR_ROOM          action = index into consultant_options, or None for a timeout
+        PLAYER1_INTEL_RESOLUTION  action = index into BONUS_OPTIONS (only reached on a hit)
+        PLAYER1_ATTACK_RESOLUTION action ignored; the attack lands on the grid
+        PLAYER1_TRAFFIC_LIGHT     action = 'G', 'Y' or 'R'
+        PLAYER2_TURN              action ignored; Player 2 fires
+        GAME_OVER                 no further steps
+
+    step() returns the list of events it produced, e.g. ('hit', PLAYER1, (3, 4)),
+    ('sunk', PLAYER2, 'Box') or ('game_over', PLAYER1).
+    """
+
+    def __init__(self, grid_size=GRID_SIZE, ships=None, player2_ai=None,
+                 corruption_threshold=CORRUPTION_THRESHOLD, corruption_chance=CORRUPTION_CHANCE, turn_log=None):
+        self.grid_size = grid_size
+        self.ships = ship_options if ships is None else ships
+        self.player2_ai = RandomTargeting() if player2_ai is None else player2_ai
+        self.corruption_threshold = corruption_threshold
+        self.corruption_chance = corruption_chance
+        self.turn_log = turn_log # Optional redintel.turnlog.TurnLog: every reset and step is appended to it
+        self.seed = None
+        self.rngs = RngStreams(new_seed())
+        self.phase = PHASE_GAME_OVER
+        self.winner = None
+
+    @property
+    def rng(self):
+        """Player 2's random stream; the one player2_ai implementations should draw from."""
+        return self.rngs.opponent
+
+    def reset(self, seed=None, player1_ships=None):
+        """Starts a new match.
+
+        Every random roll comes from per-subsystem streams derived from seed
+        (see redintel.rng); without one a fresh seed is picked and kept in
+        engine.seed, so the match can still be logged and replayed.
+        player1_ships is the placement-screen list ({name, shape, grid_x, grid_y});
+        when omitted Player 1's fleet is placed randomly as well. Raises
+        ValueError if a random fleet cannot be placed on the grid.
+        """
+        self.seed = new_seed() if seed is None else seed
+        self.rngs = RngStreams(self.seed)
+
+        if player1_ships is not None:
+            self.player1_ships_state = ship_states_from_placement(player1_ships)
+        else:
+            self.player1_ships_state = Fleet()
+            self._place_fleet(self.player1_ships_state)
+        self.player2_ships_state = Fleet()
+        self._place_fleet(self.player2_ships_state)
+
+        self.player1_grid = Board(self.grid_size) # Player 1's grid as seen by Player 2
+        self.player2_grid = Board(self.grid_size) # Player 2's grid as seen by Player 1
+        for ship in self.player1_ships_state:
+            self.player1_grid.place_ship(ship.coords)
+        for ship in self.player2_ships_state:
+            self.player2_grid.place_ship(ship.coords)
+        # Live candidate pools for the consultant, kept current by attacks and reveals
+        ship_cells = self.player2_ships_state.index
+        self.player2_unhit_cells = CellPool(ship_cells)
+        self.player2_open_water = FreeCells(self.grid_size, ship_cells)
+
+        self.player1_bonus_streak = 0
+        self.player1_corruption_counter = 0
+        self.corruption_activated_last_turn = False
+        self.player1_traffic_light = 'Y'
+        self.consultant_options = []
+        self.selected_target = None
+        self.last_attack_result = None
+        self.p2_last_target = None
+        self.p2_last_result = None
+        self.winner = None
+        self.turn = 0
+
+        self.player2_ai.reset(self)
+        self._enter_war_room()
+        if self.turn_log is not None:
+            self.turn_log.begin(self, player1_ships)
+        return self
+
+    def _place_fleet(self, fleet):
+        if not place_ships_randomly(fleet, self.rngs.placement, self.grid_size, self.ships):
+            raise ValueError(f"The fleet does not fit on a {self.grid_size}x{self.grid_size} grid")
+
+    # --- Phase handling ---
+
+    def step(self, action=None):
+        """Advances the match by one phase. See the class docstring for actions."""
+        events = []
+        phase = self.phase
+        if self.phase == PHASE_WAR_ROOM:
+            self._resolve_intel(action, events)
+        elif self.phase == PHASE_INTEL_RESOLUTION:
+            self._apply_bonus(action, events)
+        elif self.phase == PHASE_ATTACK_RESOLUTION:
+            self._resolve_attack(events)
+        elif self.phase == PHASE_TRAFFIC_LIGHT:
+            if action not in TRAFFIC_LIGHTS:
+                raise ValueError(f"Invalid traffic light: {action!r}")
+            self.player1_traffic_light = action
+            self.phase = PHASE_PLAYER2_TURN
+        elif self.phase == PHASE_PLAYER2_TURN:
+            self._player2_turn(events)
+        else:
+            raise RuntimeError("Game is over; call reset() to start a new match")
+        if self.turn_log is not None:
+            self.turn_log.record(self, phase, action, events)
+        return events
+
+    def _enter_war_room(self):
+        self.turn += 1
+        self.selected_target = None
+        self.consultant_options = self.generate_consultant_options()
+        self.phase = PHASE_WAR_ROOM
+
+    def _resolve_intel(self, action, events):
+        if action is None: # Timer expired
+            self.selected_target = None
+            self.last_attack_result = "MISS (Timeout)"
+            self.player1_bonus_streak = 0
+            self.player1_corruption_counter = 0
+            self.corruption_activated_last_turn = False
+            self.phase = PHASE_ATTACK_RESOLUTION
+            return
+
+        if not 0 <= action < len(self.consultant_options):
+            raise ValueError(f"Invalid consultant option: {action!r}")
+        self.selected_target = self.consultant_options[action]
+        hit, _ = check_hit(self.selected_target, self.player2_ships_state)
+
+        self.corruption_activated_last_turn = False
+        if hit:
+            self.last_attack_result = "HIT"
+            self.player1_bonus_streak += 1
+            self.player1_corruption_counter += 1
+            if self.player1_corruption_counter >= self.corruption_threshold:
+                if self.rngs.corruption.random() < self.corruption_chance:
+                    # Note: Streak reset happens *after* attack resolution phase
+                    self.corruption_activated_last_turn = True
+                    self.player1_corruption_counter = 0
+                    events.append(('corruption', PLAYER1))
+            self.phase = PHASE_INTEL_RESOLUTION # Bonus menu
+        else:
+            self.last_attack_result = "MISS"
+            self.player1_bonus_streak = 0
+            self.player1_corruption_counter = 0
+            self.phase = PHASE_ATTACK_RESOLUTION
+
+    def _apply_bonus(self, action, events):
+        if action is None or not 0 <= action < len(BONUS_OPTIONS):
+            raise ValueError(f"Invalid bonus option: {action!r}")
+        if BONUS_OPTIONS[action] == "Reveal Segment Lv1":
+            # Reveal 1 adjacent unknown tile next to the hit (selected_target)
+            board = self.player2_grid
+            hit_x, hit_y = self.selected_target
+            possible_reveals = []
+            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]: # Orthogonal adjacent
+                check = (hit_x + dx, hit_y + dy)
+                if board.in_bounds(check) and board.is_unknown(check):
+                    possible_reveals.append(check)
+            if possible_reveals:
+                reveal_coord = self.rngs.bonus.choice(possible_reveals)
+                is_ship_segment = board.has_ship(reveal_coord)
+                if is_ship_segment: # Mark revealed tile appropriately
+                    board.mark_hit(reveal_coord) # Revealed, not damaged: still a guaranteed hit
+                else:
+                    board.mark_miss(reveal_coord)
+                    self.player2_open_water.discard(reveal_coord)
+                events.append(('reveal', reveal_coord, is_ship_segment))
+        # No matter the choice, move on after selection
+        self.phase = PHASE_ATTACK_RESOLUTION
+
+    def _resolve_attack(self, events):
+        # Apply attack result to grid AFTER the result has been shown
+        if self.selected_target:
+            board = self.player2_grid
+            if self.last_attack_result == "HIT":
+                board.mark_hit(self.selected_target)
+                self.player2_unhit_cells.discard(self.selected_target)
+                self._record_hit(self.player2_ships_state, self.selected_target, PLAYER1, events)
+            elif board.is_unknown(self.selected_target): # Don't mark over a tile revealed by a bonus
+                board.mark_miss(self.selected_target)
+                self.player2_open_water.discard(self.selected_target)
+                events.append(('miss', PLAYER1, self.selected_target))
+
+        # Reset streak if corruption happened
+        if self.corruption_activated_last_turn:
+            self.player1_bonus_streak = 0
+
+        if self.phase != PHASE_GAME_OVER:
+            self.phase = PHASE_TRAFFIC_LIGHT
+
+    def choose_player2_target(self):
+        """Asks Player 2's AI where to fire."""
+        return self.player2_ai.choose(self)
+
+    def _player2_turn(self, events):
+        p2_target = self.choose_player2_target()
+        self.p2_last_target = p2_target
+        if p2_target is not None:
+            hit, ship = check_hit(p2_target, self.player1_ships_state)
+            sunk = False
+            if hit:
+                self.player1_grid.mark_hit(p2_target)
+                self.p2_last_result = "HIT"
+                sunk = self._record_hit(self.player1_ships_state, p2_target, PLAYER2, events)
+            else:
+                self.player1_grid.mark_miss(p2_target)
+                self.p2_last_result = "MISS"
+                events.append(('miss', PLAYER2, p2_target))
+            self.player2_ai.observe(p2_target, ship, sunk)
+
+        self.corruption_activated_last_turn = False # Reset corruption flag after P2 turn finishes
+        if self.phase != PHASE_GAME_OVER:
+            self._enter_war_room()
+
+    def _record_hit(self, fleet, coord, attacker, events):
+        """Applies a hit to the defending fleet; sinking and the win are detected right here.
+
+        Returns True if the hit sank a ship.
+        """
+        events.append(('hit', attacker, coord))
+        ship, sunk = fleet.record_hit(coord)
+        if sunk:
+            defender = PLAYER2 if attacker == PLAYER1 else PLAYER1
+            events.append(('sunk', defender, ship.name))
+            if fleet.all_sunk:
+                self.winner = attacker
+                self.phase = PHASE_GAME_OVER
+                events.append(('game_over', attacker))
+        return sunk
+
+    # --- Consultant ---
+
+    def generate_consultant_options(self):
+        """Generates 3 target options, 1 guaranteed hit."""
+        options = []
+
+        # 1. Find a guaranteed hit location: a ship segment not damaged yet
+        rng = self.rngs.consultant
+        guaranteed_hit = self.player2_unhit_cells.choice(rng)
+        if guaranteed_hit:
+            options.append(guaranteed_hit)
+
+        # 2. Add 2 misses: empty sea tiles (not hit before, not part of a ship)
+        options.extend(self.player2_open_water.sample(rng, 2))
+
+        # Ensure we always have 3 options, even if few spots left
+        while len(options) < 3:
+            options.append((rng.randint(0, self.grid_size - 1), rng.randint(0, self.grid_size - 1)))
+
+        rng.shuffle(options) # Shuffle the final list
+        return options
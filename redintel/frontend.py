@@ -0,0 +1,1484 @@
+"""The pygame front end: menu, ship placement, the War Room and the battle screens.
+
+    python -m redintel
+
+Importing this module opens no window and starts no SDL subsystem, so tools
+and benchmarks can use its layout and drawing functions; main() opens the
+display (init_display()) and runs the game loop. Fonts load on first use.
+"""
+from .startup import StartupTimer
+
+startup = StartupTimer() # Time to first frame, reported once it is on screen
+
+import os
+import pygame
+import sys
+
+from .ai import DensityHunter
+from .camera import Camera
+from .dirty import DirtyRenderer
+from .gridview import GridSurface
+from .headless import HeadlessRun
+from .layout import HitGrid
+from .overlays import OverlayPool
+from .preload import Preloader
+from .profiler import FrameProfiler
+from .replay import ReplayMatch
+from .resources import LazyFont
+from .scheduler import FrameScheduler
+from .snapshot import Autosaver
+from .textcache import TextCache
+from .timeline import Timeline, ease_out
+from .turnlog import TurnLog
+from .engine import (GameEngine, ship_options, BONUS_OPTIONS, PLAYER1,
+                     PHASE_WAR_ROOM, PHASE_INTEL_RESOLUTION, PHASE_ATTACK_RESOLUTION, PHASE_PLAYER2_TURN, PHASE_GAME_OVER)
+
+# Scripted run on a virtual clock under the dummy video driver (see redintel.headless)
+HEADLESS_SCRIPT = os.environ.get("REDINTEL_HEADLESS")
+headless = HeadlessRun.load(HEADLESS_SCRIPT) if HEADLESS_SCRIPT else None
+if headless:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Game time (ms) and pointer: the real ones, or the virtual clock and scripted mouse of a headless run
+now_ms = headless.clock.ticks if headless else pygame.time.get_ticks
+pointer_pos = headless.mouse_pos if headless else pygame.mouse.get_pos
+
+# Screen dimensions
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+screen = None # The display surface, opened by init_display()
+
+# Colors
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+WHITE = (255, 255, 255)
+GRID_COLOR = (160, 160, 160)  # Faded grey for grid lines
+SHIP_COLOR = (90, 121, 200)  # Blue for ships
+PREVIEW_COLOR = pygame.Color(255, 0, 0, 128) # Transparent red for invalid preview using Color object for alpha
+PLACEMENT_BACKGROUND = (60, 51, 154)  # #3c339a behind the placement grid
+GAME_BACKGROUND = (30, 30, 60)  # Dark blue behind the in-game screens
+
+# Fonts (each one is loaded the first time it draws or measures text)
+title_font = LazyFont(None, 100)  # Futuristic font for the title
+button_font = LazyFont(None, 50)  # Font for the button
+label_font = LazyFont(None, 18)  # Smaller font for grid labels
+overlay_font = LazyFont(None, 20)  # Frame timing overlay
+status_font = LazyFont(None, 24)  # In-game status lines and panel titles
+option_font = LazyFont(None, 30)  # Consultant option buttons
+bonus_font = LazyFont(None, 28)  # Bonus menu buttons
+rematch_font = LazyFont(None, 40)  # Game over prompt
+submit_font = LazyFont(None, 30)  # Smaller text for "Submit"
+message_font = LazyFont(None, 24)  # Validation message
+FONTS = (title_font, button_font, label_font, overlay_font, status_font, option_font, bonus_font, rematch_font,
+         submit_font, message_font)
+
+# Every string the UI draws goes through this, so static text is rasterised once
+text_cache = TextCache()
+render_text = text_cache.render
+
+# Translucent shades (darkening, strips, preview tints) reuse these surfaces instead of allocating per frame
+overlay_pool = OverlayPool()
+
+# Animations and timed transitions are tasks on this timeline, advanced once per frame by the main loop
+timeline = Timeline(now_ms)
+
+# Button dimensions for the menu screen
+button_width, button_height = 200, 60  # Original size for "New Game" button
+button_x = (SCREEN_WIDTH - button_width) // 2  # Centered horizontally
+button_y = SCREEN_HEIGHT // 2 + 50  # Positioned below the title
+
+# Grid dimensions
+GRID_SIZE = int(os.environ.get("REDINTEL_GRID_SIZE", 12))  # 12x12 grid by default; up to 1000x1000 scrolls in its viewport
+TILE_SIZE = 30  # Reduced tile size (smaller grid); starting zoom of every board camera
+BORDER_SIZE = 60  # Reduced space for labels and padding around the grid
+BOARD_VIEW_SIZE = min(GRID_SIZE * TILE_SIZE, 360)  # On-screen size of a board; bigger boards pan / zoom inside it
+
+# Center the grid
+GRID_X = (SCREEN_WIDTH - BOARD_VIEW_SIZE) // 2
+GRID_Y = (SCREEN_HEIGHT - BOARD_VIEW_SIZE) // 2 - 50  # Adjusted for gap above ship options
+
+# Ship option dimensions
+OPTION_BOX_SIZE = 50  # Reduced size for ship option boxes
+OPTION_BOX_PADDING = 10  # Reduced padding between boxes
+SHIP_OPTIONS_Y = GRID_Y + BOARD_VIEW_SIZE + 10  # Positioned directly under the grid
+
+# Submit button dimensions for the grid view
+submit_button_width_grid, submit_button_height_grid = 100, 40  # Smaller size for the grid view
+submit_button_x_grid = SCREEN_WIDTH - submit_button_width_grid - 3  # Padding of 3 pixels from the right edge
+submit_button_y_grid = SCREEN_HEIGHT - submit_button_height_grid - 3  # Padding of 3 pixels from the bottom edge
+
+# Variables to track dragging state
+dragging_ship = None
+dragging_offset_x = 0
+dragging_offset_y = 0
+placed_ships = []  # List to store placed ships
+
+# List to track names of placed ships
+placed_ship_names = []
+
+# Variables for submit button validation
+show_validation_message = False
+validation_message_time = 0
+
+# Variables for flashing preview
+preview_visible = True
+flash_counter = 0
+FLASH_INTERVAL = 30  # Number of frames between flashes
+
+# --- Core Functions ---
+
+# Function to check if a ship placement violates the 3x3 adjacent rule
+def is_adjacent_to_placed_ships(grid_x, grid_y, shape):
+    for ship in placed_ships:
+        for dx, dy in ship["shape"]:
+            placed_x = ship["grid_x"] + dx
+            placed_y = ship["grid_y"] + dy
+
+            # Check the 3x3 area around the placed ship's tile
+            for sx, sy in shape:
+                tile_x = grid_x + sx
+                tile_y = grid_y + sy
+                if abs(tile_x - placed_x) <= 1 and abs(tile_y - placed_y) <= 1:
+                    return True  # Adjacent ship found
+    return False
+
+# Function to draw ship options
+def draw_ship_options():
+    for ship_name, ship_shape in ship_options.items():
+        # Option boxes are centred under the grid, see build_ui_layout()
+        option_x, option_y = ui_layout["ship_options"][ship_name].topleft
+
+        # Skip ships that have already been placed
+        if ship_name in placed_ship_names:
+            # Draw a visually distinct empty/used box
+            pygame.draw.rect(screen, (50, 50, 50), (option_x, option_y, OPTION_BOX_SIZE, OPTION_BOX_SIZE)) # Dark grey for used
+            pygame.draw.rect(screen, GRID_COLOR, (option_x, option_y, OPTION_BOX_SIZE, OPTION_BOX_SIZE), 1) # Keep outline
+        else:
+            # Draw the available option box
+            pygame.draw.rect(screen, (30, 30, 30), (option_x, option_y, OPTION_BOX_SIZE, OPTION_BOX_SIZE)) # Dark background for options
+            pygame.draw.rect(screen, GRID_COLOR, (option_x, option_y, OPTION_BOX_SIZE, OPTION_BOX_SIZE), 1) # Outline
+
+            # --- Calculate ship bounds to center it ---
+            min_dx = min(p[0] for p in ship_shape)
+            max_dx = max(p[0] for p in ship_shape)
+            min_dy = min(p[1] for p in ship_shape)
+            max_dy = max(p[1] for p in ship_shape)
+            ship_width_tiles = max_dx - min_dx + 1
+            ship_height_tiles = max_dy - min_dy + 1
+            
+            tile_render_size = 8 # Smaller tile size for the ship sprites
+            ship_render_width = ship_width_tiles * tile_render_size
+            ship_render_height = ship_height_tiles * tile_render_size
+
+            # Calculate top-left corner for rendering the ship centered
+            render_start_x = option_x + (OPTION_BOX_SIZE - ship_render_width) // 2
+            render_start_y = option_y + (OPTION_BOX_SIZE - ship_render_height) // 2
+
+            # Adjust dx, dy based on min_dx, min_dy to render relative to top-left
+            for dx, dy in ship_shape:
+                ship_part_rect = pygame.Rect(
+                    render_start_x + (dx - min_dx) * tile_render_size,
+                    render_start_y + (dy - min_dy) * tile_render_size,
+                    tile_render_size -1, tile_render_size -1 # Small gap between tiles
+                )
+                pygame.draw.rect(screen, SHIP_COLOR, ship_part_rect)
+
+
+# Function to draw the flashing preview of the ship while dragging
+def draw_flashing_preview():
+    global preview_visible, flash_counter
+
+    if dragging_ship:
+        # Increment the flash counter
+        flash_counter += 1
+        if flash_counter >= FLASH_INTERVAL:
+            preview_visible = not preview_visible  # Toggle visibility
+            flash_counter = 0
+
+        # Calculate the potential grid position of the ship's origin (top-left)
+        mouse_x, mouse_y = pointer_pos() # Use current mouse pos for preview
+        
+        # Adjust mouse position based on dragging offset relative to the ship's (0,0) tile
+        origin_mouse_x = mouse_x - dragging_offset_x 
+        origin_mouse_y = mouse_y - dragging_offset_y
+
+        camera = board_view("placement").camera
+        grid_x, grid_y = camera.cell_at((origin_mouse_x, origin_mouse_y), snap=True) # Add half tile for better snapping
+
+        # Check if the placement is valid (within grid and not adjacent)
+        valid_placement = True
+        collision = False
+        adjacent = False
+
+        temp_preview_rects = []
+        for dx, dy in dragging_ship["shape"]:
+            tile_x = grid_x + dx
+            tile_y = grid_y + dy
+            if not (0 <= tile_x < GRID_SIZE and 0 <= tile_y < GRID_SIZE):
+                valid_placement = False
+                break
+            # Check for direct collision with already placed ships
+            for ship in placed_ships:
+                for pdx, pdy in ship["shape"]:
+                    if tile_x == ship["grid_x"] + pdx and tile_y == ship["grid_y"] + pdy:
+                        collision = True
+                        break
+                if collision: break
+            if collision: break
+
+            rect = pygame.Rect(camera.screen_rect(tile_x, tile_y))
+            temp_preview_rects.append(rect)
+
+        if valid_placement and not collision:
+            adjacent = is_adjacent_to_placed_ships(grid_x, grid_y, dragging_ship["shape"])
+            if adjacent:
+                valid_placement = False
+
+        # Draw the preview if it's supposed to be visible
+        if preview_visible:
+            if valid_placement:
+                preview_surface = overlay_pool.get((camera.tile, camera.tile), (0, 255, 0, 100)) # Greenish tint for valid
+            else:
+                preview_surface = overlay_pool.get((camera.tile, camera.tile), (255, 0, 0, 100)) # Reddish tint for invalid
+
+            screen.set_clip((GRID_X, GRID_Y, BOARD_VIEW_SIZE, BOARD_VIEW_SIZE)) # Tiles scrolled out of view stay hidden
+            for rect in temp_preview_rects:
+                 screen.blit(preview_surface, rect.topleft)
+            screen.set_clip(None)
+
+
+# Function to draw the menu screen
+def draw_menu():
+    screen.fill(BLACK)  # Black background
+
+    # Draw the title
+    title_text = render_text(title_font, "RED ROOM", RED)
+    title_x = (SCREEN_WIDTH - title_text.get_width()) // 2
+    title_y = SCREEN_HEIGHT // 4
+    screen.blit(title_text, (title_x, title_y))
+
+    # Draw the "New Game" button
+    button_rect = ui_layout["new_game"]
+    pygame.draw.rect(screen, WHITE, button_rect)
+    button_text = render_text(button_font, "New Game", BLACK)
+    button_text_rect = button_text.get_rect(center=button_rect.center)
+    screen.blit(button_text, button_text_rect)
+
+    # "Continue" picks up an autosaved match
+    if saved_match_available():
+        draw_button(ui_layout["continue"], "Continue")
+    if replay_available():
+        draw_button(ui_layout["replay"], "Replay")
+
+# Main menu loop
+def menu_loop():
+    scheduler = FrameScheduler(60)
+    while True:
+        for event in scheduler.events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Check if the "New Game" button is clicked
+                if widget_at(event.pos, "MENU") == "new_game":
+                    return  # Exit the menu loop and start the game
+
+        draw_menu()
+        pygame.display.flip()
+        scheduler.wait(False) # Static screen: sleep until the next click
+
+# Loading screen: the dots cycle on their own; it ends as soon as its Preloader has done all the work
+LOADING_FRAMES = [".", "..", "...", "..", "."]  # Animation frames
+LOADING_FRAME_MS = 333  # Approx 3 fps for the dots
+LOADING_BUDGET_MS = 8  # Main-thread preload work per frame, so the dots keep moving
+loading_started = 0
+loading = {"preloader": None, "then": None}
+
+def start_loading(preloader, then):
+    """Shows the loading screen while preloader works, then calls then()."""
+    global loading_started
+    loading_started = now_ms()
+    preloader.start()
+    loading.update(preloader=preloader, then=then)
+
+def update_loading():
+    """Runs this frame's share of the loading work, and then() once all of it is done."""
+    preloader = loading["preloader"]
+    if preloader is None:
+        return
+    if preloader.step(None if headless else LOADING_BUDGET_MS): # Headless: all at once, frame counts stay repeatable
+        then = loading["then"]
+        loading.update(preloader=None, then=None)
+        print(preloader.summary())
+        then()
+
+# Function to draw the loading screen
+def draw_loading_screen():
+    screen.fill(BLACK)  # Black background
+    frame = LOADING_FRAMES[(now_ms() - loading_started) // LOADING_FRAME_MS % len(LOADING_FRAMES)]
+    loading_text = render_text(button_font, f"Loading{frame}", WHITE)
+    loading_x = (SCREEN_WIDTH - loading_text.get_width()) // 2
+    loading_y = SCREEN_HEIGHT // 2
+    screen.blit(loading_text, (loading_x, loading_y))
+    # Progress bar
+    preloader = loading["preloader"]
+    if preloader is not None:
+        bar = pygame.Rect(0, 0, 300, 12)
+        bar.midtop = (SCREEN_WIDTH // 2, loading_y + loading_text.get_height() + 20)
+        pygame.draw.rect(screen, GRID_COLOR, bar, 1)
+        screen.fill(WHITE, (bar.x + 2, bar.y + 2, int((bar.width - 4) * preloader.progress), bar.height - 4))
+
+
+# Cached board surfaces, each with its own camera, by (view name, grid size)
+board_views = {}
+
+def board_view(name, grid_size=None):
+    """Returns the GridSurface behind a board view ("placement", "own_fleet", "enemy_waters").
+
+    grid_size defaults to GRID_SIZE; other sizes (the bench's boards) get views of their own.
+    """
+    grid_size = grid_size or GRID_SIZE
+    view = board_views.get((name, grid_size))
+    if view is None:
+        background, draw_cell = {"placement": (PLACEMENT_BACKGROUND, draw_placement_cell),
+                                 "own_fleet": (GAME_BACKGROUND, draw_board_cell),
+                                 "enemy_waters": (GAME_BACKGROUND, draw_board_cell)}[name]
+        camera = Camera(grid_size, BOARD_VIEW_SIZE, BOARD_VIEW_SIZE, TILE_SIZE)
+        view = board_views[name, grid_size] = GridSurface(grid_size, camera, background, draw_cell)
+    return view
+
+def visible_board_views():
+    """The board views on screen in the current game_state."""
+    if game_state == "PLACEMENT":
+        return [board_view("placement")]
+    if game_state in GAME_UI_STATES or game_state == "REPLAY":
+        return [board_view("own_fleet"), board_view("enemy_waters")]
+    return []
+
+def handle_camera_event(event):
+    """Mouse wheel zooms the board under the pointer, dragging with the right button pans it."""
+    for view in visible_board_views():
+        camera = view.camera
+        if event.type == pygame.MOUSEWHEEL and camera.contains(pointer_pos()):
+            camera.zoom(event.y, pointer_pos())
+        elif event.type == pygame.MOUSEMOTION and event.buttons[2] and camera.contains(event.pos):
+            camera.pan(*event.rel)
+
+def column_label(col):
+    """A, B, ... Z, AA, AB, ... like spreadsheet columns."""
+    label = ""
+    col += 1
+    while col:
+        col, rest = divmod(col - 1, 26)
+        label = chr(65 + rest) + label
+    return label
+
+def draw_placement_cell(surface, rect, placed):
+    pygame.draw.rect(surface, GRID_COLOR, rect, 1)  # Draw grid lines (faded grey)
+    if placed:
+        pygame.draw.rect(surface, SHIP_COLOR, (rect.x, rect.y, rect.width - 1, rect.height - 1)) # Slightly smaller to show grid lines
+
+def placed_ships_mask():
+    """Bitmask of the tiles covered by placed ships."""
+    mask = 0
+    for ship in placed_ships:
+        for dx, dy in ship["shape"]:
+            mask |= 1 << ((ship["grid_y"] + dy) * GRID_SIZE + ship["grid_x"] + dx)
+    return mask
+
+# Function to draw the grid and the ships placed on it
+def draw_grid():
+    view = board_view("placement")
+    view.camera.move_to(GRID_X, GRID_Y)
+    view.update(placed_ships_mask()) # Only tiles a ship was dropped on / picked up from get repainted
+    screen.blit(view.surface, (GRID_X, GRID_Y))
+
+# Function to draw grid labels
+def draw_labels():
+    # Only the columns / rows in view get a label; zoomed out, only every few so they don't overlap
+    camera = board_view("placement").camera
+    x0, y0, x1, y1 = camera.visible_cells()
+    step = -(-20 // camera.tile)
+    # Draw column labels (A–L)
+    for col in range(x0 - x0 % step, x1, step):
+        label = render_text(label_font, column_label(col), WHITE)  # Convert column index to letter
+        tile_x, _, tile, _ = camera.screen_rect(col, 0)
+        label_x = tile_x + tile // 2 - label.get_width() // 2
+        label_y = GRID_Y - 20 # Increased gap above the grid slightly
+        if GRID_X <= tile_x + tile // 2 < GRID_X + BOARD_VIEW_SIZE:
+            screen.blit(label, (label_x, label_y))
+
+    # Draw row labels (1–12)
+    for row in range(y0 - y0 % step, y1, step):
+        label = render_text(label_font, str(row + 1), WHITE)  # Convert row index to number
+        _, tile_y, _, tile = camera.screen_rect(0, row)
+        label_x = GRID_X - 20 - label.get_width() # Increased gap to the left slightly
+        label_y = tile_y + tile // 2 - label.get_height() // 2
+        if GRID_Y <= tile_y + tile // 2 < GRID_Y + BOARD_VIEW_SIZE:
+            screen.blit(label, (label_x, label_y))
+
+# Function to draw the "Submit" button in the grid view
+def draw_submit_button_grid():
+    button_rect = ui_layout["submit"]
+    pygame.draw.rect(screen, WHITE, button_rect)
+    submit_text = render_text(submit_font, "Submit", BLACK)
+    submit_text_rect = submit_text.get_rect(center=button_rect.center)
+    screen.blit(submit_text, submit_text_rect)
+
+# Function to draw the validation message
+def draw_validation_message():
+    global show_validation_message # Need to modify global state potentially
+    # Check if the message should disappear after 2 seconds
+    current_time = now_ms()
+    # print(f"Current time: {current_time}, Validation message time: {validation_message_time}") # Debug
+    if current_time - validation_message_time > 2000:
+        # print("Validation message timeout") # Debug
+        show_validation_message = False # Hide the message after timeout
+        return
+
+    # print("Drawing validation message") # Debug
+
+    # Define the message text
+    message_text = "Place all your ships"
+    message_surface = render_text(message_font, message_text, BLACK)  # Black text
+    text_width, text_height = message_surface.get_size()
+
+    # Calculate the message box dimensions with padding
+    padding = 5 # Increased padding slightly
+    message_box_width = text_width + 2 * padding
+    message_box_height = text_height + 2 * padding
+
+    # Position the box above the Submit button
+        # Position the box so its right edge aligns with the submit button's right edge (screen edge - padding)
+    message_box_x = SCREEN_WIDTH - message_box_width - 3
+    message_box_y = submit_button_y_grid - message_box_height - 5 # 5 pixels above submit button
+
+    # Draw the white message box
+    pygame.draw.rect(screen, WHITE, (message_box_x, message_box_y, message_box_width, message_box_height))
+
+    # Draw the black outline around the box
+    pygame.draw.rect(screen, BLACK, (message_box_x, message_box_y, message_box_width, message_box_height), 1)
+
+    # Draw the message text centered inside the box
+    text_x = message_box_x + padding
+    text_y = message_box_y + padding
+    screen.blit(message_surface, (text_x, text_y))
+
+# Screen position of a ship's (0,0) tile as drawn in its option box
+def ship_option_origin(option_x, option_y, ship_shape):
+    # Find ship center within the box
+    min_dx = min(p[0] for p in ship_shape)
+    max_dx = max(p[0] for p in ship_shape)
+    min_dy = min(p[1] for p in ship_shape)
+    max_dy = max(p[1] for p in ship_shape)
+    ship_width_tiles = max_dx - min_dx + 1
+    ship_height_tiles = max_dy - min_dy + 1
+    tile_render_size = 8
+    ship_render_width = ship_width_tiles * tile_render_size
+    ship_render_height = ship_height_tiles * tile_render_size
+    render_start_x = option_x + (OPTION_BOX_SIZE - ship_render_width) // 2
+    render_start_y = option_y + (OPTION_BOX_SIZE - ship_render_height) // 2
+    return render_start_x + (0 - min_dx) * tile_render_size, render_start_y + (0 - min_dy) * tile_render_size
+
+# Press / release points that drag a ship from its option box onto a grid cell (for scripted runs)
+def placement_drag_points(ship_name, cell):
+    option_rect = ui_layout["ship_options"][ship_name]
+    press = ship_option_origin(option_rect.x, option_rect.y, ship_options[ship_name]) # Grabbing the (0,0) tile: no drag offset
+    release = board_view("placement").camera.screen_rect(*cell)[:2]
+    return press, release
+
+# Function to handle dragging and dropping ships
+def handle_drag_and_drop(event):
+    global dragging_ship, dragging_offset_x, dragging_offset_y, placed_ships, placed_ship_names
+
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        mouse_x, mouse_y = event.pos
+
+        # Check click on ship options first
+        widget = widget_at(event.pos, "PLACEMENT")
+        if isinstance(widget, tuple) and widget[0] == "ship":
+            ship_name = widget[1]
+             # Only allow clicking if ship hasn't been placed yet
+            if ship_name not in placed_ship_names:
+                ship_shape = ship_options[ship_name]
+                option_rect = ui_layout["ship_options"][ship_name]
+                dragging_ship = {
+                    "name": ship_name,
+                    "shape": ship_shape,
+                    "x": mouse_x, # Store initial mouse pos for offset calculation
+                    "y": mouse_y
+                }
+                # Offset from the top-left of the (0,0) tile representation *within the option box*
+                zero_tile_render_x, zero_tile_render_y = ship_option_origin(option_rect.x, option_rect.y, ship_shape)
+                dragging_offset_x = mouse_x - zero_tile_render_x
+                dragging_offset_y = mouse_y - zero_tile_render_y
+
+        # If no ship option was clicked, check if a placed ship was clicked (for potential moving later)
+        # (Add logic here if you want to allow moving placed ships)
+
+    elif event.type == pygame.MOUSEBUTTONUP:
+        if dragging_ship:
+            mouse_x, mouse_y = event.pos
+
+             # Adjust mouse position based on dragging offset relative to the ship's (0,0) tile
+            origin_mouse_x = mouse_x - dragging_offset_x
+            origin_mouse_y = mouse_y - dragging_offset_y
+
+            # Snap the ship's origin (0,0) to the grid
+            grid_x, grid_y = board_view("placement").camera.cell_at((origin_mouse_x, origin_mouse_y), snap=True)
+
+
+            # Check if the placement is valid (within grid, no collision, not adjacent)
+            valid_placement = True
+            collision = False
+            for dx, dy in dragging_ship["shape"]:
+                tile_x = grid_x + dx
+                tile_y = grid_y + dy
+                if not (0 <= tile_x < GRID_SIZE and 0 <= tile_y < GRID_SIZE):
+                    valid_placement = False
+                    break
+                # Check collision with existing ships
+                for ship in placed_ships:
+                    for pdx, pdy in ship["shape"]:
+                         if tile_x == ship["grid_x"] + pdx and tile_y == ship["grid_y"] + pdy:
+                            collision = True
+                            break
+                    if collision: break
+                if collision: break
+
+            if valid_placement and not collision:
+                 # Check adjacency rule
+                if is_adjacent_to_placed_ships(grid_x, grid_y, dragging_ship["shape"]):
+                    valid_placement = False
+
+            if valid_placement:
+                # Add the ship to the placed ships list
+                placed_ships.append({
+                    "name": dragging_ship["name"],
+                    "shape": dragging_ship["shape"],
+                    "grid_x": grid_x,
+                    "grid_y": grid_y
+                })
+                # Add the ship name to the placed_ship_names list
+                placed_ship_names.append(dragging_ship["name"])
+
+            # Reset dragging state regardless of placement validity
+            dragging_ship = None
+
+    elif event.type == pygame.MOUSEMOTION:
+        if dragging_ship:
+            # Position is updated implicitly by using pointer_pos() in draw funcs
+            pass # No need to update dragging_ship["x"], ["y"] here if preview uses get_pos
+
+# Function to draw the dragging ship (actual ship following mouse)
+def draw_dragging_ship():
+    if dragging_ship:
+        mouse_x, mouse_y = pointer_pos() # Use current mouse position
+
+        # Draw each tile relative to the mouse, adjusted by the initial offset, at the grid's zoom
+        tile = board_view("placement").camera.tile
+        for dx, dy in dragging_ship["shape"]:
+            rect = pygame.Rect(
+                mouse_x - dragging_offset_x + dx * tile,
+                mouse_y - dragging_offset_y + dy * tile,
+                tile-1, # Slightly smaller to show grid lines
+                tile-1
+            )
+            pygame.draw.rect(screen, SHIP_COLOR, rect)
+
+
+# --- New Functions for Phase 6 and 7 ---
+
+# Helper to draw the background state (grid, ships, etc.)
+def draw_current_grid_state(darken_alpha=0):
+    # Fill the screen with the background color
+    screen.fill(PLACEMENT_BACKGROUND)
+    # Draw the grid with the placed ships
+    draw_grid()
+    # Draw the grid labels
+    draw_labels()
+    # Draw the ship options (might be empty if all placed)
+    draw_ship_options()
+    # Draw the submit button (though it won't be interactive here)
+    # draw_submit_button_grid() # Optional: Might not want submit button visible here
+
+    # Apply darkening overlay if needed
+    if darken_alpha > 0:
+        overlay_pool.shade(screen, (0, 0, 0, darken_alpha)) # Black with transparency
+
+# Values the Phase 6 / 7 tweens animate (darken, strip_x, chars) plus the text being typed
+intro = {"text": "", "chars": 0, "darken": 0, "strip_x": SCREEN_WIDTH, "waiting": False, "loading": False}
+
+# "Are you ready" strip and buttons
+READY_STRIP_HEIGHT = 80
+READY_STRIP_Y = (SCREEN_HEIGHT - READY_STRIP_HEIGHT) // 2
+READY_STRIP_COLOR = (0, 0, 0, 180) # Translucent black
+ready_button_w, ready_button_h = 100, 50
+ready_button_padding = 40
+ready_yes_rect = pygame.Rect((SCREEN_WIDTH // 2) - ready_button_w - (ready_button_padding // 2), READY_STRIP_Y + READY_STRIP_HEIGHT + 30, ready_button_w, ready_button_h)
+ready_no_rect = pygame.Rect((SCREEN_WIDTH // 2) + (ready_button_padding // 2), READY_STRIP_Y + READY_STRIP_HEIGHT + 30, ready_button_w, ready_button_h)
+
+def typed_text():
+    return intro["text"][:int(intro["chars"])]
+
+# Phase 6: "Are You Ready" Animation
+def start_are_you_ready():
+    """Darkens the placement grid, slides a strip across, types "Are you ready", then offers Yes / No."""
+    global game_state
+    game_state = "READY_CHECK"
+    text = "Are you ready"
+    intro.update(text=text, waiting=False)
+    timeline.tween(intro, "darken", 0, 150, 500, tag="intro") # 5 alpha per frame at 60 FPS
+    timeline.tween(intro, "strip_x", SCREEN_WIDTH, 0, 900, delay=500, easing=ease_out, tag="intro") # Once darkened
+    timeline.tween(intro, "chars", 0, len(text), 100 * len(text), delay=1400, tag="intro", # 100 ms per character
+                   on_done=lambda: intro.update(waiting=True))
+
+def handle_are_you_ready_click(pos):
+    """A click skips the animation; once the buttons are up it answers the prompt."""
+    global game_state
+    if not intro["waiting"]:
+        timeline.skip("intro")
+    elif widget_at(pos) == "ready_yes":
+        start_ready_for_war()
+    elif widget_at(pos) == "ready_no":
+        game_state = "PLACEMENT" # Back to moving ships around
+
+def draw_button(rect, label):
+    pygame.draw.rect(screen, WHITE, rect)
+    text = render_text(button_font, label, BLACK)
+    screen.blit(text, text.get_rect(center=rect.center))
+
+def draw_are_you_ready():
+    # Draw the persistent background state (grid, ships) with darkening
+    draw_current_grid_state(int(intro["darken"]))
+    # Draw the moving/static strip (off-screen to the right until it starts sliding)
+    overlay_pool.shade(screen, READY_STRIP_COLOR, (int(intro["strip_x"]), READY_STRIP_Y, SCREEN_WIDTH, READY_STRIP_HEIGHT))
+    # Draw the typing text inside the strip
+    if typed_text():
+        text_surface = render_text(button_font, typed_text(), WHITE)
+        screen.blit(text_surface, text_surface.get_rect(center=(SCREEN_WIDTH // 2, READY_STRIP_Y + READY_STRIP_HEIGHT // 2)))
+    # Draw buttons when waiting for input
+    if intro["waiting"]:
+        draw_button(ready_yes_rect, "Yes")
+        draw_button(ready_no_rect, "No")
+
+# Phase 7: "Ready for War" Animation
+def start_ready_for_war():
+    """A short loading screen, then "Ready for war" typed out and held before the battle starts."""
+    global game_state
+    game_state = "READY_FOR_WAR"
+    text = "Ready for war"
+    def type_title():
+        intro["loading"] = False
+        timeline.tween(intro, "chars", 0, len(text), 150 * len(text), tag="intro", # 150 ms per character
+                       on_done=lambda: timeline.after(2000, begin_battle, tag="intro")) # Hold the finished text
+    intro.update(text=text, chars=0, loading=True)
+    start_loading(battle_preloader(), type_title)
+
+def draw_ready_for_war():
+    if intro["loading"]:
+        draw_loading_screen()
+        return
+    screen.fill(BLACK) # Black background
+    if typed_text():
+        text_surface = render_text(title_font, typed_text(), WHITE) # Use a larger font
+        screen.blit(text_surface, text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+
+def begin_battle():
+    """Engine sets up grids, places P2 ships, resets counters and opens the first War Room."""
+    engine.reset(seed=GAME_SEED, player1_ships=placed_ships)
+    enter_engine_phase()
+
+# --- End of New Functions ---
+
+
+# --- Grid View Function ---
+def grid_view():
+    global show_validation_message, validation_message_time, dragging_ship # Declare globals used/modified
+
+    scheduler = FrameScheduler(60) # Framerate control; sleeps while nothing is being dragged
+
+    while True: # This is the loop for the grid screen itself
+        for event in scheduler.events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+            # Handle drag-and-drop events FIRST
+            handle_drag_and_drop(event)
+
+            # Check for "Submit" button click only if NOT currently dragging a ship
+            if event.type == pygame.MOUSEBUTTONDOWN and not dragging_ship:
+                # print(f"Mouse clicked at: {event.pos}") # Optional debug
+                if widget_at(event.pos, "PLACEMENT") == "submit":
+                    # print("Submit button clicked") # Optional debug
+                    # Check if all ships are placed
+                    if len(placed_ship_names) < len(ship_options):
+                        # print("Not all ships placed") # Optional debug
+                        show_validation_message = True
+                        validation_message_time = now_ms()
+                        # print(f"Validation message time set to: {validation_message_time}") # Optional debug
+                    else:
+                        # print("All ships placed, exiting grid_view") # Optional debug
+                        return  # <-- Exit grid_view function when ready
+
+        # --- Drawing for grid_view screen ---
+        screen.fill(PLACEMENT_BACKGROUND)
+        draw_grid() # Grid and placed ships first
+        draw_labels()
+        draw_submit_button_grid()
+        draw_ship_options()
+
+        # Draw flashing preview only when dragging
+        if dragging_ship:
+            draw_flashing_preview()
+            draw_dragging_ship() # Draw the actual ship being dragged over the preview
+
+
+        # Draw the validation message if needed (inside the loop)
+        if show_validation_message:
+            # print("Displaying validation message") # Optional debug
+            draw_validation_message() # This function handles its own timeout check
+
+        # Update the display *at the end* of the grid_view loop
+        pygame.display.flip()
+        scheduler.wait(dragging_ship is not None, validation_message_time + 2000 if show_validation_message else None)
+
+
+# --- Additional Game State Variables ---
+game_state = "MENU" # Controls the overall flow: MENU, LOADING, PLACEMENT, READY_CHECK, READY_FOR_WAR, then the engine phases (PLAYER1_WAR_ROOM ... GAME_OVER)
+HARD_OPPONENT = os.environ.get("REDINTEL_OPPONENT", "random") == "hunter" # "hunter": Player 2 hunts with the probability-density AI instead of firing at random
+GAME_SEED = headless.seed if headless else None # Fixed seed makes P2's fleet and every roll repeatable
+# Every match's seed, placement and inputs, appended as they happen; python -m redintel.turnlog replays and checks them
+TURN_LOG = os.environ.get("REDINTEL_TURN_LOG") or (headless.turn_log if headless else os.path.join(os.path.expanduser("~"), ".redintel", "turns.jsonl"))
+turn_log = TurnLog(TURN_LOG)
+engine = GameEngine(GRID_SIZE, player2_ai=DensityHunter() if HARD_OPPONENT else None, turn_log=turn_log) # Rules engine: grids, fleets, streak/corruption, turn phase
+war_room_timer_start = 0
+WAR_ROOM_DURATION = 10 # seconds
+bonus_menu_options = BONUS_OPTIONS
+CONSULTANT_ADVICE = ["Scanning indicates activity.", "Consider these coordinates.", "High probability targets detected."]
+consultant_advice = "" # Picked once per War Room so the text doesn't flicker
+GAME_OVER_PROMPT = "R: Rematch, V: Replay, Q: Quit"
+REPLAY_OVER_PROMPT = "Esc: Back to Menu" # The same screen at the end of a replay
+# Matches are autosaved at the start of every turn and deleted once decided (not in headless runs)
+SAVE_PATH = None if headless else os.environ.get("REDINTEL_SAVE", os.path.join(os.path.expanduser("~"), ".redintel", "autosave.rrs"))
+autosaver = Autosaver(SAVE_PATH) if SAVE_PATH else None
+replay = None # ReplayMatch on screen while game_state is "REPLAY"
+ui_renderer = None # DirtyRenderer for the in-game screens (only repaints what changed), made by init_display()
+
+def init_display():
+    """Opens the game window (once) and returns it. Only the display and font modules are started:
+    the game has no sound, so the mixer and its audio device are never opened."""
+    global screen, ui_renderer
+    if screen is None:
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Red Room")
+        ui_renderer = DirtyRenderer(screen, GAME_BACKGROUND)
+    return screen
+
+# --- UI Layout ---
+# Every fixed rect of the screens is computed once for the screen size. Drawing and input use the same
+# rects, and a click finds its widget through the HitGrid of the current state instead of rebuilding them.
+P1_GRID_POS = (50, 100)
+P2_GRID_POS = (SCREEN_WIDTH - BOARD_VIEW_SIZE - 50, 100)
+CONSULTANT_OPTION_SLOTS = 3 # The engine always offers three targets
+TRAFFIC_LIGHT_KEYS = ['G', 'Y', 'R']
+
+def build_ui_layout():
+    """Returns (layout, hits): named rects and points, and a HitGrid of the clickable ones per game_state."""
+    p1_x, p1_y = P1_GRID_POS
+    p2_x = P2_GRID_POS[0]
+    layout = {"status_y": p1_y + BOARD_VIEW_SIZE + 20}
+
+    # State-specific panel between the boards
+    ui_area_x = p1_x + BOARD_VIEW_SIZE + 20
+    ui_area = pygame.Rect(ui_area_x, p1_y, p2_x - ui_area_x - 20, BOARD_VIEW_SIZE)
+    layout["ui_area"] = ui_area
+    layout["ui_center"] = (ui_area.x + ui_area.width / 2, ui_area.y + ui_area.height / 2)
+
+    # War Room: consultant box, option buttons, countdown
+    consultant = pygame.Rect(ui_area.x, ui_area.y, ui_area.width, 150)
+    option_y_start = consultant.bottom + 20
+    layout["consultant_box"] = consultant
+    layout["options"] = [pygame.Rect(ui_area.x + 10, option_y_start + i * 40, ui_area.width - 20, 35)
+                         for i in range(CONSULTANT_OPTION_SLOTS)]
+    layout["timer_center"] = (ui_area.x + ui_area.width / 2, option_y_start + CONSULTANT_OPTION_SLOTS * 40 + 50)
+
+    # Intel resolution: bonus menu
+    bonus_menu = pygame.Rect(ui_area.x, ui_area.y, ui_area.width, 200)
+    layout["bonus_menu"] = bonus_menu
+    layout["bonus"] = [pygame.Rect(bonus_menu.x + 10, bonus_menu.y + 50 + i * 40, bonus_menu.width - 20, 35)
+                       for i in range(len(bonus_menu_options))]
+
+    # Traffic light buttons
+    light_area = pygame.Rect(ui_area.x, ui_area.y, ui_area.width, 150)
+    button_size, spacing = 50, 20
+    start_x = light_area.centerx - (3 * button_size + 2 * spacing) // 2
+    layout["light_area"] = light_area
+    layout["lights"] = {key: pygame.Rect(start_x + i * (button_size + spacing), light_area.centery + 10 - button_size // 2,
+                                         button_size, button_size)
+                        for i, key in enumerate(TRAFFIC_LIGHT_KEYS)}
+
+    # Menu, placement and ready check buttons
+    layout["new_game"] = pygame.Rect(button_x, button_y, button_width, button_height)
+    layout["continue"] = pygame.Rect(button_x, button_y + button_height + 20, button_width, button_height)
+    layout["replay"] = pygame.Rect(button_x, button_y + 2 * (button_height + 20), button_width, button_height)
+    layout["replay_bar"] = pygame.Rect(P1_GRID_POS[0], 12, SCREEN_WIDTH - 2 * P1_GRID_POS[0] - 200, 10)
+    layout["submit"] = pygame.Rect(submit_button_x_grid, submit_button_y_grid, submit_button_width_grid, submit_button_height_grid)
+    total_options_width = len(ship_options) * OPTION_BOX_SIZE + (len(ship_options) - 1) * OPTION_BOX_PADDING
+    start_options_x = GRID_X + (BOARD_VIEW_SIZE - total_options_width) // 2 # Centre the options block under the grid
+    layout["ship_options"] = {name: pygame.Rect(start_options_x + i * (OPTION_BOX_SIZE + OPTION_BOX_PADDING), SHIP_OPTIONS_Y,
+                                                OPTION_BOX_SIZE, OPTION_BOX_SIZE)
+                              for i, name in enumerate(ship_options)}
+
+    hits = {state: HitGrid() for state in ("MENU", "PLACEMENT", "READY_CHECK", "PLAYER1_WAR_ROOM",
+                                           "PLAYER1_INTEL_RESOLUTION", "PLAYER1_TRAFFIC_LIGHT", "REPLAY")}
+    hits["MENU"].add("new_game", layout["new_game"])
+    hits["MENU"].add("continue", layout["continue"])
+    hits["MENU"].add("replay", layout["replay"])
+    hits["REPLAY"].add("replay_bar", layout["replay_bar"].inflate(0, 16)) # Taller than it looks, to be easy to grab
+    for name, rect in layout["ship_options"].items():
+        hits["PLACEMENT"].add(("ship", name), rect)
+    hits["PLACEMENT"].add("submit", layout["submit"])
+    hits["READY_CHECK"].add("ready_yes", ready_yes_rect)
+    hits["READY_CHECK"].add("ready_no", ready_no_rect)
+    for i, rect in enumerate(layout["options"]):
+        hits["PLAYER1_WAR_ROOM"].add(("option", i), rect)
+    for i, rect in enumerate(layout["bonus"]):
+        hits["PLAYER1_INTEL_RESOLUTION"].add(("bonus", i), rect)
+    for key, rect in layout["lights"].items():
+        hits["PLAYER1_TRAFFIC_LIGHT"].add(("light", key), rect)
+    return layout, hits
+
+ui_layout, ui_hits = build_ui_layout()
+
+def widget_at(pos, state=None):
+    """Key of the clickable widget under pos on the given (default: current) state's screen, or None."""
+    hits = ui_hits.get(state or game_state)
+    return hits.hit(pos) if hits else None
+
+# --- Helper Functions ---
+
+def print_engine_event(event):
+    """Logs an engine event to the console."""
+    kind = event[0]
+    if kind == 'hit':
+        print(f"{event[1]} Hit at {event[2]}!")
+    elif kind == 'miss':
+        print(f"{event[1]} Missed at {event[2]}.")
+    elif kind == 'sunk':
+        print(f"{event[1]}'s {event[2]} Sunk!")
+    elif kind == 'corruption':
+        print("CORRUPTION ACTIVATED!")
+    elif kind == 'reveal':
+        print(f"Bonus Revealed: {event[1]} as {'Hit' if event[2] else 'Miss'}")
+    elif kind == 'game_over':
+        print(f"GAME OVER - {event[1]} Wins!")
+
+def enter_engine_phase():
+    """Mirrors the engine phase into game_state and starts the timers the new phase needs."""
+    global game_state, war_room_timer_start, consultant_advice
+    game_state = engine.phase
+    if game_state == PHASE_WAR_ROOM:
+        if autosaver:
+            autosaver.save(engine) # Turn boundary: snapshot now, written to disk in the background
+        war_room_timer_start = now_ms()
+        consultant_advice = engine.rngs.chat.choice(CONSULTANT_ADVICE)
+        print(f"Consultant options: {engine.consultant_options}")
+    elif game_state == PHASE_ATTACK_RESOLUTION:
+        timeline.after(1000, advance_engine, tag="engine") # Short pause to see the result before the engine applies it
+    elif game_state == PHASE_PLAYER2_TURN:
+        timeline.after(500, opponent_turn, tag="engine") # Short delay before P2 acts
+    elif game_state == PHASE_GAME_OVER and autosaver:
+        autosaver.delete() # Nothing left to continue
+
+def saved_match_available():
+    return autosaver is not None and autosaver.exists()
+
+def resume_saved_match():
+    """Loads the autosaved match and carries on at the turn it was saved in."""
+    try:
+        autosaver.read(engine)
+    except (OSError, ValueError) as e: # Unreadable, or saved by another version / grid size
+        print(f"Could not load the saved match: {e}")
+        autosaver.delete()
+        return
+    turn_log.resume(engine) # The log carries on from the loaded state
+    print(f"Resumed saved match at turn {engine.turn}")
+    enter_engine_phase()
+
+def replay_available():
+    return os.path.exists(TURN_LOG)
+
+def open_replay():
+    """Opens the replay viewer on the last match in the turn log."""
+    global game_state, replay
+    try:
+        match = ReplayMatch.open(TURN_LOG)
+    except (OSError, ValueError) as e: # Unreadable log, or logged by another version
+        print(f"Could not open the replay: {e}")
+        return
+    if match is None or match.header["grid_size"] != GRID_SIZE: # The board views are sized for GRID_SIZE
+        print("No match to replay" if match is None else f"The last match was played on a {match.header['grid_size']}x{match.header['grid_size']} grid")
+        return
+    timeline.cancel()
+    replay = match
+    game_state = "REPLAY"
+    print(f"Replaying {replay.last_turn} turns ({replay.length} steps, {len(replay.keyframes)} keyframes)")
+
+def close_replay():
+    global game_state, replay
+    replay = None
+    game_state = "MENU"
+
+def handle_replay_key(event):
+    """Space plays / pauses, arrows step (Shift: a whole turn), Page Up / Down jump 10 turns, +/- change speed."""
+    key = event.key
+    if key == pygame.K_ESCAPE:
+        close_replay()
+    elif key == pygame.K_SPACE:
+        replay.toggle()
+    elif key in (pygame.K_RIGHT, pygame.K_LEFT):
+        direction = 1 if key == pygame.K_RIGHT else -1
+        if event.mod & pygame.KMOD_SHIFT:
+            replay.seek_turn(replay.turn + direction)
+        else:
+            replay.step_forward(direction)
+    elif key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+        replay.seek_turn(replay.turn + (10 if key == pygame.K_PAGEDOWN else -10))
+    elif key == pygame.K_HOME:
+        replay.seek(0)
+    elif key == pygame.K_END:
+        replay.seek(replay.length)
+    elif key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+        replay.faster()
+    elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+        replay.slower()
+
+def seek_replay_bar(pos):
+    """Clicking or dragging on the seek bar jumps to that point of the match."""
+    bar = ui_layout["replay_bar"]
+    fraction = min(max((pos[0] - bar.x) / bar.width, 0.0), 1.0)
+    replay.seek(round(fraction * replay.length))
+
+def replay_choice():
+    """The widget the logged player picks from the replay's position, shown as hovered."""
+    action = replay.next_action
+    if action is None:
+        return None
+    return {PHASE_WAR_ROOM: ("option", action), PHASE_INTEL_RESOLUTION: ("bonus", action)}.get(replay.engine.phase)
+
+def replay_advice():
+    """The consultant box line in a replay: what the player did with the options."""
+    if replay.engine.phase != PHASE_WAR_ROOM or replay.position >= replay.length:
+        return ""
+    action = replay.next_action
+    return "No pick: timed out" if action is None else f"Player picked option {action + 1}"
+
+def opponent_turn():
+    print("Simulated Player 2's Turn...")
+    timeline.after(1000, advance_engine, tag="engine") # Pause briefly to simulate thinking; the window stays responsive
+
+def enter_placement():
+    """Opens the placement screen with an empty board."""
+    global game_state, placed_ships, placed_ship_names, dragging_ship, show_validation_message
+    game_state = "PLACEMENT"
+    placed_ships = []
+    placed_ship_names = []
+    dragging_ship = None
+    show_validation_message = False
+
+def advance_engine(action=None):
+    """Steps the rules engine with the player's action and follows it to the next phase."""
+    for event in engine.step(action):
+        print_engine_event(event)
+    enter_engine_phase()
+
+
+# --- Drawing Functions ---
+
+def frame_overlay_rect(lines):
+    line_height = overlay_font.get_linesize()
+    width = max(overlay_font.size(line)[0] for line in lines) + 12
+    return pygame.Rect(4, 4, width, line_height * len(lines) + 8)
+
+def draw_frame_overlay(lines):
+    """Frame timing overlay (toggled with F3): p50 / p99 per section for the current state."""
+    line_height = overlay_font.get_linesize()
+    box = frame_overlay_rect(lines)
+    screen.fill((0, 0, 0), box)
+    pygame.draw.rect(screen, GREEN, box, 1)
+    for i, line in enumerate(lines):
+        screen.blit(overlay_font.render(line, True, GREEN), (10, 8 + i * line_height)) # Not cached: the numbers change every refresh
+
+def draw_board_cell(surface, rect, hit, miss, ship=False):
+    """Paints one tile of a player's board onto its cached surface."""
+    pygame.draw.rect(surface, GRID_COLOR, rect, 1) # Border for every tile
+    if ship and not (hit or miss): # Own ships that haven't been hit yet
+        pygame.draw.rect(surface, SHIP_COLOR, rect.inflate(-2, -2), 0)
+    if miss:
+        pygame.draw.circle(surface, (100, 100, 255), rect.center, max(1, rect.width // 4)) # Blue circle for miss
+    if hit:
+        width = max(1, rect.width // 10) # 3 at the default zoom
+        pygame.draw.line(surface, RED, rect.topleft, rect.bottomright, width) # Red X for hit
+        pygame.draw.line(surface, RED, rect.topright, rect.bottomleft, width)
+
+def draw_player_grid(grid_data, x_offset, y_offset, show_ships=False):
+    """Draws the part of a player's grid (a redintel Board) in its camera's view from its cached surface."""
+    if show_ships:
+        view = board_view("own_fleet", grid_data.size)
+        view.update(grid_data.hit, grid_data.miss, grid_data.ship)
+    else: # Enemy ships stay hidden, so their mask isn't part of the view at all
+        view = board_view("enemy_waters", grid_data.size)
+        view.update(grid_data.hit, grid_data.miss)
+    view.camera.move_to(x_offset, y_offset)
+    screen.blit(view.surface, (x_offset, y_offset))
+
+
+def ui_text(key, font, text, color, **position):
+    """Adds a line of text to the UI; position is a Rect attribute, e.g. center=(x, y)."""
+    surface = render_text(font, text, color)
+    rect = surface.get_rect(**position)
+    ui_renderer.add(key, rect, (text, color), lambda: screen.blit(surface, rect))
+    return rect
+
+def ui_box(key, rect, color):
+    """Adds a filled panel with a grid-coloured border."""
+    def draw():
+        pygame.draw.rect(screen, color, rect)
+        pygame.draw.rect(screen, GRID_COLOR, rect, 1)
+    ui_renderer.add(key, rect, color, draw)
+
+def ui_button(key, rect, color, font, label):
+    """Adds a flat button with a centred black label."""
+    label_surface = render_text(font, label, BLACK)
+    label_rect = label_surface.get_rect(center=rect.center)
+    def draw():
+        pygame.draw.rect(screen, color, rect)
+        screen.blit(label_surface, label_rect)
+    bounds = rect.copy()
+    bounds.normalize() # Too-narrow layouts give negative widths; the label still shows
+    ui_renderer.add(key, bounds.union(label_rect), (color, label), draw)
+
+def draw_game_ui(shown=None):
+    """Lays out the main game interface for the dirty-rect renderer, based on game_state (or the replay's phase).
+
+    shown lays out another match, in its own phase, instead of the one being played (the bench draws its own).
+    """
+    replaying = shown is None and game_state == "REPLAY"
+    if shown is None:
+        shown = replay.engine if replaying else engine # The match on screen
+    phase = game_state if shown is engine else shown.phase # The live screen follows game_state, which can trail the engine
+    # Grid Positions
+    p1_grid_x, p1_grid_y = P1_GRID_POS
+    p2_grid_x, p2_grid_y = P2_GRID_POS
+
+    # Titles
+    ui_text("p1_title", button_font, "Your Fleet", WHITE, topleft=(p1_grid_x, p1_grid_y - 40))
+    ui_text("p2_title", button_font, "Enemy Waters", WHITE, topleft=(p2_grid_x, p2_grid_y - 40))
+
+    # Draw Grids (repainted only when a hit / miss lands or the camera moves; each is one blit of its cached surface)
+    p1_board, p2_board = shown.player1_grid, shown.player2_grid
+    ui_renderer.add("p1_grid", pygame.Rect(p1_grid_x, p1_grid_y, BOARD_VIEW_SIZE, BOARD_VIEW_SIZE),
+                    (p1_board.hit, p1_board.miss, p1_board.ship, board_view("own_fleet", shown.grid_size).camera.view_key()),
+                    lambda: draw_player_grid(p1_board, p1_grid_x, p1_grid_y, show_ships=True)) # Show P1's ships
+    ui_renderer.add("p2_grid", pygame.Rect(p2_grid_x, p2_grid_y, BOARD_VIEW_SIZE, BOARD_VIEW_SIZE),
+                    (p2_board.hit, p2_board.miss, board_view("enemy_waters", shown.grid_size).camera.view_key()),
+                    lambda: draw_player_grid(p2_board, p2_grid_x, p2_grid_y, show_ships=False)) # Hide P2's ships
+
+    # Status Text Area
+    status_y = ui_layout["status_y"]
+
+    # Player 1 Status
+    ui_text("p1_ships_left", status_font, f"P1 Ships Left: {shown.player1_ships_state.afloat}", WHITE, topleft=(p1_grid_x, status_y))
+    ui_text("streak", status_font, f"Bonus Streak: {shown.player1_bonus_streak}", (255, 255, 0), topleft=(p1_grid_x, status_y + 25)) # Yellow
+    ui_text("corruption", status_font, f"Corruption: {shown.player1_corruption_counter}/3", (255, 100, 100), topleft=(p1_grid_x, status_y + 50)) # Light Red
+    traffic_light_color = {'G': (0, 255, 0), 'Y': (255, 255, 0), 'R': (255, 0, 0)}[shown.player1_traffic_light]
+    light_center = (p1_grid_x + 200, status_y + 15)
+    light_rect = pygame.Rect(0, 0, 22, 22)
+    light_rect.center = light_center
+    ui_renderer.add("p1_light", light_rect, traffic_light_color,
+                    lambda: pygame.draw.circle(screen, traffic_light_color, light_center, 10)) # P1 light indicator
+
+     # Player 2 Status (Simulated)
+    ui_text("p2_ships_left", status_font, f"P2 Ships Left: {shown.player2_ships_state.afloat}", WHITE, topleft=(p2_grid_x, status_y))
+
+
+    # --- State Specific UI ---
+    ui_center = ui_layout["ui_center"]
+    hovered = replay_choice() if replaying else widget_at(pointer_pos(), phase) # One lookup for every button's hover state
+
+    if phase == "PLAYER1_WAR_ROOM":
+        # Consultant Box
+        consultant_rect = ui_layout["consultant_box"]
+        ui_box("consultant_box", consultant_rect, (50, 50, 50))
+        ui_text("consultant_title", status_font, "AI Consultant:", WHITE, topleft=(consultant_rect.x + 10, consultant_rect.y + 10))
+        ui_text("consultant_advice", status_font, replay_advice() if replaying else consultant_advice, WHITE, topleft=(consultant_rect.x + 10, consultant_rect.y + 40))
+
+        # Options
+        for i, coord in enumerate(shown.consultant_options):
+            button_rect = ui_layout["options"][i]
+            button_color = (200, 200, 200) if hovered == ("option", i) else WHITE # Lighter grey on hover
+            ui_button(f"option_{i}", button_rect, button_color, option_font, f"Option {i+1}: {column_label(coord[0])}{coord[1] + 1}")
+
+        # Timer (the only element that changes on its own: repainted 10 times a second; replays don't log it)
+        if not replaying:
+            elapsed_time = (now_ms() - war_room_timer_start) / 1000
+            time_left = max(0, WAR_ROOM_DURATION - elapsed_time)
+            ui_text("war_room_timer", title_font, f"{time_left:.1f}", RED if time_left < 5 else WHITE,
+                    center=ui_layout["timer_center"])
+
+    elif phase == "PLAYER1_INTEL_RESOLUTION":
+         # Potentially show bonus menu here
+         if shown.last_attack_result == "HIT": # Bonus menu only offered on a hit
+             bonus_menu_rect = ui_layout["bonus_menu"]
+             ui_box("bonus_menu", bonus_menu_rect, (60, 80, 60)) # Greenish BG
+             ui_text("bonus_title", status_font, "Bonus Action Available!", WHITE, topleft=(bonus_menu_rect.x + 10, bonus_menu_rect.y + 10))
+
+             for i, bonus_name in enumerate(bonus_menu_options):
+                 button_rect = ui_layout["bonus"][i]
+                 button_color = WHITE if i == 0 else (150, 150, 150) # Grey out non-functional
+                 if hovered == ("bonus", i) and i == 0: # Only highlight functional
+                      button_color = (200, 200, 200)
+                 ui_button(f"bonus_{i}", button_rect, button_color, bonus_font, bonus_name)
+
+         else:
+             # Indicate processing...
+             ui_text("resolving_intel", button_font, "Resolving Intel...", WHITE,
+                     center=ui_center)
+
+
+    elif phase == "PLAYER1_ATTACK_RESOLUTION":
+         # Show result briefly
+         result_rect = ui_text("attack_result", button_font, shown.last_attack_result if shown.last_attack_result else "",
+                               RED if shown.last_attack_result == "HIT" else WHITE,
+                               center=ui_center)
+         if shown.corruption_activated_last_turn:
+              ui_text("corruption_notice", status_font, "Corruption Reset Bonus Streak!", RED,
+                      center=(result_rect.centerx, result_rect.bottom + 30))
+
+
+    elif phase == "PLAYER1_TRAFFIC_LIGHT":
+        # Draw Traffic Light Buttons
+        light_area_rect = ui_layout["light_area"]
+        ui_box("light_area", light_area_rect, (50, 50, 50))
+        ui_text("light_prompt", status_font, "Select Confidence Level:", WHITE, topleft=(light_area_rect.x + 10, light_area_rect.y + 10))
+
+        colors = {'G': (0, 200, 0), 'Y': (200, 200, 0), 'R': (200, 0, 0)}
+        for key, rect in ui_layout["lights"].items():
+            selected = shown.player1_traffic_light == key
+            def draw_light(rect=rect, color=colors[key], selected=selected):
+                pygame.draw.rect(screen, color, rect, border_radius=5)
+                if selected: # Highlight if selected
+                    pygame.draw.rect(screen, WHITE, rect, 3, border_radius=5)
+            ui_renderer.add(f"light_{key}", rect.inflate(6, 6), selected, draw_light) # The rounded outline bleeds a little
+
+
+    elif phase == "PLAYER2_TURN":
+        ui_text("opponent_turn", button_font, "Opponent's Turn...", WHITE,
+                center=ui_center)
+
+    elif phase == "GAME_OVER":
+        ui_renderer.add("game_over_shade", screen.get_rect(), None, lambda: overlay_pool.shade(screen, (0, 0, 0, 180)))
+
+        result_msg = f"{shown.winner} Wins!"
+        ui_text("game_over_result", title_font, result_msg, GREEN if shown.winner == PLAYER1 else RED,
+                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+        prompt = REPLAY_OVER_PROMPT if replaying else GAME_OVER_PROMPT
+        ui_text("game_over_rematch", rematch_font, prompt, WHITE,
+                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
+
+
+def draw_replay_controls():
+    """Seek bar, position, speed and key help along the top of the replay viewer."""
+    bar = ui_layout["replay_bar"]
+    filled = bar.width * replay.position // max(replay.length, 1)
+    def draw_bar():
+        pygame.draw.rect(screen, (70, 70, 90), bar)
+        pygame.draw.rect(screen, WHITE, (bar.x, bar.y, filled, bar.height))
+    ui_renderer.add("replay_bar", bar, filled, draw_bar)
+    state = "Playing" if replay.playing else "Paused"
+    ui_text("replay_status", status_font, f"Turn {replay.turn}/{replay.last_turn}  {replay.speed_factor}x  {state}", WHITE,
+            topleft=(bar.right + 15, 5))
+    ui_text("replay_help", label_font, "Space: play/pause   Left/Right: step (Shift: turn)   PgUp/PgDn: 10 turns   +/-: speed   Esc: menu",
+            (180, 180, 180), topleft=(bar.x, bar.bottom + 8))
+
+def earliest(*times):
+    """The soonest of some ticks values, ignoring None."""
+    return min((t for t in times if t is not None), default=None)
+
+def frame_schedule():
+    """Returns (active, wake_at) for the scheduler: whether the screen animates, and the next timer due."""
+    wake_at = timeline.next_due() # Transition delays, tweens that haven't started yet
+    if game_state == "PLAYER1_WAR_ROOM" or timeline.running():
+        return True, None # Countdown, darkening / sliding / typing
+    if game_state == "PLACEMENT":
+        if show_validation_message:
+            wake_at = earliest(wake_at, validation_message_time + 2000) # Message timeout
+        return dragging_ship is not None, wake_at # Flashing preview follows the mouse
+    if loading["preloader"] is not None:
+        return True, None # Loading work runs a slice per frame
+    if game_state == "REPLAY" and replay.playing:
+        return True, None # Playback advances every frame
+    return False, wake_at # Otherwise nothing moves until the player acts
+
+
+# --- Preloading ---
+# What the loading screens do: everything the next screens would otherwise build on their first frames
+
+def preload_text(preloader, name, font, texts, color):
+    preloader.add(name, lambda: [render_text(font, text, color) for text in texts])
+
+def prefixes(text):
+    """Every stage of text being typed out."""
+    return [text[:i] for i in range(1, len(text) + 1)]
+
+def warm_engine():
+    """Builds the placement tables (and the AI's density tables) for this grid on a throwaway engine."""
+    GameEngine(GRID_SIZE, engine.ships, player2_ai=type(engine.player2_ai)()).reset(seed=0)
+
+def placement_preloader():
+    """Fonts, the placement and ready check screens, and the engine tables behind the battle."""
+    preloader = Preloader(threaded=not headless)
+    for font in FONTS:
+        preloader.add(f"font {font.size_px}px", lambda font=font: font.font)
+    preloader.add("engine tables", warm_engine, background=True) # Pure Python: overlaps with the surface work
+    preloader.add("placement grid", lambda: board_view("placement").update(placed_ships_mask()))
+    def grid_labels():
+        x0, y0, x1, y1 = board_view("placement").camera.visible_cells()
+        for label in [column_label(col) for col in range(x0, x1)] + [str(row + 1) for row in range(y0, y1)]:
+            render_text(label_font, label, WHITE)
+    preloader.add("grid labels", grid_labels)
+    def overlays():
+        tile = board_view("placement").camera.tile
+        overlay_pool.get((tile, tile), (0, 255, 0, 100)) # Drag preview tints
+        overlay_pool.get((tile, tile), (255, 0, 0, 100))
+        overlay_pool.get((SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 150)) # Darkening, game over veil
+        overlay_pool.get((SCREEN_WIDTH, READY_STRIP_HEIGHT), READY_STRIP_COLOR)
+    preloader.add("overlays", overlays)
+    preload_text(preloader, "submit", submit_font, ["Submit"], BLACK)
+    preload_text(preloader, "validation", message_font, ["Place all your ships"], BLACK)
+    preload_text(preloader, "ready buttons", button_font, ["Yes", "No"], BLACK)
+    preload_text(preloader, "are you ready", button_font, prefixes("Are you ready"), WHITE)
+    return preloader
+
+def battle_preloader():
+    """The in-game screens: both boards, panel text and every War Room countdown value."""
+    preloader = Preloader(threaded=not headless)
+    preloader.add("engine tables", warm_engine, background=True) # Cached by now unless the grid size changed
+    preloader.add("own fleet", lambda: board_view("own_fleet").update(0, 0, 0))
+    preloader.add("enemy waters", lambda: board_view("enemy_waters").update(0, 0))
+    preload_text(preloader, "ready for war", title_font, prefixes("Ready for war"), WHITE)
+    preload_text(preloader, "board titles", button_font, ["Your Fleet", "Enemy Waters", "Resolving Intel...",
+                                                          "Opponent's Turn...", "MISS", "MISS (Timeout)"], WHITE)
+    preload_text(preloader, "panel titles", status_font, ["AI Consultant:", "Bonus Action Available!",
+                                                          "Select Confidence Level:"] + CONSULTANT_ADVICE, WHITE)
+    preload_text(preloader, "bonus options", bonus_font, bonus_menu_options, BLACK)
+    def countdown():
+        for tenths in range(WAR_ROOM_DURATION * 10 + 1):
+            render_text(title_font, f"{tenths / 10:.1f}", RED if tenths < 50 else WHITE)
+    preloader.add("countdown", countdown)
+    preload_text(preloader, "hit", button_font, ["HIT"], RED)
+    preload_text(preloader, "corruption", status_font, ["Corruption Reset Bonus Streak!"], RED)
+    preload_text(preloader, "game over", rematch_font, [GAME_OVER_PROMPT, REPLAY_OVER_PROMPT], WHITE)
+    return preloader
+
+
+# --- Game Loop ---
+OVERLAY_REFRESH = 15 # Frames between frame overlay refreshes
+GAME_UI_STATES = ["PLAYER1_WAR_ROOM", "PLAYER1_INTEL_RESOLUTION", "PLAYER1_ATTACK_RESOLUTION", "PLAYER1_TRAFFIC_LIGHT", "PLAYER2_TURN", "GAME_OVER"]
+
+startup.mark("imports")
+
+def main():
+    """Opens the window and runs the game until the player quits (or a headless script ends)."""
+    global game_state, placed_ships, placed_ship_names, show_validation_message, validation_message_time
+
+    init_display()
+    startup.mark("display")
+    running = True
+    scheduler = headless or FrameScheduler(60) # Runs at 60 FPS only while something animates
+    FRAME_LOG = os.environ.get("REDINTEL_FRAME_LOG") # e.g. frames.csv or frames.jsonl: one row per frame
+    if headless:
+        FRAME_LOG = FRAME_LOG or headless.frame_log # Per-frame timings next to the captured frames
+        os.makedirs(os.path.dirname(FRAME_LOG) or ".", exist_ok=True)
+        headless.place_points = placement_drag_points
+    profiler = FrameProfiler(60, FRAME_LOG)
+    show_frame_overlay = False
+    frame_overlay_text = [] # Overlay lines, refreshed every OVERLAY_REFRESH frames
+
+    while running:
+        profiler.begin_frame(game_state)
+        pygame_ticks = now_ms()
+
+        # --- Event Handling ---
+        events = scheduler.events(game_state)
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_frame_overlay = not show_frame_overlay
+                frame_overlay_text = []
+            if event.type in (pygame.MOUSEWHEEL, pygame.MOUSEMOTION):
+                handle_camera_event(event) # Zoom / pan the board under the pointer
+
+            # State-specific input handling
+            if game_state == "MENU":
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if widget_at(event.pos) == "new_game":
+                        game_state = "LOADING"
+                        start_loading(placement_preloader(), enter_placement) # Until the placement screen is ready
+                    elif widget_at(event.pos) == "continue" and saved_match_available():
+                        resume_saved_match()
+                    elif widget_at(event.pos) == "replay" and replay_available():
+                        open_replay()
+
+            elif game_state == "PLACEMENT":
+                handle_drag_and_drop(event) # Use your existing function
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                     if widget_at(event.pos) == "submit" and not dragging_ship:
+                          if len(placed_ship_names) < len(ship_options):
+                              show_validation_message = True
+                              validation_message_time = pygame_ticks
+                          else:
+                              start_are_you_ready() # Phase 6 / 7, then the main game starts in begin_battle()
+
+            elif game_state == "READY_CHECK":
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    handle_are_you_ready_click(event.pos)
+
+            elif game_state == "READY_FOR_WAR":
+                if event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+                    timeline.skip("intro") # Straight to the battle
+
+            elif game_state == "PLAYER1_WAR_ROOM":
+                 if event.type == pygame.MOUSEBUTTONDOWN:
+                     # Same rects as drawing, looked up instead of rebuilt
+                     widget = widget_at(event.pos)
+                     if widget and widget[0] == "option" and widget[1] < len(engine.consultant_options):
+                         print(f"Player selected target: {engine.consultant_options[widget[1]]}")
+                         advance_engine(widget[1])
+
+            elif game_state == "PLAYER1_INTEL_RESOLUTION":
+                 if event.type == pygame.MOUSEBUTTONDOWN and engine.last_attack_result == "HIT": # Menu only shown on a hit
+                     widget = widget_at(event.pos)
+                     if widget:
+                          print(f"Player chose bonus: {bonus_menu_options[widget[1]]}")
+                          advance_engine(widget[1]) # Applies the bonus, then moves on to attack resolution
+
+            elif game_state == "PLAYER1_TRAFFIC_LIGHT":
+                 if event.type == pygame.MOUSEBUTTONDOWN:
+                     widget = widget_at(event.pos)
+                     if widget:
+                          print(f"Player set light to: {widget[1]}")
+                          advance_engine(widget[1]) # Transition after selection
+
+            elif game_state == "GAME_OVER":
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q:
+                        running = False
+                    elif event.key == pygame.K_v:
+                        open_replay() # The match just played is the last one in the log
+                    elif event.key == pygame.K_r:
+                        # Reset for rematch - Go back to placement? Or Menu? Let's go Menu.
+                        # Reset all game variables
+                        placed_ships = []
+                        placed_ship_names = []
+                        # Other state vars will be reset when placement finishes
+                        timeline.cancel()
+                        game_state = "MENU"
+
+            elif game_state == "REPLAY":
+                if event.type == pygame.KEYDOWN:
+                    handle_replay_key(event)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and widget_at(event.pos) == "replay_bar":
+                    seek_replay_bar(event.pos)
+                elif event.type == pygame.MOUSEMOTION and event.buttons[0] and widget_at(event.pos) == "replay_bar":
+                    seek_replay_bar(event.pos) # Scrubbing
+
+        profiler.mark("events")
+
+        # --- Game Logic / State Transitions ---
+        # Tweens, the loading screen and the pauses after an attack / before P2 acts run on the timeline
+        timeline.update(pygame_ticks)
+        update_loading() # Preloading behind the loading screens
+        if game_state == "REPLAY":
+            replay.update(pygame_ticks) # Playback at the chosen speed
+
+        if game_state == "PLAYER1_WAR_ROOM":
+            # Check timer expiry (timer starts when the engine opens the War Room)
+            elapsed_time = (pygame_ticks - war_room_timer_start) / 1000
+            if elapsed_time > WAR_ROOM_DURATION:
+                print("War Room Timer Expired!")
+                advance_engine(None) # No selection counts as a miss
+
+        profiler.mark("logic")
+
+        # --- Drawing ---
+        if show_frame_overlay and (not frame_overlay_text or profiler.frame % OVERLAY_REFRESH == 0):
+            frame_overlay_text = profiler.overlay_lines() + [text_cache.summary()]
+
+        if game_state in GAME_UI_STATES or game_state == "REPLAY":
+            draw_game_ui() # Central layout for the main game; only elements that changed get repainted
+            if game_state == "REPLAY":
+                draw_replay_controls()
+            if show_frame_overlay:
+                ui_renderer.add("frame_overlay", frame_overlay_rect(frame_overlay_text), tuple(frame_overlay_text),
+                                lambda: draw_frame_overlay(frame_overlay_text))
+            dirty_rects = ui_renderer.end_frame()
+        else:
+            dirty_rects = None # Menu / loading / placement still redraw the whole screen
+            ui_renderer.invalidate()
+            screen.fill(BLACK) # Clear screen
+
+        if game_state == "MENU":
+            draw_menu()
+        elif game_state == "LOADING":
+            draw_loading_screen()
+        elif game_state == "READY_CHECK":
+            draw_are_you_ready()
+        elif game_state == "READY_FOR_WAR":
+            draw_ready_for_war()
+        elif game_state == "PLACEMENT":
+            # Use your existing placement drawing logic
+            screen.fill(PLACEMENT_BACKGROUND)
+            draw_grid()
+            draw_labels()
+            draw_submit_button_grid()
+            draw_ship_options()
+            if dragging_ship:
+                 draw_flashing_preview()
+                 draw_dragging_ship()
+            if show_validation_message:
+                 draw_validation_message() # Handles its own timeout
+
+        if show_frame_overlay and dirty_rects is None:
+            draw_frame_overlay(frame_overlay_text)
+        profiler.mark("draw")
+
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        profiler.mark("present")
+        if headless:
+            headless.capture(screen, game_state)
+            running = running and not headless.finished
+        if not startup.marked("first_frame"):
+            startup.mark("first_frame")
+            print(startup.summary())
+        scheduler.wait(*frame_schedule()) # Limit FPS, or sleep until input / the next timer
+        profiler.end_frame(scheduler.slept)
+
+    # --- End of Game ---
+    profiler.close()
+    if headless:
+        print(headless.summary())
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Pre-rendered board surfaces for the front end.
+
+Each board view (own fleet, enemy waters, placement grid) lives on its own
+viewport-sized Surface, looking at the board through a redintel.camera
+Camera. The view is fed the board's bitmasks every frame (cell (x, y) is bit
+``y * size + x``, as in redintel.board); XOR against the masks it last drew
+gives exactly the cells that changed, and only those that are also on
+screen are repainted. When the camera scrolls or zooms, the visible cells
+are repainted; cells out of view are never visited, so a repaint costs the
+same on a 1000x1000 board as on a 12x12 one. Drawing a board is one blit.
+
+Anything that moves over the board (drag preview, the ship being dragged)
+is drawn on top of the blit, so it never touches the cached surface.
+"""
+import pygame
+
+
+def row_bits(data, start, width):
+    """Bits start .. start + width - 1 of a little-endian byte string, as a small int."""
+    lo = start >> 3
+    hi = ((start + width - 1) >> 3) + 1
+    return int.from_bytes(data[lo:hi], "little") >> (start & 7) & ((1 << width) - 1)
+
+
+class GridSurface:
+    """The visible part of a grid_size x grid_size board, patched cell by cell.
+
+    draw_cell(surface, rect, *states) paints one tile; states holds one bool
+    per mask given to update(), in the same order. It is clipped to the
+    tile, so a cell can always be repainted without touching its neighbours.
+    """
+
+    def __init__(self, grid_size, camera, background, draw_cell):
+        self.grid_size = grid_size
+        self.camera = camera
+        self.background = background
+        self.draw_cell = draw_cell
+        self.surface = pygame.Surface((camera.view_width, camera.view_height))
+        self.all_cells = (1 << (grid_size * grid_size)) - 1
+        self.masks = None # Masks the surface currently shows; None repaints every visible cell
+        self.view_key = None # Camera scroll / zoom the surface was painted at
+        self.version = 0 # Bumped on every repaint, so it can serve as a dirty-rect signature
+
+    def invalidate(self):
+        """Repaints every visible cell on the next update()."""
+        self.masks = None
+
+    def update(self, *masks):
+        """Repaints the visible cells whose bit changed in any mask. Returns the number of cells repainted."""
+        view_key = self.camera.view_key()
+        if self.masks is None or len(masks) != len(self.masks) or view_key != self.view_key:
+            changed = self.all_cells
+            self.surface.fill(self.background)
+        else:
+            changed = 0
+            for new, old in zip(masks, self.masks):
+                changed |= new ^ old
+            changed &= self.all_cells
+            if not changed:
+                return 0
+        self.masks = masks
+        self.view_key = view_key
+
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        width = x1 - x0
+        if width <= 0 or y1 <= y0:
+            return 0
+        # Byte strings let every visible row be sliced out without shifting the whole board's mask
+        size = self.grid_size
+        length = (size * size + 7) // 8
+        changed_data = changed.to_bytes(length, "little")
+        mask_data = [mask.to_bytes(length, "little") for mask in masks]
+
+        surface, cell_rect = self.surface, self.camera.cell_rect
+        repainted = 0
+        for y in range(y0, y1):
+            start = y * size + x0
+            row_changed = row_bits(changed_data, start, width)
+            if not row_changed:
+                continue
+            rows = [row_bits(data, start, width) for data in mask_data]
+            while row_changed:
+                low = row_changed & -row_changed
+                i = low.bit_length() - 1
+                rect = pygame.Rect(cell_rect(x0 + i, y))
+                surface.set_clip(rect)
+                surface.fill(self.background, rect)
+                self.draw_cell(surface, rect, *(bool(row >> i & 1) for row in rows))
+                row_changed ^= low
+                repainted += 1
+        surface.set_clip(None)
+        self.version += 1
+        return repainted
@@ -0,0 +1,211 @@
+"""Headless, scripted runs of the pygame front end.
+
+    python -m redintel.headless run.json
+    REDINTEL_HEADLESS=run.json python -m redintel     # the same thing
+
+The front end runs under SDL's dummy video driver, driven by a script of
+inputs instead of a player, on a virtual clock: every frame advances it by
+1/60 s, and a frame where the loop would sleep jumps straight to the next
+timer. The War Room countdown and every transition pause therefore take no
+wall-clock time, and the same script and seed always produce the same
+frames. Selected frames are saved as PNG (or .npy pixel arrays via
+surfarray), per-frame timings go to the frame log and the match itself to
+turns.jsonl (replay it with python -m redintel.turnlog).
+
+A script is a JSON object:
+
+    {
+      "seed": 7,                       # engine and consultant-advice seed
+      "out": "capture",                # directory for frames and frames.csv
+      "format": "png",                 # or "npy"
+      "capture_frames": [0, 120],      # frame numbers to save
+      "capture_every": 0,              # also every N-th frame (0 = off)
+      "capture_states": true,          # also the first frame of every game_state
+      "max_frames": 20000,             # hard stop
+      "tail": 60,                      # frames to keep running after the last input
+      "inputs": [
+        {"state": "MENU", "click": [400, 380]},
+        {"state": "PLACEMENT", "place": "Linear 4", "cell": [0, 0]},
+        {"wait": 30, "drag": [[250, 460], [130, 100]]},
+        {"state": "PLAYER1_WAR_ROOM", "click": [500, 300]},
+        {"state": "GAME_OVER", "key": "q"}
+      ]
+    }
+
+Inputs fire in order. Each waits until game_state equals its "state" (if
+given) and at least "wait" frames (default 1) have passed since the previous
+input, then posts its events: "click" (press and release), "move", "drag"
+(press, move, release) at screen coordinates, "key" (a pygame key name), or
+"place", which drags a ship from its option box onto a grid cell using the
+placement layout the front end hands over.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pygame
+
+FRAME_MS = 1000.0 / 60 # Virtual time per animated frame
+MAX_SLEEP_MS = 1000 # Virtual time per idle frame with no timer pending, as in FrameScheduler
+
+
+class VirtualClock:
+    """Milliseconds that only move when the run advances them."""
+
+    def __init__(self):
+        self.time = 0.0
+
+    def ticks(self):
+        return int(self.time)
+
+    def advance(self, ms):
+        self.time += ms
+
+
+class HeadlessRun:
+    """Input script, virtual clock and frame capture for one headless run.
+
+    Stands in for FrameScheduler in the main loop (events(), wait(), slept),
+    so the loop itself is the same as in a normal game.
+    """
+
+    def __init__(self, script, base_dir="."):
+        self.script = script
+        self.seed = script.get("seed", 0)
+        self.out = Path(base_dir) / script.get("out", "capture")
+        self.format = script.get("format", "png")
+        self.capture_frames = set(script.get("capture_frames", ()))
+        self.capture_every = script.get("capture_every", 0)
+        self.capture_states = script.get("capture_states", True)
+        self.max_frames = script.get("max_frames", 20000)
+        self.tail = script.get("tail", 60)
+        self.inputs = list(script.get("inputs", ()))
+        self.clock = VirtualClock()
+        self.pointer = (0, 0) # Where the scripted mouse is
+        self.place_points = None # Front end hook: (ship_name, (x, y)) -> (press, release) screen points
+        self.frame = 0
+        self.since_input = 0 # Frames since the last input fired
+        self.last_state = None
+        self.captured = []
+        self.slept = False
+        if self.format not in ("png", "npy"):
+            raise ValueError(f"Unknown capture format: {self.format}")
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), path.parent)
+
+    @property
+    def frame_log(self):
+        return str(self.out / "frames.csv")
+
+    @property
+    def turn_log(self):
+        return str(self.out / "turns.jsonl")
+
+    @property
+    def finished(self):
+        return self.frame >= self.max_frames or (not self.inputs and self.since_input >= self.tail)
+
+    def mouse_pos(self):
+        return self.pointer
+
+    # --- Scheduler interface ---
+
+    def events(self, state=None):
+        """This frame's events: the next scripted input once its state and wait are met."""
+        events = pygame.event.get() # Drain the real queue (window events from the dummy driver)
+        self.since_input += 1
+        if self.inputs:
+            step = self.inputs[0]
+            if (step.get("state") in (None, state)) and self.since_input >= step.get("wait", 1):
+                self.inputs.pop(0)
+                self.since_input = 0
+                events.extend(self.input_events(step))
+        return events
+
+    def wait(self, active, wake_at=None):
+        """Advances virtual time instead of sleeping: one frame, or straight to the next timer."""
+        now = self.clock.ticks()
+        if active:
+            self.slept = False
+            self.clock.advance(FRAME_MS)
+            return
+        step = MAX_SLEEP_MS if wake_at is None else min(MAX_SLEEP_MS, max(wake_at - now, 0))
+        self.slept = step > 0 # As FrameScheduler: an overdue timer is not idle time
+        self.clock.advance(max(step, FRAME_MS))
+
+    # --- Inputs ---
+
+    def input_events(self, step):
+        if "click" in step:
+            pos = tuple(step["click"])
+            return self.pointer_events(pos, [(pygame.MOUSEBUTTONDOWN, pos), (pygame.MOUSEBUTTONUP, pos)])
+        if "move" in step:
+            pos = tuple(step["move"])
+            return self.pointer_events(pos, [(pygame.MOUSEMOTION, pos)])
+        if "drag" in step or "place" in step:
+            if "drag" in step:
+                start, end = (tuple(p) for p in step["drag"])
+            elif self.place_points is None:
+                raise ValueError("The front end did not provide placement points for 'place' inputs")
+            else:
+                start, end = self.place_points(step["place"], tuple(step["cell"]))
+            return self.pointer_events(end, [(pygame.MOUSEBUTTONDOWN, start), (pygame.MOUSEMOTION, end),
+                                             (pygame.MOUSEBUTTONUP, end)])
+        if "key" in step:
+            key = pygame.key.key_code(step["key"])
+            return [pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=step["key"]),
+                    pygame.event.Event(pygame.KEYUP, key=key, mod=0)]
+        raise ValueError(f"Input has no action: {step}")
+
+    def pointer_events(self, final_pos, events):
+        self.pointer = final_pos
+        result = []
+        for kind, pos in events:
+            if kind == pygame.MOUSEMOTION:
+                result.append(pygame.event.Event(kind, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+            else:
+                result.append(pygame.event.Event(kind, pos=pos, button=1))
+        return result
+
+    # --- Capture ---
+
+    def capture(self, surface, state):
+        """Saves the frame that was just presented if it is selected. Call once per frame."""
+        new_state = state != self.last_state
+        self.last_state = state
+        if (self.frame in self.capture_frames or (self.capture_every and self.frame % self.capture_every == 0)
+                or (self.capture_states and new_state)):
+            self.out.mkdir(parents=True, exist_ok=True)
+            path = self.out / f"frame_{self.frame:06d}_{state}.{self.format}"
+            if self.format == "png":
+                pygame.image.save(surface, str(path))
+            else:
+                import numpy as np # Only the raw capture format needs NumPy
+                np.save(path, pygame.surfarray.array3d(surface))
+            self.captured.append(str(path))
+        self.frame += 1
+
+    def summary(self):
+        return (f"headless run: {self.frame} frames, {self.clock.ticks() / 1000:.1f}s virtual time, "
+                f"{len(self.captured)} frames saved to {self.out}")
+
+
+def main(argv=None):
+    """Runs the front end headlessly with the given script."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m redintel.headless SCRIPT.json", file=sys.stderr)
+        return 2
+    os.environ["REDINTEL_HEADLESS"] = argv[0] # Read when the front end is imported
+    from .frontend import main as run_front_end
+    run_front_end()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Hit-testing for the retained UI layout.
+
+The front end computes every fixed rect of its screens once (buttons,
+panels, option boxes) and both draws and hit-tests with those same rects.
+HitGrid is the lookup side: a spatial hash of named rects, so finding the
+widget under the pointer looks at one small bucket instead of rebuilding and
+testing every rect on every event. Board tiles don't need it; a camera maps
+a point to a cell with plain arithmetic.
+
+Rects are (x, y, w, h) sequences, so pygame.Rect works as well as a tuple.
+"""
+
+BUCKET = 64 # Bucket size in pixels; UI widgets are a few buckets wide at most
+
+
+class HitGrid:
+    """Named rects bucketed on a coarse grid; the last one added wins where they overlap."""
+
+    def __init__(self, bucket=BUCKET):
+        self.bucket = bucket
+        self.rects = {} # key -> (x, y, w, h) with a non-negative size
+        self.buckets = {} # (bx, by) -> keys, in insertion order
+
+    def add(self, key, rect):
+        x, y, w, h = rect
+        if w < 0: # Normalised, so a widget is clickable wherever it is drawn
+            x, w = x + w, -w
+        if h < 0:
+            y, h = y + h, -h
+        self.rects[key] = (x, y, w, h)
+        if w == 0 or h == 0:
+            return
+        b = self.bucket
+        for bx in range(x // b, (x + w - 1) // b + 1):
+            for by in range(y // b, (y + h - 1) // b + 1):
+                self.buckets.setdefault((bx, by), []).append(key)
+
+    def hit(self, pos):
+        """Returns the key of the widget under pos, or None."""
+        px, py = pos
+        keys = self.buckets.get((px // self.bucket, py // self.bucket))
+        if not keys:
+            return None
+        for key in reversed(keys):
+            x, y, w, h = self.rects[key]
+            if x <= px < x + w and y <= py < y + h:
+                return key
+        return None
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def __len__(self):
+        return len(self.rects)
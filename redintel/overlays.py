@@ -0,0 +1,43 @@
+"""Reusable translucent overlay surfaces.
+
+Shading the screen (darkening behind a prompt, the game over veil, the
+"Are you ready" strip, the drag preview tint) used to allocate a new
+SRCALPHA Surface every frame just to fill it with one translucent colour.
+OverlayPool keeps one display-format surface per (size, rgb), filled once;
+the alpha is a surface-wide set_alpha(), so fading in or out changes a
+single value instead of reallocating and refilling megabytes of pixels.
+"""
+import pygame
+
+
+class OverlayPool:
+    """Solid-colour surfaces keyed by size and rgb, reused across frames and states."""
+
+    def __init__(self):
+        self.surfaces = {} # ((w, h), (r, g, b)) -> Surface
+
+    def get(self, size, color):
+        """Returns a size surface of color ((r, g, b) or (r, g, b, a)) with its alpha set.
+
+        The surface is shared: blit it straight away and don't draw on it.
+        """
+        rgb, alpha = tuple(color[:3]), color[3] if len(color) > 3 else 255
+        key = (tuple(size), rgb)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(key[0])
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert() # Display pixel format: blits need no conversion
+            surface.fill(rgb)
+            self.surfaces[key] = surface
+        if surface.get_alpha() != alpha:
+            surface.set_alpha(alpha)
+        return surface
+
+    def shade(self, target, color, rect=None):
+        """Blends color over rect of target (the whole target by default)."""
+        rect = pygame.Rect(rect) if rect is not None else target.get_rect()
+        target.blit(self.get(rect.size, color), rect.topleft)
+
+    def clear(self):
+        self.surfaces.clear()
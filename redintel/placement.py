@@ -0,0 +1,176 @@
+"""Random fleet generation from precomputed placement tables.
+
+For every ship shape we precompute, once per grid size, the bitmask of
+origins where the shape fits on the board, the bit shift of each of its
+cells and its 3x3 "halo" (cells plus neighbours). Placing a fleet then
+works on a single forbidden-zone bitmask:
+
+* the legal origins of a shape are its origin mask minus every origin that
+  would put one of its cells on a forbidden tile, which is one shift and OR
+  per cell over the whole board at once;
+* an origin is drawn uniformly from that mask;
+* the ship's halo is OR-ed into the forbidden zone, which enforces the
+  no-touching (3x3 adjacency) rule for every later ship.
+
+When a ship has no legal origin left the generator backtracks and tries a
+different position for the previous ship. Three things keep that search
+small:
+
+* forward checking: after each ship the free cells must still hold every
+  cell still to place and, once the board gets crowded, every ship still to
+  place must have a legal origin left, or the position is dropped before
+  anything is placed on top of it;
+* identical ships are placed in increasing origin order, so the search
+  never tries the same set of positions in another order;
+* an area bound rejects a fleet that cannot fit outright: each ship plus its
+  right and bottom neighbours covers a patch no other ship's patch can
+  share, and all of them lie in a (size + 1) x (size + 1) square.
+
+A fleet that fits comfortably is found by the first, uniformly random
+pass, usually without a single dead end. Crowded fleets (near the most
+ships the board can hold) rarely come out of random positions, so if that
+pass runs out of MAX_ATTEMPTS positions a second one packs ships in
+row-major order from one corner, which finds the dense arrangements
+directly. Only when both give up does generate() report failure.
+"""
+import random
+from functools import lru_cache
+
+from .board import Board
+
+MAX_ATTEMPTS = 10000 # Ship positions tried per fleet before generate() reports failure
+
+
+class ShapeTable:
+    """Precomputed placement data for one ship shape on one grid size."""
+    __slots__ = ('name', 'shape', 'cell_shifts', 'halo', 'footprint', 'origins')
+
+    def __init__(self, name, shape, grid_size):
+        self.name = name
+        self.shape = tuple(shape)
+        self.cell_shifts = tuple(dy * grid_size + dx for dx, dy in self.shape)
+        self.halo = tuple(sorted({(dx + hx, dy + hy) for dx, dy in self.shape
+                                  for hx in (-1, 0, 1) for hy in (-1, 0, 1)}))
+        # Cells plus right / bottom neighbours: disjoint for ships that don't touch
+        self.footprint = len({(dx + hx, dy + hy) for dx, dy in self.shape for hx in (0, 1) for hy in (0, 1)})
+
+        # Origins where every cell of the shape lands on the board
+        min_x = min(dx for dx, _ in self.shape); max_x = max(dx for dx, _ in self.shape)
+        min_y = min(dy for _, dy in self.shape); max_y = max(dy for _, dy in self.shape)
+        row = 0
+        for x in range(-min_x, grid_size - max_x):
+            row |= 1 << x
+        origins = 0
+        for y in range(-min_y, grid_size - max_y):
+            origins |= row << (y * grid_size)
+        self.origins = origins
+
+    def legal_origins(self, forbidden):
+        """Mask of origins where no cell of the shape touches the forbidden zone."""
+        blocked = 0
+        for shift in self.cell_shifts:
+            blocked |= forbidden >> shift if shift >= 0 else forbidden << -shift
+        return self.origins & ~blocked
+
+    def coords_at(self, origin):
+        ox, oy = origin
+        return [(ox + dx, oy + dy) for dx, dy in self.shape]
+
+    def halo_mask(self, origin, grid_size):
+        ox, oy = origin
+        mask = 0
+        for hx, hy in self.halo:
+            x, y = ox + hx, oy + hy
+            if 0 <= x < grid_size and 0 <= y < grid_size:
+                mask |= 1 << (y * grid_size + x)
+        return mask
+
+
+class PlacementTables:
+    """Shape tables for a whole fleet definition (like ship_options) on one grid size."""
+
+    def __init__(self, grid_size, ships):
+        self.grid_size = grid_size
+        self.board = Board(grid_size) # Only used for mask sampling
+        tables = [ShapeTable(name, shape, grid_size) for name, shape in ships]
+        group = {}
+        for table in tables:
+            group.setdefault(table.shape, len(group))
+        # Biggest ships first: they are the hardest to fit, so dead ends show up early; identical ships side by side
+        self.tables = sorted(tables, key=lambda t: (-len(t.shape), group[t.shape]))
+        self.repeats = [i > 0 and t.shape == self.tables[i - 1].shape for i, t in enumerate(self.tables)]
+        self.cells_left = [sum(len(t.shape) for t in self.tables[i:]) for i in range(len(self.tables) + 1)]
+        # Forward checks only run once this many cells are forbidden; before that there is plenty of room,
+        # the checks would pass, and they only prune anyway
+        self.crowded_at = [grid_size * grid_size - 4 * sum(t.footprint for t in self.tables[i:])
+                           for i in range(len(self.tables) + 1)]
+        self.fits = sum(t.footprint for t in self.tables) <= (grid_size + 1) ** 2
+        self.attempts = 0 # Positions left to try in the current pass
+        self.pick = None # The current pass's origin choice: uniform, or packed from a corner
+        self.descending = False
+
+    def generate(self, rng=random, max_attempts=MAX_ATTEMPTS):
+        """Returns a random legal fleet as a list of (name, coords), or None if none was found.
+
+        None means no fleet exists, or neither pass found one within max_attempts ship positions.
+        """
+        if not self.fits:
+            return None
+        board = self.board
+        origins = self._search(lambda legal: board.random_cell(legal, rng), False, max_attempts)
+        if origins is None: # Crowded: pack from a random corner instead
+            if rng.random() < 0.5:
+                origins = self._search(lambda legal: next(board.cells(legal & -legal)), False, max_attempts)
+            else:
+                origins = self._search(lambda legal: next(board.cells(1 << (legal.bit_length() - 1))), True, max_attempts)
+        if origins is None:
+            return None
+        return [(table.name, table.coords_at(origin)) for table, origin in zip(self.tables, origins)]
+
+    def _search(self, pick, descending, max_attempts):
+        """One backtracking pass: pick chooses an origin from a legal mask; identical ships go in
+        increasing origin order, or decreasing if descending."""
+        self.pick = pick
+        self.descending = descending
+        self.attempts = max_attempts
+        return self._place(0, 0, 0)
+
+    def _place(self, i, forbidden, used):
+        """Origins for tables[i:] around the forbidden zone; used masks origins the previous identical ship rules out."""
+        if i == len(self.tables):
+            return []
+        table = self.tables[i]
+        legal = table.legal_origins(forbidden)
+        if self.repeats[i]:
+            legal &= ~used
+        while legal:
+            if self.attempts <= 0:
+                return None # Out of attempts: unwind without trying anything else
+            self.attempts -= 1
+            origin = self.pick(legal)
+            bit = self.board.bit(origin)
+            legal &= ~bit
+            zone = forbidden | table.halo_mask(origin, self.grid_size)
+            if zone.bit_count() > self.crowded_at[i + 1] and not self._still_fits(i + 1, zone):
+                continue # Forward check failed: no need to place anything on top of it
+            rest = self._place(i + 1, zone, ~(bit - 1) if self.descending else (bit << 1) - 1)
+            if rest is not None:
+                return [origin] + rest
+            # Dead end further down: backtrack
+        return None
+
+    def _still_fits(self, i, forbidden):
+        """Whether every ship from tables[i] on has a legal origin and the free cells can hold them all."""
+        if self.cells_left[i] > self.board.count(self.board.full & ~forbidden):
+            return False
+        return all(table.legal_origins(forbidden) for j, table in enumerate(self.tables[i:], i)
+                   if j == i or not self.repeats[j]) # One check per distinct shape
+
+
+@lru_cache(maxsize=32)
+def _cached_tables(grid_size, ship_key):
+    return PlacementTables(grid_size, ship_key)
+
+def placement_tables(grid_size, ships):
+    """Returns the (cached) PlacementTables for a ship_options-style dict."""
+    return _cached_tables(grid_size, tuple((name, tuple(shape)) for name, shape in ships.items()))
@@ -0,0 +1,100 @@
+"""Loading-screen work with real progress.
+
+The loading screens used to wait a fixed time and do nothing. Preloader
+runs the work the next screens would otherwise do on their first frames
+(loading fonts, pre-rendering text and board surfaces, building placement
+and AI tables) and reports how much is done, so the loading screen can show
+a real progress bar and end as soon as everything is ready.
+
+pygame surfaces and fonts must only be touched from the main thread, so
+those jobs run a few at a time from step(), called once per frame with a
+time budget that keeps the loading animation smooth. Pure-Python jobs (the
+engine's placement tables, the opponent AI's density tables) can run on a
+background thread instead and overlap with them. A failing job is recorded
+and skipped: everything it would have prepared is still built on first use.
+"""
+import threading
+import time
+
+
+class Preloader:
+    """Named jobs, some on a background thread, with a progress fraction for the loading screen."""
+
+    def __init__(self, threaded=True, clock=time.perf_counter):
+        self.threaded = threaded # False runs background jobs from step() too (deterministic headless runs)
+        self.clock = clock
+        self.jobs = [] # (name, fn) run by step() on the main thread, in order
+        self.background_jobs = []
+        self.thread = None
+        self.started = False
+        self.total = 0
+        self.finished_jobs = 0
+        self.timings = {} # name -> ms
+        self.errors = [] # (name, exception)
+        self.lock = threading.Lock()
+
+    def add(self, name, fn, background=False):
+        """Queues fn(); background jobs must not touch pygame."""
+        (self.background_jobs if background else self.jobs).append((name, fn))
+        self.total += 1
+
+    @property
+    def progress(self):
+        """Fraction of the jobs finished, 0..1."""
+        total = self.total
+        return self.finished_jobs / total if total else 1.0
+
+    @property
+    def done(self):
+        return self.started and not self.jobs and not self.background_jobs and (
+            self.thread is None or not self.thread.is_alive())
+
+    def start(self):
+        """Starts the background thread; main-thread jobs wait for step()."""
+        self.started = True
+        if not self.threaded:
+            self.jobs.extend(self.background_jobs)
+            self.background_jobs = []
+        elif self.background_jobs:
+            self.thread = threading.Thread(target=self._run_background, name="redintel-preload", daemon=True)
+            self.thread.start()
+
+    def step(self, budget_ms=None):
+        """Runs main-thread jobs until budget_ms is spent (at least one job; None runs them all). Returns done."""
+        if not self.started:
+            self.start()
+        deadline = None if budget_ms is None else self.clock() + budget_ms / 1000
+        while self.jobs:
+            self._run(*self.jobs.pop(0))
+            if deadline is not None and self.clock() >= deadline:
+                break
+        if budget_ms is None and self.thread is not None:
+            self.thread.join()
+        return self.done
+
+    def _run_background(self):
+        while True:
+            with self.lock:
+                if not self.background_jobs:
+                    return
+                name, fn = self.background_jobs.pop(0) # done also waits for the thread, so this can go now
+            self._run(name, fn)
+
+    def _run(self, name, fn):
+        start = self.clock()
+        try:
+            fn()
+        except Exception as e: # Preloading is only a head start; the screens build what's missing themselves
+            self.errors.append((name, e))
+        with self.lock:
+            self.timings[name] = (self.clock() - start) * 1000
+            self.finished_jobs += 1
+
+    def summary(self):
+        slowest = sorted(self.timings.items(), key=lambda item: -item[1])[:3]
+        text = f"preloaded {self.finished_jobs} jobs in {sum(self.timings.values()):.0f} ms"
+        if slowest:
+            text += " (slowest: " + ", ".join(f"{name} {ms:.0f}" for name, ms in slowest) + ")"
+        if self.errors:
+            text += f", {len(self.errors)} failed: " + ", ".join(f"{name}: {e}" for name, e in self.errors)
+        return text
@@ -0,0 +1,168 @@
+"""Per-frame timing for the pygame front end.
+
+The main loop brackets each part of a frame:
+
+    profiler.begin_frame(game_state)
+    ...handle events...       profiler.mark("events")
+    ...state logic...         profiler.mark("logic")
+    ...draw...                profiler.mark("draw")
+    pygame.display.flip()     profiler.mark("present")
+    scheduler.wait(...)       profiler.end_frame(scheduler.slept)    # the rest counts as "idle"
+
+Timings are kept per game_state in a rolling window, so overlay_lines() can
+show p50 / p99 for the current state, and a frame that overruns its budget
+(1 / target FPS, idle time included) by half is counted as dropped, unless the
+loop deliberately slept waiting for input. With a log
+path every frame is also streamed to CSV (or JSONL for a .jsonl path), one
+row per frame, to find stutters after the fact.
+
+Nothing here imports pygame; the front end draws the overlay lines itself.
+"""
+import csv
+import json
+import math
+import time
+from collections import deque
+
+SECTIONS = ("events", "logic", "draw", "present", "idle")
+WINDOW = 600 # Frames kept per state for the percentiles (10s at 60 FPS)
+DROP_FACTOR = 1.5 # A frame slower than this many frame budgets counts as dropped
+FLUSH_EVERY = 60 # Frames between log flushes
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class StateTimings:
+    """Rolling frame timings for one game state."""
+    __slots__ = ('sections', 'frames', 'work', 'count', 'dropped')
+
+    def __init__(self):
+        self.sections = {name: deque(maxlen=WINDOW) for name in SECTIONS}
+        self.frames = deque(maxlen=WINDOW) # Whole frame including idle, ms
+        self.work = deque(maxlen=WINDOW) # Everything but idle, ms
+        self.count = 0
+        self.dropped = 0
+
+
+class FrameProfiler:
+    """Times the sections of every frame, per game state, optionally logging each frame."""
+
+    def __init__(self, target_fps=60, log_path=None, clock=time.perf_counter):
+        self.budget_ms = 1000.0 / target_fps
+        self.clock = clock
+        self.states = {}
+        self.frame = 0
+        self.state = None
+        self.frame_start = None
+        self.last_mark = None
+        self.current = {}
+        self.log_file = None
+        self.log_writer = None
+        if log_path:
+            self.open_log(log_path)
+
+    # --- Recording ---
+
+    def begin_frame(self, state):
+        now = self.clock()
+        self.state = state
+        self.frame_start = self.last_mark = now
+        self.current = dict.fromkeys(SECTIONS, 0.0)
+
+    def mark(self, section):
+        """Charges the time since the previous mark to a section."""
+        now = self.clock()
+        self.current[section] += (now - self.last_mark) * 1000.0
+        self.last_mark = now
+
+    def end_frame(self, slept=False):
+        """Closes the frame; everything since the last mark is idle time.
+
+        slept: the loop blocked waiting for input, so a long frame is not a drop.
+        """
+        if self.frame_start is None:
+            return
+        self.mark("idle")
+        frame_ms = (self.last_mark - self.frame_start) * 1000.0
+        work_ms = frame_ms - self.current["idle"]
+        dropped = not slept and frame_ms > self.budget_ms * DROP_FACTOR
+
+        timings = self.states.get(self.state)
+        if timings is None:
+            timings = self.states[self.state] = StateTimings()
+        for name, value in self.current.items():
+            timings.sections[name].append(value)
+        timings.frames.append(frame_ms)
+        timings.work.append(work_ms)
+        timings.count += 1
+        timings.dropped += dropped
+
+        if self.log_writer is not None:
+            self._log(frame_ms, work_ms, dropped)
+        self.frame += 1
+        self.frame_start = None
+
+    # --- Reporting ---
+
+    def summary(self, state):
+        """p50 / p99 (ms) of every section, the work time and the whole frame for one state."""
+        timings = self.states.get(state)
+        if timings is None:
+            return None
+        result = {"frames": timings.count, "dropped": timings.dropped}
+        series = dict(timings.sections, work=timings.work, frame=timings.frames)
+        for name, values in series.items():
+            ordered = sorted(values)
+            result[name] = (percentile(ordered, 50), percentile(ordered, 99))
+        return result
+
+    def overlay_lines(self, state=None):
+        """Text lines for the on-screen overlay (current state by default)."""
+        state = self.state if state is None else state
+        stats = self.summary(state)
+        if stats is None:
+            return [f"{state}: no frames yet"]
+        lines = [f"{state}  frames {stats['frames']}  dropped {stats['dropped']}",
+                 f"frame  p50 {stats['frame'][0]:6.2f}  p99 {stats['frame'][1]:6.2f} ms",
+                 f"work   p50 {stats['work'][0]:6.2f}  p99 {stats['work'][1]:6.2f} ms"]
+        for name in SECTIONS[:-1]:
+            p50, p99 = stats[name]
+            lines.append(f"  {name:<8}{p50:6.2f} / {p99:6.2f}")
+        return lines
+
+    # --- Streaming to disk ---
+
+    def open_log(self, path):
+        self.close()
+        self.log_file = open(path, "w", newline="")
+        if str(path).endswith(".jsonl"):
+            self.log_writer = lambda row: self.log_file.write(json.dumps(row) + "\n")
+        else:
+            writer = csv.DictWriter(self.log_file, fieldnames=self._log_fields())
+            writer.writeheader()
+            self.log_writer = writer.writerow
+
+    @staticmethod
+    def _log_fields():
+        return ["frame", "time", "state"] + [f"{name}_ms" for name in SECTIONS] + ["work_ms", "frame_ms", "dropped"]
+
+    def _log(self, frame_ms, work_ms, dropped):
+        row = {"frame": self.frame, "time": round(self.frame_start, 6), "state": self.state}
+        for name in SECTIONS:
+            row[f"{name}_ms"] = round(self.current[name], 3)
+        row.update(work_ms=round(work_ms, 3), frame_ms=round(frame_ms, 3), dropped=int(dropped))
+        self.log_writer(row)
+        if self.frame % FLUSH_EVERY == 0:
+            self.log_file.flush()
+
+    def close(self):
+        if self.log_file is not None:
+            self.log_file.close()
+        self.log_file = None
+        self.log_writer = None
@@ -0,0 +1,172 @@
+"""Seekable playback of a logged match, for the front end's replay viewer.
+
+    match = ReplayMatch.open("turns.jsonl")    # the last match in the log
+    match.seek_turn(400)                       # nearest keyframe, then at most a few dozen steps
+    match.step_back()
+    match.play(); match.update(now_ms)         # once per frame; 1x-100x
+
+Positions count steps: position p is the match after the log's first p
+steps, and match.engine always shows it. Seeking loads the nearest snapshot
+at or before the target (the keyframes TurnLog wrote next to the log, plus
+any this replay has passed since) and steps forward from there, so a seek
+costs one snapshot load and fewer than KEYFRAME_INTERVAL steps however long
+the match is. Going backwards is a seek too.
+
+Player 2 is replaced by LoggedShots, which fires where the log says Player 2
+fired: a snapshot does not hold the AI's own state, and the logged shots
+are the ones to show anyway. The AI's rolls come from its own stream, so
+nothing else in the match notices.
+"""
+import bisect
+
+from . import snapshot, turnlog
+from .engine import PHASE_PLAYER2_TURN, PLAYER2
+from .turnlog import KEYFRAME_INTERVAL
+
+SPEEDS = (1, 2, 5, 10, 25, 50, 100)
+STEP_MS = 600 # One step per this many ms at 1x, about the live game's pace between phases
+
+
+class LoggedShots:
+    """Player 2 stand-in: fires at the target set before each step."""
+
+    def __init__(self):
+        self.target = None
+
+    def reset(self, engine):
+        self.target = None
+
+    def choose(self, engine):
+        return self.target
+
+    def observe(self, coord, ship, sunk):
+        pass
+
+
+def player2_target(events):
+    """Where Player 2 fired in a logged step, or None."""
+    for event in events:
+        if event[0] in ("hit", "miss") and event[1] == PLAYER2:
+            return tuple(event[2])
+    return None
+
+
+class ReplayMatch:
+    """One logged match, positioned at any step, with a play / pause / speed control."""
+
+    def __init__(self, header, steps, end=None, keyframes=None):
+        self.header = header
+        self.steps = steps
+        self.end = end
+        self.opponent = LoggedShots()
+        self.engine = turnlog.engine_for(header, self.opponent)
+        self.keyframes = dict(keyframes or {}) # steps played -> snapshot bytes
+        self.keyframes[0] = snapshot.dump(self.engine)
+        self.keyframe_steps = sorted(self.keyframes)
+        self.position = 0
+        self.turns = [self.engine.turn] + [step["turn"] for step in steps] # Turn shown at each position
+        self.playing = False
+        self.speed = 0 # Index into SPEEDS
+        self.last_update = None
+        self.carry_ms = 0.0
+
+    @classmethod
+    def open(cls, path):
+        """The last match in the turn log at path, with its keyframes. Returns None if the log has no match."""
+        match = turnlog.last_match(path)
+        if match is None:
+            return None
+        header, steps, end = match
+        return cls(header, steps, end, turnlog.read_keyframes(path, header))
+
+    @property
+    def length(self):
+        return len(self.steps)
+
+    @property
+    def turn(self):
+        return self.turns[self.position]
+
+    @property
+    def last_turn(self):
+        return self.turns[-1]
+
+    @property
+    def next_action(self):
+        """The action the log takes from this position (None at the end or on a timeout)."""
+        return self.steps[self.position]["action"] if self.position < len(self.steps) else None
+
+    # --- Seeking ---
+
+    def seek(self, position):
+        """Shows the match after position steps (clamped to the log)."""
+        position = max(0, min(position, len(self.steps)))
+        if position < self.position or position - self.position >= KEYFRAME_INTERVAL:
+            start = self.keyframe_steps[bisect.bisect_right(self.keyframe_steps, position) - 1]
+            if start > self.position or position < self.position: # Never load one behind where we already are
+                snapshot.load(self.keyframes[start], self.engine)
+                self.position = start
+        while self.position < position:
+            self._advance()
+
+    def seek_turn(self, turn):
+        """Shows the first position of turn (the War Room it opens with)."""
+        self.seek(bisect.bisect_left(self.turns, turn))
+
+    def step_forward(self, count=1):
+        self.seek(self.position + count)
+
+    def step_back(self, count=1):
+        self.seek(self.position - count)
+
+    def _advance(self):
+        step = self.steps[self.position]
+        if step["phase"] == PHASE_PLAYER2_TURN:
+            self.opponent.target = player2_target(step["events"])
+        self.engine.step(step["action"])
+        self.position += 1
+        if self.position % KEYFRAME_INTERVAL == 0 and self.position not in self.keyframes: # Remember it for later seeks
+            self.keyframes[self.position] = snapshot.dump(self.engine)
+            bisect.insort(self.keyframe_steps, self.position)
+
+    # --- Playback ---
+
+    def play(self):
+        if self.position >= len(self.steps):
+            self.seek(0) # Play again from the start
+        self.playing = True
+        self.last_update = None
+
+    def pause(self):
+        self.playing = False
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    @property
+    def speed_factor(self):
+        return SPEEDS[self.speed]
+
+    def faster(self):
+        self.speed = min(self.speed + 1, len(SPEEDS) - 1)
+
+    def slower(self):
+        self.speed = max(self.speed - 1, 0)
+
+    def update(self, now_ms):
+        """Advances a playing replay by the steps due since the last call."""
+        if not self.playing:
+            return
+        if self.last_update is not None:
+            self.carry_ms += (now_ms - self.last_update) * SPEEDS[self.speed]
+            due = int(self.carry_ms // STEP_MS)
+            if due:
+                self.carry_ms -= due * STEP_MS
+                self.step_forward(due)
+        self.last_update = now_ms
+        if self.position >= len(self.steps):
+            self.playing = False
+            self.carry_ms = 0.0
@@ -0,0 +1,37 @@
+"""pygame resources that are only created when first used.
+
+Importing the front end must not open a window or start SDL subsystems:
+tools and tests import it for its layout and drawing helpers, and the game
+itself wants the first frame up as early as possible. Fonts are declared up
+front as LazyFont objects and loaded (initialising pygame.font if needed)
+the first time something measures or renders with them. The display is
+opened by the front end's init_display().
+"""
+import pygame
+
+
+class LazyFont:
+    """Stands in for pygame.font.Font(name, size) and loads it on first use."""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size_px = size
+        self._font = None
+
+    @property
+    def loaded(self):
+        return self._font is not None
+
+    @property
+    def font(self):
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(self.name, self.size_px)
+        return self._font
+
+    def render(self, text, antialias, color, background=None):
+        return self.font.render(text, antialias, color, background)
+
+    def __getattr__(self, attr): # size(), get_linesize(), get_height() ...
+        return getattr(self.font, attr)
@@ -0,0 +1,45 @@
+"""Per-subsystem random streams for a match.
+
+Every source of randomness in a match draws from its own random.Random,
+derived from the match seed and the stream's name. Rolls in one subsystem
+therefore never shift another: a consultant change that draws one more
+number leaves Player 2's shots and the corruption rolls exactly as they
+were, and a logged match (see redintel.turnlog) replays to the same state.
+
+    placement    both fleets' random placement
+    consultant   the three target options each War Room
+    corruption   the corruption roll after a hit streak
+    bonus        which tile a bonus reveals
+    opponent     Player 2's AI (engine.rng, for player2_ai implementations)
+    chat         front-end flavour text (the consultant's advice line)
+"""
+import random
+
+STREAMS = ("placement", "consultant", "corruption", "bonus", "opponent", "chat")
+ENGINE_STREAMS = STREAMS[:-1] # Everything the engine itself draws from; chat is rolled by the front end between steps
+
+
+def new_seed():
+    """A fresh random match seed, for matches started without one (so they can still be logged and replayed)."""
+    return random.SystemRandom().getrandbits(63)
+
+
+class RngStreams:
+    """One seeded random.Random per subsystem, as attributes named after STREAMS."""
+    __slots__ = ('seed',) + STREAMS
+
+    def __init__(self, seed):
+        self.seed = seed
+        for name in STREAMS:
+            setattr(self, name, random.Random(f"{seed}/{name}"))
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def getstate(self):
+        """Returns {stream: random.Random state}."""
+        return {name: getattr(self, name).getstate() for name in STREAMS}
+
+    def setstate(self, states):
+        for name, state in states.items():
+            getattr(self, name).setstate(state)
@@ -0,0 +1,51 @@
+"""Idle-aware frame pacing for the pygame main loop.
+
+clock.tick(60) keeps the loop spinning 60 times a second even when nothing
+on screen can change until the player does something. FrameScheduler only
+does that while something animates (a countdown, a flashing preview, a
+typing effect). Otherwise it blocks in pygame.event.wait() until an event
+arrives or the next scheduled timer is due, so an idle menu or game over
+screen costs next to no CPU. The event that woke it is handed back to the
+loop on the next events() call, so no input is lost.
+"""
+import pygame
+
+
+class FrameScheduler:
+    """Ticks at fps while the screen is animating, sleeps until input or a deadline otherwise."""
+
+    def __init__(self, fps=60, max_sleep_ms=1000):
+        self.fps = fps
+        self.max_sleep_ms = max_sleep_ms # Upper bound on one sleep, so the loop still checks in now and then
+        self.clock = pygame.time.Clock()
+        self.pending = [] # Event that ended the last sleep
+        self.slept = False # Whether the last wait() blocked instead of ticking
+
+    def events(self, state=None):
+        """Returns this frame's events, including the one that woke the loop.
+
+        state (the current game_state) is only used by scripted runs, see redintel.headless.
+        """
+        events = self.pending + pygame.event.get()
+        self.pending = []
+        return events
+
+    def wait(self, active, wake_at=None):
+        """Ends a frame.
+
+        active: something on screen changes by itself, so keep the frame rate.
+        wake_at: pygame.time.get_ticks() value when the next timer is due, or None.
+        """
+        if active:
+            self.slept = False
+            self.clock.tick(self.fps)
+            return
+        timeout = self.max_sleep_ms
+        if wake_at is not None:
+            timeout = min(timeout, wake_at - pygame.time.get_ticks())
+        self.slept = timeout > 0 # An overdue timer: no sleep, so the profiler counts the frame as busy
+        if self.slept: # event.wait(0) would block forever
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                self.pending.append(event)
+        self.clock.tick() # Restart the frame clock so the next active frame isn't delayed
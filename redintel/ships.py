@@ -0,0 +1,110 @@
+"""Ship and fleet records.
+
+A Ship is a compact __slots__ object: its coordinates are frozen when it is
+created and hits are tracked as a bitmask over its own segments. A Fleet
+indexes every segment of every ship by coordinate, so looking up which ship
+sits on a tile is a dict lookup no matter how many ships or how large the
+board is.
+
+Both keep running counters of what is left afloat. They are only touched
+when a hit is recorded, so a ship knows it has sunk, and a fleet knows it is
+wiped out, at the moment it happens without rescanning anything.
+"""
+
+
+class Ship:
+    """One placed ship: name, the cells it covers and which of them have been hit."""
+    __slots__ = ('name', 'coords', 'segments', 'hit_mask', 'remaining', 'sunk')
+
+    def __init__(self, name, coords):
+        self.name = name
+        self.coords = tuple(coords) # Placement order, for drawing and logs
+        self.segments = {coord: 1 << i for i, coord in enumerate(self.coords)} # coord -> segment bit
+        self.hit_mask = 0
+        self.remaining = len(self.coords) # Segments not hit yet
+        self.sunk = not self.coords
+
+    def record_hit(self, coord):
+        """Marks a segment as hit. Returns True if it wasn't hit before."""
+        bit = self.segments[coord]
+        if self.hit_mask & bit:
+            return False
+        self.hit_mask |= bit
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.sunk = True
+        return True
+
+    def is_hit(self, coord):
+        return bool(self.hit_mask & self.segments[coord])
+
+    @property
+    def hits(self):
+        """Coordinates of the segments hit so far."""
+        return [coord for coord, bit in self.segments.items() if self.hit_mask & bit]
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __repr__(self):
+        return f"Ship({self.name!r}, hits={self.hit_mask.bit_count()}/{len(self.coords)})"
+
+
+class Fleet:
+    """A player's ships plus a coordinate -> ship index over all their segments.
+
+    remaining counts unhit segments and afloat counts unsunk ships across
+    the whole fleet; record_hit() keeps both current.
+    """
+    __slots__ = ('ships', 'index', 'remaining', 'afloat')
+
+    def __init__(self, ships=()):
+        self.ships = []
+        self.index = {}
+        self.remaining = 0
+        self.afloat = 0
+        for ship in ships:
+            self.add(ship)
+
+    def add(self, ship):
+        for coord in ship.coords:
+            if coord in self.index:
+                raise ValueError(f"{ship.name} overlaps {self.index[coord].name} at {coord}")
+        for coord in ship.coords:
+            self.index[coord] = ship
+        self.ships.append(ship)
+        self.remaining += ship.remaining
+        if not ship.sunk:
+            self.afloat += 1
+
+    def record_hit(self, coord):
+        """Registers an attack on coord.
+
+        Returns (ship, sunk): the ship hit (None for open water) and whether
+        this hit is the one that sank it.
+        """
+        ship = self.index.get(coord)
+        if ship is None or not ship.record_hit(coord):
+            return ship, False
+        self.remaining -= 1
+        if ship.sunk:
+            self.afloat -= 1
+            return ship, True
+        return ship, False
+
+    @property
+    def all_sunk(self):
+        return self.afloat == 0
+
+    def ship_at(self, coord):
+        """Returns the ship covering coord, or None for open water."""
+        return self.index.get(coord)
+
+    def __iter__(self):
+        return iter(self.ships)
+
+    def __len__(self):
+        return len(self.ships)
+
+    def __getitem__(self, i):
+        return self.ships[i]
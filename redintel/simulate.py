@@ -0,0 +1,235 @@
+"""Monte Carlo self-play simulator.
+
+Plays headless Red Room matches across a process pool and reports win
+rates, game lengths and bonus streak / corruption distributions with 95%
+confidence intervals, so balance knobs can be tuned from numbers instead
+of by feel:
+
+    python -m redintel.simulate --games 200000 --p1 consultant --corruption-chance 0.75
+
+Every game gets its own seed derived from --seed and the game number, so a
+run gives the same totals whatever the worker count.
+
+Player 1 policies receive (engine, rng) in the War Room and return the index
+of the consultant option to attack, or None to let the timer run out.
+Player 2 policies are GameEngine player2_ai classes. Both can be given by
+registry name or as "package.module:attribute".
+"""
+import argparse
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+
+from .ai import PLAYER2_POLICIES
+from .engine import (GameEngine, GRID_SIZE, CORRUPTION_THRESHOLD, CORRUPTION_CHANCE,
+                     PLAYER1, PHASE_WAR_ROOM, PHASE_INTEL_RESOLUTION, PHASE_TRAFFIC_LIGHT, PHASE_GAME_OVER)
+
+WAR_ROOM_DURATION = 10 # seconds, as in the front end
+CHUNK_SIZE = 1000 # Games per task handed to a worker
+
+
+# --- Player 1 policies ---
+
+def consultant_player(engine, rng):
+    """Trusts the intel: always attacks the consultant's guaranteed hit."""
+    for i, coord in enumerate(engine.consultant_options):
+        ship = engine.player2_ships_state.ship_at(coord)
+        if ship is not None and not ship.is_hit(coord):
+            return i
+    return 0
+
+def random_player(engine, rng):
+    """Picks one of the three consultant options at random."""
+    return rng.randrange(len(engine.consultant_options))
+
+def timeout_player(engine, rng):
+    """Never answers; the War Room timer runs out every turn."""
+    return None
+
+PLAYER1_POLICIES = {
+    "consultant": consultant_player,
+    "random": random_player,
+    "timeout": timeout_player,
+}
+
+def resolve_policy(name, registry):
+    """Looks a policy up by registry name or imports it from "module:attribute"."""
+    if name in registry:
+        return registry[name]
+    if ":" not in name:
+        raise ValueError(f"Unknown policy {name!r}; choose from {', '.join(registry)} or use module:attribute")
+    module_name, attr = name.split(":", 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# --- Playing games ---
+
+def play_game(engine, seed, player1, war_room_duration=WAR_ROOM_DURATION, reaction_mean=0.0):
+    """Plays one match to the end. Returns a dict of per-game statistics.
+
+    reaction_mean > 0 gives Player 1 exponentially distributed decision times;
+    a decision slower than war_room_duration counts as a timeout.
+    """
+    engine.reset(seed=seed)
+    rng = random.Random(f"{seed}:player1")
+    max_streak = corruptions = timeouts = 0
+
+    while engine.phase != PHASE_GAME_OVER:
+        phase = engine.phase
+        if phase == PHASE_WAR_ROOM:
+            action = player1(engine, rng)
+            if action is not None and reaction_mean > 0 and rng.expovariate(1.0 / reaction_mean) > war_room_duration:
+                action = None
+            if action is None:
+                timeouts += 1
+            for event in engine.step(action):
+                if event[0] == 'corruption':
+                    corruptions += 1
+            if engine.player1_bonus_streak > max_streak:
+                max_streak = engine.player1_bonus_streak
+        elif phase == PHASE_INTEL_RESOLUTION:
+            engine.step(0) # Reveal Segment: the only working bonus
+        elif phase == PHASE_TRAFFIC_LIGHT:
+            engine.step('G')
+        else:
+            engine.step()
+
+    return {"winner": engine.winner, "turns": engine.turn, "max_streak": max_streak,
+            "corruptions": corruptions, "timeouts": timeouts}
+
+
+class Tally:
+    """Mergeable per-run statistics (plain Counters so they pickle cheaply)."""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = Counter()
+        self.turns = Counter()
+        self.max_streak = Counter()
+        self.corruptions = Counter()
+        self.timeouts = Counter()
+
+    def add(self, result):
+        self.games += 1
+        self.wins[result["winner"]] += 1
+        self.turns[result["turns"]] += 1
+        self.max_streak[result["max_streak"]] += 1
+        self.corruptions[result["corruptions"]] += 1
+        self.timeouts[result["timeouts"]] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        for name in ("wins", "turns", "max_streak", "corruptions", "timeouts"):
+            getattr(self, name).update(getattr(other, name))
+
+
+def _run_chunk(task):
+    config, start, count = task
+    engine = GameEngine(config["grid_size"],
+                        player2_ai=resolve_policy(config["p2"], PLAYER2_POLICIES)(),
+                        corruption_threshold=config["corruption_threshold"],
+                        corruption_chance=config["corruption_chance"])
+    player1 = resolve_policy(config["p1"], PLAYER1_POLICIES)
+    tally = Tally()
+    for game in range(start, start + count):
+        tally.add(play_game(engine, f"{config['seed']}:{game}", player1,
+                            config["war_room_duration"], config["reaction_mean"]))
+    return tally
+
+def run_simulation(config, games, workers=None, chunk_size=CHUNK_SIZE):
+    """Plays `games` matches with the given config across `workers` processes. Returns a Tally."""
+    tasks = [(config, start, min(chunk_size, games - start)) for start in range(0, games, chunk_size)]
+    tally = Tally()
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            tally.merge(_run_chunk(task))
+        return tally
+    with multiprocessing.Pool(workers) as pool:
+        for part in pool.imap_unordered(_run_chunk, tasks):
+            tally.merge(part)
+    return tally
+
+
+# --- Reporting ---
+
+def wilson_interval(successes, n, z=1.96):
+    """95% Wilson score interval for a proportion."""
+    if n == 0:
+        return 0.0, 0.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return centre - half, centre + half
+
+def distribution_summary(counter, z=1.96):
+    """Mean, 95% CI half-width and normalised histogram of a Counter of values."""
+    n = sum(counter.values())
+    if n == 0:
+        return {"mean": 0.0, "ci": 0.0, "histogram": {}}
+    mean = sum(value * count for value, count in counter.items()) / n
+    var = sum(count * (value - mean) ** 2 for value, count in counter.items()) / max(1, n - 1)
+    return {"mean": mean, "ci": z * math.sqrt(var / n),
+            "histogram": {value: counter[value] / n for value in sorted(counter)}}
+
+def summarize(tally, config, elapsed):
+    p1_wins = tally.wins.get(PLAYER1, 0)
+    low, high = wilson_interval(p1_wins, tally.games)
+    return {
+        "config": config,
+        "games": tally.games,
+        "seconds": elapsed,
+        "games_per_minute": tally.games / elapsed * 60 if elapsed > 0 else None,
+        "player1_win_rate": p1_wins / tally.games if tally.games else 0.0,
+        "player1_win_rate_ci": [low, high],
+        "turns": distribution_summary(tally.turns),
+        "max_streak": distribution_summary(tally.max_streak),
+        "corruptions": distribution_summary(tally.corruptions),
+        "timeouts": distribution_summary(tally.timeouts),
+    }
+
+def format_report(summary):
+    lines = [f"games: {summary['games']} in {summary['seconds']:.1f}s ({summary['games_per_minute']:,.0f} games/min)"]
+    low, high = summary["player1_win_rate_ci"]
+    lines.append(f"Player 1 win rate: {summary['player1_win_rate']:.2%} [{low:.2%}, {high:.2%}]")
+    for key, label in (("turns", "Game length (turns)"), ("max_streak", "Max bonus streak"),
+                       ("corruptions", "Corruptions per game"), ("timeouts", "Timeouts per game")):
+        dist = summary[key]
+        lines.append(f"{label}: {dist['mean']:.2f} ± {dist['ci']:.2f}")
+        top = sorted(dist["histogram"].items(), key=lambda item: -item[1])[:8]
+        lines.append("    " + "  ".join(f"{value}: {share:.1%}" for value, share in sorted(top)))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m redintel.simulate", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", default="0")
+    parser.add_argument("--p1", default="consultant", help=f"Player 1 policy ({', '.join(PLAYER1_POLICIES)} or module:attr)")
+    parser.add_argument("--p2", default="random", help=f"Player 2 AI ({', '.join(PLAYER2_POLICIES)} or module:attr)")
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    parser.add_argument("--corruption-threshold", type=int, default=CORRUPTION_THRESHOLD)
+    parser.add_argument("--corruption-chance", type=float, default=CORRUPTION_CHANCE)
+    parser.add_argument("--war-room-duration", type=float, default=WAR_ROOM_DURATION)
+    parser.add_argument("--reaction-mean", type=float, default=0.0,
+                        help="Mean Player 1 decision time in seconds (0 = instant)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    config = {"seed": args.seed, "p1": args.p1, "p2": args.p2, "grid_size": args.grid_size,
+              "corruption_threshold": args.corruption_threshold, "corruption_chance": args.corruption_chance,
+              "war_room_duration": args.war_room_duration, "reaction_mean": args.reaction_mean}
+    start = time.perf_counter()
+    tally = run_simulation(config, args.games, args.workers)
+    summary = summarize(tally, config, time.perf_counter() - start)
+    print(json.dumps(summary, indent=2) if args.json else format_report(summary))
+
+
+if __name__ == "__main__":
+    main()
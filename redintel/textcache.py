@@ -0,0 +1,51 @@
+"""Cache of rendered text surfaces.
+
+font.render() rasterises the string from scratch on every call, and the UI
+asks for the same handful of strings ("Your Fleet", grid labels, button
+captions, status counters) every frame. TextCache keeps the rendered
+surfaces in a bounded LRU keyed on (font, text, color, antialias) and counts
+hits and misses, so the frame overlay can show whether text rendering is
+still being paid for.
+
+Callers must not draw onto a returned surface: it is shared by every later
+render of the same string.
+"""
+from collections import OrderedDict
+
+
+class TextCache:
+    """Bounded LRU of font.render() results."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict() # (font, text, color, antialias) -> Surface, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Returns font.render(text, antialias, color), rendering it only on a cache miss."""
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, antialias, color)
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        """Returns hits, misses, hit_rate (0..1) and the number of cached surfaces."""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.surfaces)}
+
+    def summary(self):
+        """One overlay line, e.g. 'text cache 99.8% hit  12 miss  40 cached'."""
+        stats = self.stats()
+        return f"text cache {stats['hit_rate']:.1%} hit  {stats['misses']} miss  {stats['entries']} cached"
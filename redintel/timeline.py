@@ -0,0 +1,124 @@
+"""Non-blocking timeline for animations and timed transitions.
+
+The main loop owns one Timeline and calls update() once per frame. Work that
+used to run in its own nested loop or behind time.sleep() is scheduled on it
+instead: a tween moves one value from start to end over a duration (a
+darkening alpha, a sliding strip, the number of typed characters), a delay
+runs a callback later (the opponent "thinking", the pause on an attack
+result). Tasks run concurrently, finish with an optional callback that can
+schedule the next step, and can be skipped (jumped to their end, callbacks
+included) or cancelled by tag.
+
+Times are integer milliseconds from the clock given to the Timeline, e.g.
+pygame.time.get_ticks. Nothing here imports pygame.
+"""
+import time
+
+
+def linear(t):
+    return t
+
+def ease_out(t):
+    """Quadratic ease-out: fast start, gentle stop."""
+    return 1 - (1 - t) * (1 - t)
+
+
+def _millis():
+    return int(time.monotonic() * 1000)
+
+
+class Task:
+    """One scheduled tween or delay."""
+    __slots__ = ('start', 'end', 'target', 'key', 'begin', 'finish', 'easing', 'on_done', 'tag')
+
+    def __init__(self, start, end, target, key, begin, finish, easing, on_done, tag):
+        self.start = start
+        self.end = end
+        self.target = target # Mapping the tween writes to (None for a plain delay)
+        self.key = key
+        self.begin = begin
+        self.finish = finish
+        self.easing = easing
+        self.on_done = on_done
+        self.tag = tag
+
+    def apply(self, now):
+        """Writes the value for time now. Returns True once the task has reached its end."""
+        if now < self.start:
+            return False
+        span = self.end - self.start
+        t = 1.0 if span <= 0 else min(1.0, (now - self.start) / span)
+        if self.target is not None:
+            self.target[self.key] = self.begin + (self.finish - self.begin) * self.easing(t)
+        return t >= 1.0
+
+
+class Timeline:
+    """Tweens and delayed callbacks advanced by the main loop."""
+
+    def __init__(self, clock=_millis):
+        self.clock = clock
+        self.tasks = []
+
+    # --- Scheduling ---
+
+    def tween(self, target, key, start, end, duration, delay=0, easing=linear, on_done=None, tag=None):
+        """Moves target[key] from start to end over duration ms, beginning delay ms from now."""
+        begin = self.clock() + delay
+        target[key] = start
+        task = Task(begin, begin + duration, target, key, start, end, easing, on_done, tag)
+        self.tasks.append(task)
+        return task
+
+    def after(self, delay, callback, tag=None):
+        """Calls callback() once, delay ms from now."""
+        due = self.clock() + delay
+        task = Task(due, due, None, None, 0, 0, linear, callback, tag)
+        self.tasks.append(task)
+        return task
+
+    def cancel(self, tag=None):
+        """Drops tasks with this tag (all tasks for None) without running their callbacks."""
+        self.tasks = [task for task in self.tasks if tag is not None and task.tag != tag]
+
+    def skip(self, tag=None, limit=100):
+        """Jumps tasks with this tag (all for None) to their end, running callbacks in end order.
+
+        Tasks those callbacks schedule with the same tag are skipped too, up to
+        limit rounds, so a whole chained sequence can be fast-forwarded at once.
+        """
+        for _ in range(limit):
+            skipped = [task for task in self.tasks if tag is None or task.tag == tag]
+            if not skipped:
+                return
+            self.tasks = [task for task in self.tasks if task not in skipped]
+            for task in sorted(skipped, key=lambda task: task.end):
+                task.apply(task.end)
+                if task.on_done is not None:
+                    task.on_done()
+
+    # --- Running ---
+
+    def update(self, now=None):
+        """Advances every task to now and runs the callbacks of those that finished."""
+        now = self.clock() if now is None else now
+        tasks, self.tasks = self.tasks, []
+        finished = []
+        for task in tasks:
+            (finished if task.apply(now) else self.tasks).append(task)
+        for task in finished: # Callbacks may schedule new tasks; they land in self.tasks
+            if task.on_done is not None:
+                task.on_done()
+
+    def running(self, tag=None):
+        """Whether a tween (with this tag) is moving right now, i.e. the screen needs every frame."""
+        now = self.clock()
+        return any(task.target is not None and task.start <= now < task.end and (tag is None or task.tag == tag)
+                   for task in self.tasks)
+
+    def next_due(self):
+        """Clock time at which the next pending task starts or a delay fires, or None."""
+        return min((task.start for task in self.tasks), default=None)
+
+    def __len__(self):
+        return len(self.tasks)
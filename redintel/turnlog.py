@@ -0,0 +1,325 @@
+"""Append-only match logs and a headless replayer.
+
+    engine = GameEngine(turn_log=TurnLog("turns.jsonl"))   # every reset / step is appended
+    python -m redintel.turnlog turns.jsonl                 # replay every match in it and verify
+
+A log is JSON lines, flushed as they are written, so it survives a crash.
+Each match starts with a header line:
+
+    {"kind": "match", "grid_size": 12, "seed": 123, "player1_ships": [...], "ships": {...},
+     "player2_ai": "redintel.engine:RandomTargeting", "corruption_threshold": 3, "corruption_chance": 0.9,
+     "match": "5f0c9a1e3b7d2468", "keys_at": 10240}
+
+(a match resumed from a save has "snapshot", the base64 redintel.snapshot
+bytes, instead of "seed" / "player1_ships"), then one line per engine step
+with the phase it was taken in, the action and the events it produced,
+and a closing line with the winner and a hash of the final state:
+
+    {"turn": 1, "phase": "PLAYER1_WAR_ROOM", "action": 2, "events": [["hit", "Player 1", [3, 4]]]}
+    {"kind": "end", "turns": 41, "winner": "Player 1", "state": "9c1e0b7d2f6a4e83"}
+
+Every roll comes from the seeded streams in redintel.rng, so the seed, the
+placement and the actions are all a replay needs. replay() feeds them back
+through a fresh engine, with no front end and no waiting, and checks every
+step's events and the final state against the log; it runs tens of
+thousands of steps a second.
+
+Every KEYFRAME_INTERVAL steps TurnLog also appends a zlib-compressed
+snapshot of the match to a keyframe file next to the log (LOG + ".keys"),
+so the replay viewer (redintel.replay) can jump to any turn of a long match
+from the nearest keyframe instead of replaying it from the start. Each
+record is a KEYFRAME header (match key, step count, length) and the data.
+The match key is the random "match" id in the header, and the header's
+"keys_at" is where the match's keyframes start in that file, so opening the
+last match reads the tail of both files however many games they hold.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import struct
+import time
+import zlib
+
+from . import snapshot
+from .rng import ENGINE_STREAMS, STREAMS
+from .engine import GameEngine, PHASE_GAME_OVER
+from .ai import PLAYER2_POLICIES
+
+LOG_VERSION = 2 # 2: the final state hash leaves out the front end's chat stream
+SUPPORTED_VERSIONS = (1, 2)
+KEYFRAME_INTERVAL = 64 # Steps between keyframes: a seek replays fewer than this many steps
+KEYFRAME = struct.Struct("<8sII") # Match key, steps played before the snapshot, compressed length
+MATCH_LINE = b'{"kind":"match"' # How every header line starts
+TAIL_BLOCK = 1 << 16 # Bytes read at a time when searching a log backwards
+
+
+def state_hash(engine, version=LOG_VERSION):
+    """Short hash of everything a snapshot covers; equal hashes mean the matches are in the same state.
+
+    The chat stream is left out: the front end rolls its advice line from it between steps, which a
+    headless replay does not (version 1 logs hashed it too).
+    """
+    return hashlib.sha256(snapshot.dump(engine, STREAMS if version == 1 else ENGINE_STREAMS)).hexdigest()[:16]
+
+
+def _json(value):
+    return json.dumps(value, separators=(",", ":"))
+
+
+def match_key(header):
+    """Identifies a match's keyframes: its "match" id (a hash of the header line for logs written without one)."""
+    if "match" in header:
+        return bytes.fromhex(header["match"])
+    return hashlib.sha256(_json(header).encode("utf-8")).digest()[:8]
+
+
+def keyframes_path(path):
+    return path + ".keys"
+
+
+def ai_name(cls):
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def player2_class(name):
+    """The Player 2 AI class a log names, looked up in PLAYER2_POLICIES only: a log never chooses what gets imported."""
+    for cls in PLAYER2_POLICIES.values():
+        if name == ai_name(cls):
+            return cls
+    raise ValueError(f"Unknown Player 2 AI {name!r}; logs can only name {', '.join(ai_name(cls) for cls in PLAYER2_POLICIES.values())}")
+
+
+class TurnLog:
+    """Writes one JSON line per match start, engine step and match end to an append-only file."""
+
+    def __init__(self, path, keyframe_interval=KEYFRAME_INTERVAL):
+        self.path = path
+        self.file = None
+        self.keyframe_interval = keyframe_interval # 0 writes no keyframes
+        self.keyframe_file = None
+        self.match = None # match_key() of the match being logged
+        self.steps = 0 # Steps logged in it so far
+
+    def _write(self, entry):
+        if self.file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(_json(entry) + "\n")
+        self.file.flush()
+
+    def _start(self, header):
+        # Two matches can share everything else (a fixed seed, two resumes of one save), never the id
+        header["match"] = os.urandom(8).hex() # The 8-byte key of its KEYFRAME records
+        if self.keyframe_file is not None:
+            header["keys_at"] = self.keyframe_file.tell()
+        else:
+            try:
+                header["keys_at"] = os.path.getsize(keyframes_path(self.path))
+            except OSError:
+                header["keys_at"] = 0
+        self._write(header)
+        self.match = match_key(header)
+        self.steps = 0
+
+    def _write_keyframe(self, engine):
+        if self.keyframe_file is None:
+            self.keyframe_file = open(keyframes_path(self.path), "ab")
+        data = zlib.compress(snapshot.dump(engine), 1) # Board masks shrink to almost nothing; the RNG states don't
+        self.keyframe_file.write(KEYFRAME.pack(self.match, self.steps, len(data)) + data)
+        self.keyframe_file.flush()
+
+    def _header(self, engine):
+        return {"kind": "match", "version": LOG_VERSION, "grid_size": engine.grid_size,
+                "ships": {name: [list(cell) for cell in shape] for name, shape in engine.ships.items()},
+                "player2_ai": ai_name(type(engine.player2_ai)),
+                "corruption_threshold": engine.corruption_threshold, "corruption_chance": engine.corruption_chance}
+
+    def begin(self, engine, player1_ships=None):
+        """Called by GameEngine.reset(): a new match from engine.seed."""
+        header = self._header(engine)
+        header["seed"] = engine.seed
+        header["player1_ships"] = player1_ships
+        self._start(header)
+
+    def resume(self, engine):
+        """A match loaded from a snapshot carries on from here."""
+        header = self._header(engine)
+        header["snapshot"] = base64.b64encode(snapshot.dump(engine)).decode("ascii")
+        self._start(header)
+
+    def record(self, engine, phase, action, events):
+        """Called by GameEngine.step() with the phase the step was taken in."""
+        self._write({"turn": engine.turn, "phase": phase, "action": action, "events": events})
+        self.steps += 1
+        if engine.phase == PHASE_GAME_OVER:
+            self._write({"kind": "end", "turns": engine.turn, "winner": engine.winner, "state": state_hash(engine)})
+        elif self.keyframe_interval and self.steps % self.keyframe_interval == 0:
+            self._write_keyframe(engine)
+
+    def close(self):
+        for f in (self.file, self.keyframe_file):
+            if f is not None:
+                f.close()
+        self.file = self.keyframe_file = None
+
+
+# --- Replaying ---
+
+def read_matches(lines):
+    """Splits log lines into matches: (header, steps, end or None) per match."""
+    matches = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError: # A crash can cut the last line short
+            raise ValueError(f"line {number}: not valid JSON")
+        kind = entry.get("kind")
+        if kind == "match":
+            matches.append((entry, [], None))
+        elif not matches:
+            raise ValueError(f"line {number}: {kind or 'step'} before any match header")
+        elif kind == "end":
+            header, steps, _ = matches[-1]
+            matches[-1] = (header, steps, entry)
+        else:
+            matches[-1][1].append(entry)
+    return matches
+
+
+def _last_match_offset(f):
+    """Byte offset of the last header line in a log opened in binary mode, or None; reads backwards from the end."""
+    marker = b"\n" + MATCH_LINE
+    pos = f.seek(0, os.SEEK_END)
+    tail = b""
+    while pos > 0:
+        start = max(0, pos - TAIL_BLOCK)
+        f.seek(start)
+        block = f.read(pos - start)
+        tail = block + tail
+        pos = start
+        i = tail.rfind(marker, 0, len(block) + len(marker) - 1) # Only the new block, and a marker straddling it
+        if i >= 0:
+            return pos + i + 1
+    return 0 if tail.startswith(MATCH_LINE) else None
+
+
+def last_match(path):
+    """The last match in a log, as (header, steps, end or None), or None if it has none."""
+    with open(path, "rb") as f:
+        start = _last_match_offset(f)
+        if start is None:
+            return None
+        f.seek(start)
+        lines = f.read().decode("utf-8").splitlines()
+    return read_matches(lines)[0]
+
+
+def read_keyframes(path, header):
+    """Returns {steps played: snapshot bytes} for the match header starts, from the keyframe file next to the log."""
+    key = match_key(header)
+    keyframes = {}
+    try:
+        with open(keyframes_path(path), "rb") as f:
+            f.seek(header.get("keys_at", 0)) # Earlier matches' keyframes are all before this
+            data = f.read()
+    except FileNotFoundError:
+        return keyframes
+    pos = 0
+    while pos + KEYFRAME.size <= len(data):
+        record, steps, length = KEYFRAME.unpack_from(data, pos)
+        pos += KEYFRAME.size
+        if pos + length > len(data): # Cut short by a crash
+            break
+        if record == key:
+            keyframes[steps] = zlib.decompress(data[pos:pos + length])
+        pos += length
+    return keyframes
+
+
+def engine_for(header, player2_ai=None):
+    """A fresh engine set up like the logged one, at the start of the logged match.
+
+    player2_ai replaces the logged AI (the replay viewer fires the logged shots instead).
+    """
+    if header.get("version", LOG_VERSION) not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported turn log version {header['version']}")
+    ships = {name: [tuple(cell) for cell in shape] for name, shape in header["ships"].items()}
+    if player2_ai is None:
+        player2_ai = player2_class(header["player2_ai"])()
+    engine = GameEngine(header["grid_size"], ships, player2_ai,
+                        header["corruption_threshold"], header["corruption_chance"])
+    if "snapshot" in header:
+        snapshot.load(base64.b64decode(header["snapshot"]), engine)
+    else:
+        engine.reset(seed=header["seed"], player1_ships=header["player1_ships"])
+    return engine
+
+
+def replay(header, steps, end=None):
+    """Re-runs one logged match and checks it step by step.
+
+    Returns a dict: steps and turns replayed, seconds, ok, the first mismatch
+    (error) if any, and the final state hash.
+    """
+    start = time.perf_counter()
+    engine = engine_for(header)
+    error = None
+    replayed = 0
+    for i, step in enumerate(steps):
+        if engine.phase != step["phase"]:
+            error = f"step {i + 1}: engine is in {engine.phase}, the log says {step['phase']}"
+            break
+        events = engine.step(step["action"])
+        replayed += 1
+        if _json(events) != _json(step["events"]):
+            error = f"step {i + 1} (turn {step['turn']}, {step['phase']}): logged {_json(step['events'])}, replayed {_json(events)}"
+            break
+    state = state_hash(engine, header.get("version", LOG_VERSION))
+    if error is None and end is not None:
+        if engine.winner != end["winner"] or engine.turn != end["turns"]:
+            error = f"match ended with {engine.winner} after {engine.turn} turns, the log says {end['winner']} after {end['turns']}"
+        elif state != end["state"]:
+            error = f"final state {state} does not match the logged {end['state']}"
+    return {"steps": replayed, "turns": engine.turn, "seconds": time.perf_counter() - start,
+            "ok": error is None, "error": error, "state": state, "complete": end is not None}
+
+
+def replay_file(path):
+    with open(path, encoding="utf-8") as f:
+        return [replay(*match) for match in read_matches(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m redintel.turnlog",
+                                     description="Replay logged Red Room matches headlessly and verify them.")
+    parser.add_argument("log", help="turn log (JSON lines)")
+    parser.add_argument("--match", type=int, help="only replay this match (1 = first in the file)")
+    args = parser.parse_args(argv)
+
+    with open(args.log, encoding="utf-8") as f:
+        matches = read_matches(f)
+    if args.match is not None:
+        matches = [matches[args.match - 1]]
+    failed = 0
+    for number, match in enumerate(matches, args.match or 1):
+        result = replay(*match)
+        rate = result["steps"] / result["seconds"] if result["seconds"] else 0.0
+        status = "OK" if result["ok"] else "MISMATCH"
+        if result["ok"] and not result["complete"]:
+            status = "OK (log ends mid-match)"
+        print(f"match {number}: {result['turns']} turns, {result['steps']} steps in {result['seconds'] * 1000:.1f} ms "
+              f"({rate:,.0f} steps/s), state {result['state']}: {status}")
+        if not result["ok"]:
+            print(f"  {result['error']}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
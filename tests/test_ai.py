@@ -0,0 +1,81 @@
+import pytest
+
+from redintel import ai, snapshot
+from redintel.ai import DensityHunter
+from redintel.engine import GameEngine, PHASE_GAME_OVER, PHASE_PLAYER2_TURN
+
+
+class RecordingHunter(DensityHunter):
+    """Notes which way each _retire() goes (the same test it makes)."""
+
+    def reset(self, engine):
+        super().reset(engine)
+        self.retired = []
+
+    def _retire(self, shape):
+        band = ai._border_band(self.size, shape.name, tuple(shape.shape))
+        self.retired.append("early" if len(shape.shape) * len(shape.killed) + len(band) < self.unshot else "late")
+        super()._retire(shape)
+
+
+def recount(hunter):
+    """Live placements covering each cell, counted from scratch."""
+    size = hunter.size
+    density = [0] * (size * size)
+    for shape in hunter.shapes:
+        if shape.sunk:
+            continue
+        for oy in range(-shape.min_y, size - shape.max_y):
+            for ox in range(-shape.min_x, size - shape.max_x):
+                if (ox, oy) not in shape.killed:
+                    for dx, dy in shape.shape:
+                        density[(oy + dy) * size + ox + dx] += 1
+    return density
+
+
+def check(hunter):
+    """Densities of cells not shot yet match a recount (up to the early retire's board-wide shift),
+    and hunt mode picks a cell with the highest."""
+    true = recount(hunter)
+    unshot = [i for i in range(hunter.size ** 2) if not hunter.shot[i]]
+    assert len({hunter.density[i] - true[i] for i in unshot}) <= 1
+    if unshot and not hunter.open_hits:
+        x, y = hunter._hunt_mode()
+        assert true[y * hunter.size + x] == max(true[i] for i in unshot)
+
+
+def step(engine):
+    phase = engine.phase
+    engine.step('G' if phase == "PLAYER1_TRAFFIC_LIGHT" else 0 if phase == "PLAYER1_INTEL_RESOLUTION" else None)
+
+
+@pytest.mark.parametrize("grid_size", [12, 20])
+def test_density_matches_a_recount(grid_size):
+    branches = set()
+    for seed in range(3):
+        hunter = RecordingHunter()
+        engine = GameEngine(grid_size, player2_ai=hunter).reset(seed=seed)
+        check(hunter)
+        while engine.phase != PHASE_GAME_OVER: # Player 1 always times out: Player 2 plays the whole board
+            if engine.phase == PHASE_PLAYER2_TURN:
+                check(hunter)
+            step(engine)
+        check(hunter)
+        assert engine.winner == "Player 2"
+        branches.update(hunter.retired)
+    assert branches == {"early", "late"}
+
+
+def test_restore_rebuilds_the_hunt():
+    engine = GameEngine(12, player2_ai=DensityHunter()).reset(seed=4)
+    while engine.turn < 40:
+        step(engine)
+    data = snapshot.dump(engine)
+
+    hunter = DensityHunter()
+    loaded = GameEngine(12, player2_ai=hunter)
+    snapshot.load(data, loaded) # Calls hunter.restore()
+    assert snapshot.dump(loaded) == data # engine.rng (the opponent stream) untouched
+    assert hunter.rng is loaded.rng
+    assert bytes(hunter.shot) == bytes(engine.player2_ai.shot)
+    check(hunter)
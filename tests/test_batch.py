@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from redintel import batch
+from redintel.engine import ship_options
+
+
+def neighbours(cell):
+    x, y = cell
+    return {(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+
+
+@pytest.mark.parametrize("grid_size", [7, 12])
+def test_batch_fleets_are_legal(grid_size):
+    fleets = batch.random_fleets(200, seed=1, grid_size=grid_size, chunk=64)
+    assert len(fleets) == 200
+    boards = fleets.boards()
+    for n in range(len(fleets)):
+        fleet = fleets.fleet(n)
+        assert sorted(name for name, _ in fleet) == sorted(ship_options)
+        owner = {}
+        for name, coords in fleet:
+            for x, y in coords:
+                assert 0 <= x < grid_size and 0 <= y < grid_size
+                assert (x, y) not in owner
+                owner[(x, y)] = name
+        for cell, name in owner.items():
+            for other in neighbours(cell):
+                assert owner.get(other, name) == name, f"{name} touches {owner[other]} at {cell}"
+        assert sorted(np.flatnonzero(boards[n])) == sorted(y * grid_size + x for x, y in owner)
+
+
+def test_batch_is_repeatable():
+    a = batch.random_fleets(100, seed=9)
+    b = batch.random_fleets(100, seed=9)
+    assert np.array_equal(a.origins, b.origins)
+    assert not np.array_equal(a.origins, batch.random_fleets(100, seed=10).origins)
+
+
+def test_boards_finished_in_the_last_round(monkeypatch):
+    place_chunk = batch._place_chunk
+    rounds = []
+
+    def first_round_fails(tables, grid_size, rng, origins, rows):
+        rounds.append(len(rows))
+        if len(rounds) == 1:
+            return np.zeros(len(rows), dtype=bool) # Every board is a dead end in round 1
+        ok = place_chunk(tables, grid_size, rng, origins, rows)
+        while not ok.all(): # ...and all of them finish in round 2, the last one
+            ok[~ok] = place_chunk(tables, grid_size, rng, origins, rows[~ok])
+        return ok
+    monkeypatch.setattr(batch, "_place_chunk", first_round_fails)
+    monkeypatch.setattr(batch, "MAX_ROUNDS", 2)
+    fleets = batch.random_fleets(10, seed=3)
+    assert len(rounds) == 2 and len(fleets) == 10
+
+
+def test_fleet_that_cannot_fit():
+    with pytest.raises(ValueError):
+        batch.random_fleets(5, seed=0, grid_size=3)
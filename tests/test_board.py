@@ -0,0 +1,37 @@
+import random
+
+from redintel.board import Board, HIDDEN, HIT, MISS
+
+
+def test_coordinates():
+    board = Board(5)
+    assert board.bit((0, 0)) == 1 and board.bit((2, 1)) == 1 << 7
+    assert board.mask_of([(0, 0), (2, 1)]) == 1 | 1 << 7
+    assert list(board.cells(board.mask_of([(4, 4), (1, 0), (0, 3)]))) == [(1, 0), (0, 3), (4, 4)]
+    assert board.in_bounds((4, 0)) and not board.in_bounds((5, 0)) and not board.in_bounds((0, -1))
+    assert board.count(board.full) == 25
+
+
+def test_marks_and_accessors():
+    board = Board(4)
+    board.place_ship([(1, 1), (2, 1)])
+    board.mark_hit((1, 1))
+    board.mark_miss((3, 0))
+    assert board.has_ship((2, 1)) and not board.has_ship((3, 0))
+    assert not board.is_unknown((1, 1)) and not board.is_unknown((3, 0)) and board.is_unknown((2, 1))
+    assert board.count(board.unknown) == 14
+    assert (board.state((1, 1)), board.state((3, 0)), board.state((2, 1))) == (HIT, MISS, HIDDEN)
+    assert len(board) == 4
+    assert board[0] == [HIDDEN, HIDDEN, HIDDEN, MISS]
+    assert board[1] == [HIDDEN, HIT, HIDDEN, HIDDEN] # Ships don't show: the grid is what has been revealed
+
+
+def test_random_cell():
+    board = Board(10)
+    rng = random.Random(1)
+    assert board.random_cell(0, rng) is None
+    sparse = board.mask_of([(3, 3), (7, 1)])
+    assert {board.random_cell(sparse, rng) for _ in range(50)} == {(3, 3), (7, 1)}
+    dense = board.full & ~board.mask_of([(0, 0)])
+    picks = {board.random_cell(dense, rng) for _ in range(2000)}
+    assert (0, 0) not in picks and len(picks) > 90
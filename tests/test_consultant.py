@@ -0,0 +1,54 @@
+import random
+
+from redintel.board import CellPool, FreeCells
+from redintel.engine import GameEngine, PHASE_GAME_OVER, PHASE_WAR_ROOM, PHASE_TRAFFIC_LIGHT
+
+
+def test_cell_pool():
+    pool = CellPool([(0, 0), (1, 0), (0, 0), (2, 2)])
+    assert len(pool) == 3 and (1, 0) in pool
+    pool.discard((0, 0))
+    pool.discard((5, 5))
+    pool.add((3, 3))
+    pool.add((3, 3))
+    assert sorted(pool) == [(1, 0), (2, 2), (3, 3)]
+    rng = random.Random(1)
+    assert {pool.choice(rng) for _ in range(100)} == {(1, 0), (2, 2), (3, 3)}
+    assert sorted(pool.sample(rng, 5)) == [(1, 0), (2, 2), (3, 3)]
+    assert CellPool().choice(rng) is None
+
+
+def test_free_cells():
+    free = FreeCells(4, [(0, 0), (1, 1)])
+    free.discard((2, 2))
+    assert len(free) == 13 and (0, 0) not in free and (3, 3) in free and (4, 0) not in free
+    rng = random.Random(2)
+    picks = free.sample(rng, 2)
+    assert len(picks) == 2 and len(set(picks)) == 2 and all(cell in free for cell in picks)
+    for cell in list(free)[:11]: # Below a quarter of the board: sampled from a materialised pool
+        free.discard(cell)
+    assert sorted(free.sample(rng, 5)) == sorted(free) and len(free) == 2
+
+
+def test_options_and_pools_over_a_match():
+    engine = GameEngine(12).reset(seed=9)
+    rng = random.Random(9)
+    while engine.phase != PHASE_GAME_OVER:
+        if engine.phase == PHASE_WAR_ROOM:
+            board = engine.player2_grid
+            # Undamaged segments: a bonus reveal marks a segment on the board but it stays a guaranteed hit
+            unhit = {cell for ship in engine.player2_ships_state for cell in ship.coords if not ship.is_hit(cell)}
+            open_water = set(board.cells(board.full & ~board.ship & ~board.miss))
+            assert set(engine.player2_unhit_cells) == unhit
+            assert set(engine.player2_open_water) == open_water and len(engine.player2_open_water) == len(open_water)
+
+            options = engine.consultant_options
+            assert len(options) == 3 and len(set(options)) == 3
+            assert sum(cell in unhit for cell in options) == 1 # Exactly one guaranteed hit
+            assert sum(cell in open_water for cell in options) == min(2, len(open_water))
+            action = rng.randrange(3)
+        elif engine.phase == PHASE_TRAFFIC_LIGHT:
+            action = 'G'
+        else:
+            action = 0
+        engine.step(action)
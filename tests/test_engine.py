@@ -0,0 +1,116 @@
+import pytest
+
+from redintel.engine import (GameEngine, ship_options, PHASE_WAR_ROOM, PHASE_INTEL_RESOLUTION,
+                             PHASE_ATTACK_RESOLUTION, PHASE_TRAFFIC_LIGHT, PHASE_PLAYER2_TURN, PHASE_GAME_OVER,
+                             PLAYER1, PLAYER2)
+
+
+def option(engine, hit):
+    """Index of a consultant option that is (or isn't) on one of Player 2's ships."""
+    return next(i for i, cell in enumerate(engine.consultant_options) if engine.player2_grid.has_ship(cell) == hit)
+
+
+def test_reset():
+    engine = GameEngine(12).reset(seed=1)
+    assert engine.phase == PHASE_WAR_ROOM and engine.turn == 1 and engine.winner is None
+    assert len(engine.consultant_options) == 3
+    for fleet, board in ((engine.player1_ships_state, engine.player1_grid), (engine.player2_ships_state, engine.player2_grid)):
+        assert sorted(ship.name for ship in fleet) == sorted(ship_options)
+        assert board.ship == board.mask_of(cell for ship in fleet for cell in ship.coords)
+        assert board.hit == board.miss == 0
+
+
+def test_player1_placement():
+    placed = [{"name": "Unit", "shape": [(0, 0)], "grid_x": 3, "grid_y": 4},
+              {"name": "Linear 2", "shape": [(0, 0), (1, 0)], "grid_x": 6, "grid_y": 6}]
+    engine = GameEngine(12).reset(seed=1, player1_ships=placed)
+    assert [ship.coords for ship in engine.player1_ships_state] == [((3, 4),), ((6, 6), (7, 6))]
+
+
+def test_a_turn_with_a_hit():
+    engine = GameEngine(12).reset(seed=2)
+    target = engine.consultant_options[option(engine, True)]
+    assert engine.step(option(engine, True)) == []
+    assert engine.phase == PHASE_INTEL_RESOLUTION and engine.last_attack_result == "HIT"
+    events = engine.step(0) # Reveal Segment
+    assert engine.phase == PHASE_ATTACK_RESOLUTION
+    assert all(event[0] == 'reveal' for event in events)
+    assert ('hit', PLAYER1, target) in engine.step(None)
+    assert engine.player2_grid.state(target) == 'X'
+    assert engine.phase == PHASE_TRAFFIC_LIGHT and engine.player1_bonus_streak == 1
+    assert engine.step('R') == [] and engine.player1_traffic_light == 'R'
+    assert engine.phase == PHASE_PLAYER2_TURN
+    events = engine.step(None)
+    assert events[0][0] in ('hit', 'miss') and events[0][1] == PLAYER2
+    assert engine.player1_grid.state(engine.p2_last_target) in ('X', 'M')
+    assert engine.phase == PHASE_WAR_ROOM and engine.turn == 2
+
+
+def test_a_miss_and_a_timeout():
+    engine = GameEngine(12).reset(seed=3)
+    target = engine.consultant_options[option(engine, False)]
+    engine.step(option(engine, False))
+    assert engine.phase == PHASE_ATTACK_RESOLUTION and engine.last_attack_result == "MISS"
+    assert engine.step(None) == [('miss', PLAYER1, target)]
+    engine.step('G')
+    engine.step(None)
+
+    miss = engine.player2_grid.miss
+    engine.step(None) # The War Room timer ran out
+    assert engine.last_attack_result == "MISS (Timeout)" and engine.player1_bonus_streak == 0
+    assert engine.step(None) == [] and engine.player2_grid.miss == miss
+
+
+def test_corruption_resets_the_streak():
+    engine = GameEngine(12, corruption_threshold=3, corruption_chance=1.0).reset(seed=4)
+    for streak in (1, 2, 3):
+        events = engine.step(option(engine, True))
+        assert (('corruption', PLAYER1) in events) == (streak == 3)
+        engine.step(0)
+        engine.step(None)
+        assert engine.player1_bonus_streak == (0 if streak == 3 else streak)
+        engine.step('G')
+        engine.step(None)
+
+
+def test_invalid_actions():
+    engine = GameEngine(12).reset(seed=5)
+    with pytest.raises(ValueError):
+        engine.step(3)
+    engine.step(option(engine, True))
+    with pytest.raises(ValueError):
+        engine.step(None)
+    engine.step(0)
+    engine.step(None)
+    with pytest.raises(ValueError):
+        engine.step('B')
+
+
+def play_out(engine):
+    """Always takes the guaranteed hit; returns every event."""
+    events = []
+    while engine.phase != PHASE_GAME_OVER:
+        if engine.phase == PHASE_WAR_ROOM:
+            action = option(engine, True)
+        elif engine.phase == PHASE_INTEL_RESOLUTION:
+            action = 0
+        elif engine.phase == PHASE_TRAFFIC_LIGHT:
+            action = 'G'
+        else:
+            action = None
+        events.extend(engine.step(action))
+    return events
+
+
+def test_match_plays_to_the_end():
+    engine = GameEngine(12).reset(seed=6)
+    events = play_out(engine)
+    assert engine.winner == PLAYER1 and events[-1] == ('game_over', PLAYER1)
+    assert engine.player2_ships_state.all_sunk
+    assert sorted(event[2] for event in events if event[:2] == ('sunk', PLAYER2)) == sorted(ship_options)
+    with pytest.raises(RuntimeError):
+        engine.step(None)
+
+
+def test_same_seed_same_match():
+    assert play_out(GameEngine(12).reset(seed=7)) == play_out(GameEngine(12).reset(seed=7))
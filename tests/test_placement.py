@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from redintel.engine import GameEngine, ship_options
+from redintel.placement import placement_tables
+
+
+def neighbours(cell):
+    x, y = cell
+    return {(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+
+
+@pytest.mark.parametrize("grid_size", [7, 12, 40])
+def test_random_fleets_are_legal(grid_size):
+    tables = placement_tables(grid_size, ship_options)
+    for seed in range(50):
+        fleet = tables.generate(random.Random(seed))
+        assert sorted(name for name, _ in fleet) == sorted(ship_options)
+        owner = {}
+        for name, coords in fleet:
+            shape = ship_options[name]
+            ox, oy = coords[0][0] - shape[0][0], coords[0][1] - shape[0][1]
+            assert coords == [(ox + dx, oy + dy) for dx, dy in shape]
+            for x, y in coords:
+                assert 0 <= x < grid_size and 0 <= y < grid_size
+                assert (x, y) not in owner
+                owner[(x, y)] = name
+        for cell, name in owner.items():
+            for other in neighbours(cell):
+                assert owner.get(other, name) == name, f"{name} touches {owner[other]} at {cell}"
+
+
+def test_generation_is_repeatable():
+    tables = placement_tables(12, ship_options)
+    assert tables.generate(random.Random(5)) == tables.generate(random.Random(5))
+
+
+@pytest.mark.parametrize("grid_size, count", [(9, 20), (9, 24), (9, 25), (7, 15), (7, 16)])
+def test_crowded_fleets_that_fit(grid_size, count):
+    units = {f"Unit {i}": [(0, 0)] for i in range(count)} # (grid_size + 1) // 2 squared is the most that fit
+    tables = placement_tables(grid_size, units)
+    for seed in range(20):
+        fleet = tables.generate(random.Random(seed))
+        assert fleet is not None, f"seed {seed}"
+        cells = [coords[0] for _, coords in fleet]
+        for cell in cells:
+            assert not neighbours(cell) & (set(cells) - {cell})
+
+
+def test_crowded_mixed_fleet():
+    boxes = {f"Box {i}": [(0, 0), (1, 0), (0, 1), (1, 1)] for i in range(16)} # Exactly fills 12x12 at a 3-cell pitch
+    tables = placement_tables(12, boxes)
+    assert all(tables.generate(random.Random(seed)) is not None for seed in range(10))
+
+
+def test_fleet_that_cannot_fit():
+    assert placement_tables(4, ship_options).generate(random.Random(1)) is None
+    units = {f"Unit {i}": [(0, 0)] for i in range(26)} # At most 25 non-touching cells on 9x9
+    assert placement_tables(9, units).generate(random.Random(1)) is None
+
+
+def test_engine_rejects_a_fleet_that_cannot_fit():
+    with pytest.raises(ValueError):
+        GameEngine(4).reset(seed=1)
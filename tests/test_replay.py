@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from redintel import snapshot
+from redintel.engine import GameEngine
+from redintel.replay import ReplayMatch
+from redintel.simulate import consultant_player, play_game
+from redintel.turnlog import TurnLog
+
+
+def state(engine):
+    """Snapshot of the match minus Player 2's random stream.
+
+    The replay fires the logged shots instead of drawing them, so that stream
+    sits wherever the last keyframe left it; nothing else reads it.
+    """
+    opponent = engine.rngs.opponent
+    saved = opponent.getstate()
+    opponent.seed(0)
+    data = snapshot.dump(engine)
+    opponent.setstate(saved)
+    return data
+
+
+@pytest.fixture(scope="module")
+def log_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("replay") / "turns.jsonl")
+    log = TurnLog(path, keyframe_interval=16)
+    play_game(GameEngine(12, turn_log=log), 9, consultant_player)
+    log.close()
+    return path
+
+
+@pytest.fixture(scope="module")
+def sequential(log_path):
+    """The snapshot at every position, from stepping through the match once."""
+    match = ReplayMatch.open(log_path)
+    states = [state(match.engine)]
+    for _ in range(match.length):
+        match.step_forward()
+        states.append(state(match.engine))
+    return states
+
+
+def test_replay_reaches_the_logged_end(log_path):
+    match = ReplayMatch.open(log_path)
+    match.seek(match.length)
+    assert match.engine.winner == match.end["winner"]
+    assert match.turn == match.end["turns"]
+
+
+def test_seek_agrees_with_stepping(log_path, sequential):
+    match = ReplayMatch.open(log_path)
+    assert len(match.keyframes) > 2 # Seeks start from the logged keyframes
+    rng = random.Random(1)
+    positions = [match.length, 0, 17, 16, 15, 1, match.length - 1] + [rng.randrange(match.length + 1) for _ in range(50)]
+    for position in positions:
+        match.seek(position)
+        assert match.position == position
+        assert state(match.engine) == sequential[position]
+
+
+def test_seek_without_the_keyframe_file(log_path, sequential):
+    match = ReplayMatch.open(log_path)
+    bare = ReplayMatch(match.header, match.steps, match.end) # Only the keyframes it makes itself
+    for position in (match.length, 3, match.length // 2, 0):
+        bare.seek(position)
+        assert state(bare.engine) == sequential[position]
+
+
+def test_seek_turn_and_playback(log_path):
+    match = ReplayMatch.open(log_path)
+    match.seek_turn(3)
+    assert match.turn == 3 and match.turns[match.position - 1] < 3
+    match.play()
+    match.update(0)
+    match.update(600 * 5)
+    assert match.turn == match.turns[match.position] and match.playing
+    match.faster()
+    match.update(600 * 5 + 10 ** 9)
+    assert match.position == match.length and not match.playing
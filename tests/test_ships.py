@@ -0,0 +1,50 @@
+import pytest
+
+from redintel.ships import Fleet, Ship
+
+
+def make_fleet():
+    return Fleet([Ship("Linear 2", [(0, 0), (1, 0)]), Ship("Unit", [(4, 4)])])
+
+
+def test_index():
+    fleet = make_fleet()
+    assert fleet.ship_at((1, 0)).name == "Linear 2" and fleet.ship_at((4, 4)).name == "Unit"
+    assert fleet.ship_at((2, 0)) is None
+    assert len(fleet) == 2 and [ship.name for ship in fleet] == ["Linear 2", "Unit"]
+    assert (fleet.remaining, fleet.afloat) == (3, 2)
+
+
+def test_overlap_is_rejected():
+    fleet = make_fleet()
+    with pytest.raises(ValueError):
+        fleet.add(Ship("Box", [(1, 0), (2, 0), (1, 1), (2, 1)]))
+    assert fleet.ship_at((2, 1)) is None and len(fleet) == 2
+
+
+def test_hits_and_sinking():
+    fleet = make_fleet()
+    two = fleet.ship_at((0, 0))
+    assert fleet.record_hit((5, 5)) == (None, False)
+    assert fleet.record_hit((0, 0)) == (two, False)
+    assert two.is_hit((0, 0)) and not two.is_hit((1, 0)) and two.hits == [(0, 0)]
+    assert fleet.record_hit((0, 0)) == (two, False) # Hitting it again changes nothing
+    assert (fleet.remaining, fleet.afloat, two.remaining, two.sunk) == (2, 2, 1, False)
+
+    assert fleet.record_hit((1, 0)) == (two, True)
+    assert two.sunk and (fleet.remaining, fleet.afloat) == (1, 1) and not fleet.all_sunk
+    assert fleet.record_hit((1, 0)) == (two, False) # Already sunk: not sunk again
+
+    unit = fleet.ship_at((4, 4))
+    assert fleet.record_hit((4, 4)) == (unit, True)
+    assert fleet.all_sunk and (fleet.remaining, fleet.afloat) == (0, 0)
+
+
+def test_counters_match_a_recount():
+    ships = [Ship(f"Ship {i}", [(x, i * 2) for x in range(i + 1)]) for i in range(5)]
+    fleet = Fleet(ships)
+    for coord in [(0, 0), (0, 2), (3, 6), (1, 2), (9, 9), (0, 4), (1, 2), (4, 8)]:
+        fleet.record_hit(coord)
+        assert fleet.remaining == sum(len(ship) - len(ship.hits) for ship in ships)
+        assert fleet.afloat == sum(len(ship.hits) < len(ship) for ship in ships)
+        assert all(ship.sunk == (len(ship.hits) == len(ship)) for ship in ships)
@@ -0,0 +1,59 @@
+import pytest
+
+from redintel import snapshot
+from redintel.engine import GameEngine, PHASE_GAME_OVER
+from redintel.simulate import consultant_player, play_game
+
+
+def action_for(engine):
+    """Player 1 always takes the first consultant option, the first bonus and a green light."""
+    if engine.phase in ("PLAYER1_WAR_ROOM", "PLAYER1_INTEL_RESOLUTION"):
+        return 0
+    return 'G' if engine.phase == "PLAYER1_TRAFFIC_LIGHT" else None
+
+
+def advance(engine, steps):
+    for _ in range(steps):
+        if engine.phase == PHASE_GAME_OVER:
+            return
+        engine.step(action_for(engine))
+
+
+@pytest.mark.parametrize("steps", [0, 1, 7, 40, 200])
+def test_dump_load_round_trip(steps):
+    engine = GameEngine(12).reset(seed=3)
+    advance(engine, steps)
+    data = snapshot.dump(engine)
+
+    loaded = snapshot.load(data, GameEngine(12))
+    assert snapshot.dump(loaded) == data
+    assert loaded.phase == engine.phase and loaded.turn == engine.turn
+
+
+def test_loaded_match_plays_on_identically():
+    engine = GameEngine(12).reset(seed=11)
+    advance(engine, 30)
+    loaded = snapshot.load(snapshot.dump(engine), GameEngine(12))
+    for _ in range(60):
+        if engine.phase == PHASE_GAME_OVER:
+            break
+        action = action_for(engine)
+        assert loaded.step(action) == engine.step(action)
+    assert snapshot.dump(loaded) == snapshot.dump(engine)
+
+
+def test_finished_match_round_trips():
+    engine = GameEngine(12)
+    play_game(engine, 2, consultant_player)
+    loaded = snapshot.load(snapshot.dump(engine), GameEngine(12))
+    assert loaded.phase == PHASE_GAME_OVER and loaded.winner == engine.winner
+
+
+def test_rejects_bad_data():
+    data = snapshot.dump(GameEngine(12).reset(seed=1))
+    with pytest.raises(ValueError):
+        snapshot.load(b"XXXX" + data[4:], GameEngine(12))
+    with pytest.raises(ValueError):
+        snapshot.load(data[:len(data) // 2], GameEngine(12))
+    with pytest.raises(ValueError):
+        snapshot.load(data, GameEngine(10))
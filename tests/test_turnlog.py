@@ -0,0 +1,89 @@
+import json
+import random
+
+import pytest
+
+from redintel import turnlog
+from redintel.ai import DensityHunter
+from redintel.engine import GameEngine
+from redintel.simulate import consultant_player, play_game
+
+
+def log_matches(path, seeds, player2_ai=None, keyframe_interval=8):
+    log = turnlog.TurnLog(str(path), keyframe_interval)
+    for seed in seeds:
+        play_game(GameEngine(12, player2_ai=player2_ai, turn_log=log), seed, consultant_player)
+    log.close()
+    return str(path)
+
+
+def test_logged_matches_replay(tmp_path):
+    path = log_matches(tmp_path / "turns.jsonl", [1, 2, 3])
+    results = turnlog.replay_file(path)
+    assert len(results) == 3
+    assert all(result["ok"] and result["complete"] for result in results)
+
+
+def test_hunter_match_replays(tmp_path):
+    path = log_matches(tmp_path / "turns.jsonl", [4], DensityHunter())
+    result, = turnlog.replay_file(path)
+    assert result["ok"], result["error"]
+
+
+def test_replay_detects_tampering(tmp_path):
+    path = log_matches(tmp_path / "turns.jsonl", [5])
+    with open(path) as f:
+        lines = f.readlines()
+    for i, line in enumerate(lines):
+        entry = json.loads(line)
+        if entry.get("phase") == "PLAYER1_WAR_ROOM":
+            entry["action"] = (entry["action"] + 1) % 3
+            lines[i] = json.dumps(entry) + "\n"
+            break
+    header, steps, end = turnlog.read_matches(lines)[0]
+    assert not turnlog.replay(header, steps, end)["ok"]
+
+
+def test_last_match_and_its_keyframes(tmp_path):
+    path = log_matches(tmp_path / "turns.jsonl", [6, 6, 6]) # Same seed and placement every time
+    with open(path) as f:
+        matches = turnlog.read_matches(f)
+    assert len({header["match"] for header, _, _ in matches}) == 3
+
+    header, steps, end = turnlog.last_match(path)
+    assert (header, steps, end) == matches[-1]
+    keyframes = turnlog.read_keyframes(path, header)
+    assert sorted(keyframes) == list(range(8, len(steps), 8)) # Only this match's, none from the other two
+
+
+def test_last_match_of_an_empty_log(tmp_path):
+    path = tmp_path / "turns.jsonl"
+    path.write_text("")
+    assert turnlog.last_match(str(path)) is None
+
+
+def test_front_end_matches_replay(tmp_path):
+    """The front end rolls its advice line from the chat stream on entering every War Room, between steps."""
+    path = str(tmp_path / "turns.jsonl")
+    log = turnlog.TurnLog(path)
+    engine = GameEngine(12, player2_ai=DensityHunter(), turn_log=log).reset(seed=7)
+    rng = random.Random(7)
+    while engine.phase != "GAME_OVER":
+        if engine.phase == "PLAYER1_WAR_ROOM":
+            engine.rngs.chat.choice(["advice"] * 3) # As enter_engine_phase()
+            action = consultant_player(engine, rng)
+        else:
+            action = 'G' if engine.phase == "PLAYER1_TRAFFIC_LIGHT" else 0
+        engine.step(action)
+    log.close()
+    result, = turnlog.replay_file(path)
+    assert result["ok"] and result["complete"], result["error"]
+
+
+def test_logs_only_name_known_ais(tmp_path):
+    path = log_matches(tmp_path / "turns.jsonl", [8])
+    with open(path) as f:
+        header, steps, end = turnlog.read_matches(f)[0]
+    header["player2_ai"] = "os:system"
+    with pytest.raises(ValueError):
+        turnlog.replay(header, steps, end)